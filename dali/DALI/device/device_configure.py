@@ -4,6 +4,8 @@ import click
 from dali_interface import DaliInterface
 
 from ..system.constants import DaliMax
+from ..system.pipeline import pass_pipeline
+from ..system.presence import forget_presence
 from .device_action import set_device_dtr0, set_device_dtr2_dtr1, write_device_frame
 from .device_address import DeviceAddress, InstanceAddress
 from .device_opcode import DeviceConfigureCommandOpcode, DeviceInstanceConfigureOpcode
@@ -22,7 +24,7 @@ instance_address_option = click.option(
 
 
 @click.command(name="start", help="Start quiescent mode.")
-@click.pass_obj
+@pass_pipeline
 @device_address_option
 def start(dali: DaliInterface, adr: str):
     address = DeviceAddress(adr)
@@ -38,7 +40,7 @@ def start(dali: DaliInterface, adr: str):
 
 
 @click.command(name="stop", help="Stop quiescent mode.")
-@click.pass_obj
+@pass_pipeline
 @device_address_option
 def stop(dali: DaliInterface, adr: str):
     address = DeviceAddress(adr)
@@ -54,7 +56,7 @@ def stop(dali: DaliInterface, adr: str):
 
 
 @click.command(name="reset", help="Reset all variables.")
-@click.pass_obj
+@pass_pipeline
 @device_address_option
 def reset(dali: DaliInterface, adr: str):
     address = DeviceAddress(adr)
@@ -67,10 +69,11 @@ def reset(dali: DaliInterface, adr: str):
             DeviceConfigureCommandOpcode.RESET,
             True,
         )
+        forget_presence("device")
 
 
 @click.command(name="scheme", help="Set eventScheme.")
-@click.pass_obj
+@pass_pipeline
 @click.argument("mode", type=click.INT)
 @device_address_option
 @instance_address_option
@@ -92,7 +95,7 @@ def scheme(dali: DaliInterface, adr: str, instance: str, mode):
 
 
 @click.command(name="primary", help="Set primary instance group.")
-@click.pass_obj
+@pass_pipeline
 @click.argument("group", type=click.INT)
 @device_address_option
 @instance_address_option
@@ -114,7 +117,7 @@ def primary(dali: DaliInterface, adr: str, instance: str, group):
 
 
 @click.command(name="short", help="Set short address to ADDRESS.")
-@click.pass_obj
+@pass_pipeline
 @device_address_option
 @click.argument("address", type=click.INT)
 def short(dali, adr, address):
@@ -129,12 +132,13 @@ def short(dali, adr, address):
             DeviceConfigureCommandOpcode.SET_SHORT_ADDRESS,
             True,
         )
+        forget_presence("device")
     else:
         raise click.BadParameter(f"needs to be between 0 and {DaliMax.ADR - 1}", param_hint="ADDRESS")
 
 
 @click.command(name="application", help="enable or disable the application controller.")
-@click.pass_obj
+@pass_pipeline
 @device_address_option
 @click.argument("status", type=click.BOOL)
 def application(dali, adr, status):
@@ -159,7 +163,7 @@ def application(dali, adr, status):
 
 
 @click.command(name="cycle", help="enable or disable power cycle notification.")
-@click.pass_obj
+@pass_pipeline
 @device_address_option
 @click.argument("status", type=click.BOOL)
 def cycle(dali, adr, status):
@@ -184,7 +188,7 @@ def cycle(dali, adr, status):
 
 
 @click.command(name="add", help="Add to group.")
-@click.pass_obj
+@pass_pipeline
 @device_address_option
 @click.argument("group", type=click.INT)
 def add(dali: DaliInterface, adr: str, group: int):
@@ -233,7 +237,7 @@ def add(dali: DaliInterface, adr: str, group: int):
 
 
 @click.command(name="ungroup", help="Remove from group.")
-@click.pass_obj
+@pass_pipeline
 @device_address_option
 @click.argument("group", type=click.INT)
 def ungroup(dali: DaliInterface, adr: str, group: int):
@@ -1,39 +1,44 @@
 """Control device dump memory bank content."""
 
+from collections.abc import Callable
+
 import click
 from dali_interface import DaliInterface
 
-from ..system.membank_annotation import MemoryBankItemWithAnnotation
+from ..system.membank_dump import dump_banks, dump_options
 from .device_action import query_device_value, set_device_dtr0, set_device_dtr1
 from .device_opcode import DeviceQueryCommandOpcode
 
 
+def bank_access(dali: DaliInterface, adr: str) -> tuple[Callable[[int, int], None], Callable[[], int | None]]:
+    def select(bank: int, location: int) -> None:
+        set_device_dtr1(dali, bank)
+        set_device_dtr0(dali, location)
+
+    return select, lambda: query_device_value(dali, adr, DeviceQueryCommandOpcode.READ_MEMORY)
+
+
 @click.command(name="dump", help="Dump contents of a memory bank.")
 @click.pass_obj
-@click.argument("bank", type=click.INT)
-@click.option(
-    "--adr",
-    default="BC",
-    help="Address, can be a short address (0..63) or group address (G0..G15).",
-)
-def dump(dali: DaliInterface, adr: str, bank: int) -> None:
-    """
-    Dump the contents of a memory bank
-
-    :param dali: DALI interface to use
-    :param adr: Address information
-    :param bank: Memory bank number
-    """
-    set_device_dtr1(dali, bank)
-    set_device_dtr0(dali, 0)
-    last_accessible_location = query_device_value(dali, adr, DeviceQueryCommandOpcode.READ_MEMORY)
-    if last_accessible_location is None:
-        click.echo(f"memory bank {bank} not implemented")
-        return
-    MemoryBankItemWithAnnotation.show(bank, 0, last_accessible_location)
-    for location in range(1, last_accessible_location + 1):
-        MemoryBankItemWithAnnotation.show(
-            bank,
-            location,
-            query_device_value(dali, adr, DeviceQueryCommandOpcode.READ_MEMORY),
-        )
+@dump_options
+def dump(
+    dali: DaliInterface,
+    adr: str,
+    bank: int | None,
+    all_banks: bool,
+    output: str,
+    output_format: str,
+    refresh: str,
+    decoded: bool,
+) -> None:
+    dump_banks(
+        lambda address: bank_access(dali, address),
+        "device",
+        adr,
+        bank,
+        all_banks,
+        output,
+        output_format,
+        refresh,
+        decoded,
+    )
@@ -1,17 +1,24 @@
 """Control device discovery and enumerate."""
 
 import click
-from dali_interface import DaliFrame, DaliInterface
+from dali_interface import DaliFrame, DaliInterface, DaliStatus
 
 from ..system.constants import DaliFrameLength, DaliMax
-from .device_action import set_device_dtr0, set_device_dtr2_dtr1
+from ..system.enumeration import enumerate_units, enumeration_options
+from ..system.pipeline import DaliPipeline, pass_pipeline
+from ..system.search import bounded_search
+from .device_action import query_device_value, set_device_dtr0, set_device_dtr2_dtr1
 from .device_address import DeviceAddress, InstanceAddress
-from .device_opcode import DeviceConfigureCommandOpcode, DeviceSpecialCommandOpcode
+from .device_opcode import DeviceConfigureCommandOpcode, DeviceQueryCommandOpcode, DeviceSpecialCommandOpcode
 
+KIND = "device"
+PREFIX = "D"
 
-def prepare_bus(dali: DaliInterface) -> None:
+
+def prepare_bus(dali: DaliInterface, unaddressed: bool = False) -> None:
+    # INITIALISE all devices, or only devices without short address
     address = DeviceAddress("SPECIAL")
-    data = address.byte << 16 | DeviceSpecialCommandOpcode.INITIALISE << 8 | 0xFF
+    data = address.byte << 16 | DeviceSpecialCommandOpcode.INITIALISE << 8 | (0x7F if unaddressed else 0xFF)
     dali.transmit(DaliFrame(length=DaliFrameLength.DEVICE, data=data, send_twice=True), block=True)
     address = DeviceAddress()
     instance = InstanceAddress()
@@ -19,9 +26,55 @@ def prepare_bus(dali: DaliInterface) -> None:
     dali.transmit(DaliFrame(length=DaliFrameLength.DEVICE, data=data, send_twice=True), block=True)
 
 
-def clear_short_addresses(dali: DaliInterface) -> None:
+def device_status_reply(dali: DaliInterface, address: DeviceAddress) -> DaliFrame:
+    instance = InstanceAddress()
+    instance.device()
+    command = address.byte << 16 | instance.byte << 8 | DeviceQueryCommandOpcode.QUERY_STATUS
+    return dali.query_reply(DaliFrame(length=DaliFrameLength.DEVICE, data=command))
+
+
+def used_short_addresses(dali: DaliInterface) -> set[int]:
+    address = DeviceAddress()
+    if device_status_reply(dali, address).status == DaliStatus.TIMEOUT:
+        return set()
+    used = set()
+    for short_address in range(DaliMax.ADR):
+        address.short(short_address)
+        if device_status_reply(dali, address).status != DaliStatus.TIMEOUT:
+            used.add(short_address)
+    return used
+
+
+def read_random_address(dali: DaliInterface, short_address: int) -> int | None:
+    random_address = 0
+    opcodes = (
+        DeviceQueryCommandOpcode.QUERY_RANDOM_ADDRESS_H,
+        DeviceQueryCommandOpcode.QUERY_RANDOM_ADDRESS_M,
+        DeviceQueryCommandOpcode.QUERY_RANDOM_ADDRESS_L,
+    )
+    for opcode in opcodes:
+        value = query_device_value(dali, str(short_address), opcode)
+        if value is None:
+            return None
+        random_address = random_address << 8 | value
+    return random_address
+
+
+def read_random_addresses(dali: DaliInterface, short_addresses: set[int]) -> dict[int, int]:
+    """Random to short address map of the devices at short_addresses that answer QUERY RANDOM ADDRESS."""
+    address_map = {}
+    for short_address in sorted(short_addresses):
+        random_address = read_random_address(dali, short_address)
+        if random_address is not None:
+            address_map[random_address] = short_address
+    return address_map
+
+
+def clear_short_addresses(dali: DaliInterface, short_address: int | None = None) -> None:
     set_device_dtr0(dali, 0xFF)
     address = DeviceAddress()
+    if short_address is not None:
+        address.short(short_address)
     instance = InstanceAddress()
     instance.device()
     data = address.byte << 16 | instance.byte << 8 | DeviceConfigureCommandOpcode.SET_SHORT_ADDRESS
@@ -61,35 +114,36 @@ def compare(dali: DaliInterface) -> bool:
     address = DeviceAddress("SPECIAL")
     data = address.byte << 16 | DeviceSpecialCommandOpcode.COMPARE << 8
     result = dali.query_reply(DaliFrame(length=DaliFrameLength.DEVICE, data=data))
-    return result.length == DaliFrameLength.BACKWARD
+    # several devices answering at once can show up as a framing error
+    return result.status != DaliStatus.TIMEOUT
 
 
-def binary_search(dali: DaliInterface) -> int | None:
-    search = DaliMax.RANDOM_ADR - 1
-    set_search_address(dali, search)
-    if compare(dali):
-        position = 23
-        while position >= 0:
-            set_search_address(dali, search & ~(1 << position))
-            if compare(dali):
-                search = search & ~(1 << position)
-            position = position - 1
-        return search
-    click.echo("No (more) devices.")
-    return None
+def binary_search(dali: DaliInterface, low: int = 0) -> int | None:
+    search = bounded_search(lambda address: set_search_address(dali, address), lambda: compare(dali), low)
+    if search is None:
+        click.echo("No (more) devices.")
+    return search
 
 
-def set_short_address(dali: DaliInterface, new_short_address: int) -> bool:
+def set_short_address(dali: DaliInterface, new_short_address: int) -> DaliFrame:
     address = DeviceAddress("SPECIAL")
     data = address.byte << 16 | DeviceSpecialCommandOpcode.PROGRAM_SHORT_ADDRESS << 8 | new_short_address & 0xFF
     dali.transmit(DaliFrame(length=DaliFrameLength.DEVICE, data=data), block=True)
     data = address.byte << 16 | DeviceSpecialCommandOpcode.VERIFY_SHORT_ADDRESS << 8 | new_short_address & 0xFF
     result = dali.query_reply(DaliFrame(length=DaliFrameLength.DEVICE, data=data))
-    if result.length == DaliFrameLength.BACKWARD:
-        data = address.byte << 16 | DeviceSpecialCommandOpcode.WITHDRAW << 8
-        dali.transmit(DaliFrame(length=DaliFrameLength.DEVICE, data=data), block=True)
-        return True
-    return False
+    # withdraw even on failure, the next search continues above this random address
+    data = address.byte << 16 | DeviceSpecialCommandOpcode.WITHDRAW << 8
+    dali.transmit(DaliFrame(length=DaliFrameLength.DEVICE, data=data), block=True)
+    return result
+
+
+def initialise_unit(dali: DaliInterface, short_address: int) -> None:
+    """Let only the devices with short_address take part in a new search."""
+    address = DeviceAddress("SPECIAL")
+    data = address.byte << 16 | DeviceSpecialCommandOpcode.TERMINATE << 8
+    dali.transmit(DaliFrame(length=DaliFrameLength.DEVICE, data=data), block=True)
+    data = address.byte << 16 | DeviceSpecialCommandOpcode.INITIALISE << 8 | short_address
+    dali.transmit(DaliFrame(length=DaliFrameLength.DEVICE, data=data, send_twice=True), block=True)
 
 
 def finish_work(dali: DaliInterface) -> None:
@@ -102,22 +156,28 @@ def finish_work(dali: DaliInterface) -> None:
     dali.transmit(DaliFrame(length=DaliFrameLength.DEVICE, data=data, send_twice=True), block=True)
 
 
+class DeviceUnits:
+    """Search and addressing commands of control devices."""
+
+    kind = KIND
+    prefix = PREFIX
+    prepare_bus = staticmethod(prepare_bus)
+    used_short_addresses = staticmethod(used_short_addresses)
+    read_random_addresses = staticmethod(read_random_addresses)
+    clear_short_addresses = staticmethod(clear_short_addresses)
+    remove_from_all_groups = staticmethod(remove_from_all_groups)
+    request_new_random_addresses = staticmethod(request_new_random_addresses)
+    set_search_address = staticmethod(set_search_address)
+    binary_search = staticmethod(binary_search)
+    set_short_address = staticmethod(set_short_address)
+    initialise_unit = staticmethod(initialise_unit)
+    finish_work = staticmethod(finish_work)
+
+
 @click.command(name="enum", help="Clear and re-program short addresses of all control devices.")
-@click.pass_obj
-def device_enumerate(dali: DaliInterface):
-    prepare_bus(dali)
-    clear_short_addresses(dali)
-    remove_from_all_groups(dali)
-    request_new_random_addresses(dali)
-    next_short_address = 0
-    while True:
-        search = binary_search(dali)
-        if search is None:
-            break
-        set_search_address(dali, search)
-        if set_short_address(dali, next_short_address):
-            click.echo(f"assigned D{next_short_address:02}.")
-            next_short_address = next_short_address + 1
-        else:
-            click.echo("address search failed.")
-    finish_work(dali)
+@pass_pipeline
+@enumeration_options(KIND)
+def device_enumerate(
+    pipeline: DaliPipeline, checkpoint_path: str, resume: bool, keep_addresses: bool, address_map_path: str
+):
+    enumerate_units(DeviceUnits(), pipeline, checkpoint_path, resume, keep_addresses, address_map_path)
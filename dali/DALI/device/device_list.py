@@ -0,0 +1,24 @@
+"""Control device list available short addresses."""
+
+import click
+from dali_interface import DaliInterface, DaliStatus
+
+from ..system.constants import DaliFrameLength, DaliMax
+from .device_address import DeviceAddress
+from .device_enumerate import device_status_reply
+
+
+def device_present(dali: DaliInterface, short_address: int) -> bool:
+    address = DeviceAddress()
+    address.short(short_address)
+    return device_status_reply(dali, address).length == DaliFrameLength.BACKWARD
+
+
+@click.command(name="list", help="List used short addresses.")
+@click.pass_obj
+def device_list(dali: DaliInterface) -> None:
+    if device_status_reply(dali, DeviceAddress()).status != DaliStatus.TIMEOUT:
+        click.echo("Found control devices.")
+        for short_address in range(DaliMax.ADR):
+            if device_present(dali, short_address):
+                click.echo(f"D{short_address:02}")
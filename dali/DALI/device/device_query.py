@@ -3,6 +3,7 @@
 import click
 from dali_interface import DaliFrame, DaliInterface
 
+from ..system.address_list import multi_address_option
 from ..system.constants import DaliFrameLength, DaliMax
 from .device_action import query_device_value, query_instance_value, set_device_dtr0
 from .device_address import DeviceAddress
@@ -12,10 +13,14 @@ from .device_opcode import (
     DeviceSpecialCommandOpcode,
 )
 
-device_address_option = click.option(
-    "--adr",
-    default="BC",
-    help="Address, can be short address (0..63), group address (G0..G15), broadcast BC, or unaddressed BCU",
+device_address_option = multi_address_option(
+    click.option(
+        "--adr",
+        default="BC",
+        help="Address, can be short address (0..63), group address (G0..G15), broadcast BC, or unaddressed BCU, "
+        "a list or range of short addresses (3,7,9 or 0-15) or ALL",
+    ),
+    "D",
 )
 
 instance_address_option = click.option(
@@ -31,22 +36,23 @@ instance_address_option = click.option(
 )
 @click.pass_obj
 @device_address_option
-def capabilities(dali: DaliInterface, adr: str) -> None:
+def capabilities(dali: DaliInterface, adr: str) -> list[str] | None:
     """IEC62386-103-2022  11.6.2 QUERY DEVICE CAPABILITIES"""
     result = query_device_value(dali, adr, DeviceQueryCommandOpcode.QUERY_DEVICE_CAPABILITIES)
-    if result is not None:
-        click.echo(f"capabilities: {result} = 0x{result:02X} = {result:08b}b")
-        click.echo("bit : description")
-        click.echo(f"  {(result >> 0 & 0x01)} : applicationControllerPresent")
-        click.echo(f"  {(result >> 1 & 0x01)} : numberOfInstances > 0")
-        click.echo(f"  {(result >> 2 & 0x01)} : applicationControllerAlwaysActive")
-        click.echo(f"  {(result >> 3 & 0x01)} : reserved for IEC 62386-104")
-        click.echo(f"  {(result >> 4 & 0x01)} : reserved for IEC 62386-104")
-        click.echo(f"  {(result >> 5 & 0x01)} : At least one instance supports instanceType configuration")
-        click.echo(f"  {(result >> 6 & 0x01)} : unused")
-        click.echo(f"  {(result >> 7 & 0x01)} : unused")
-    else:
-        click.echo("timeout - NO")
+    if result is None:
+        return None
+    return [
+        f"capabilities: {result} = 0x{result:02X} = {result:08b}b",
+        "bit : description",
+        f"  {(result >> 0 & 0x01)} : applicationControllerPresent",
+        f"  {(result >> 1 & 0x01)} : numberOfInstances > 0",
+        f"  {(result >> 2 & 0x01)} : applicationControllerAlwaysActive",
+        f"  {(result >> 3 & 0x01)} : reserved for IEC 62386-104",
+        f"  {(result >> 4 & 0x01)} : reserved for IEC 62386-104",
+        f"  {(result >> 5 & 0x01)} : At least one instance supports instanceType configuration",
+        f"  {(result >> 6 & 0x01)} : unused",
+        f"  {(result >> 7 & 0x01)} : unused",
+    ]
 
 
 @click.command(
@@ -55,22 +61,23 @@ def capabilities(dali: DaliInterface, adr: str) -> None:
 )
 @click.pass_obj
 @device_address_option
-def status(dali: DaliInterface, adr: str) -> None:
+def status(dali: DaliInterface, adr: str) -> list[str] | None:
     """IEC62386-103-2022 11.6.3 QUERY DEVICE STATUS"""
     result = query_device_value(dali, adr, DeviceQueryCommandOpcode.QUERY_STATUS)
-    if result is not None:
-        click.echo(f"status: {result} = 0x{result:02X} = {result:08b}b")
-        click.echo("bit : description")
-        click.echo(f"  {(result >> 0 & 0x01)} : inputDeviceError")
-        click.echo(f"  {(result >> 1 & 0x01)} : quiescentMode")
-        click.echo(f"  {(result >> 2 & 0x01)} : shortAddress is Mask")
-        click.echo(f"  {(result >> 3 & 0x01)} : applicationActive")
-        click.echo(f"  {(result >> 4 & 0x01)} : applicationControllerError")
-        click.echo(f"  {(result >> 5 & 0x01)} : powerCycleSeen")
-        click.echo(f"  {(result >> 6 & 0x01)} : resetState")
-        click.echo(f"  {(result >> 7 & 0x01)} : unused")
-    else:
-        click.echo("timeout - NO")
+    if result is None:
+        return None
+    return [
+        f"status: {result} = 0x{result:02X} = {result:08b}b",
+        "bit : description",
+        f"  {(result >> 0 & 0x01)} : inputDeviceError",
+        f"  {(result >> 1 & 0x01)} : quiescentMode",
+        f"  {(result >> 2 & 0x01)} : shortAddress is Mask",
+        f"  {(result >> 3 & 0x01)} : applicationActive",
+        f"  {(result >> 4 & 0x01)} : applicationControllerError",
+        f"  {(result >> 5 & 0x01)} : powerCycleSeen",
+        f"  {(result >> 6 & 0x01)} : resetState",
+        f"  {(result >> 7 & 0x01)} : unused",
+    ]
 
 
 # NOT IMPLEMENTED: IEC62386-103-2022
@@ -81,41 +88,38 @@ def status(dali: DaliInterface, adr: str) -> None:
 @click.command(name="missing", help="missing short address.")
 @click.pass_obj
 @device_address_option
-def missing(dali: DaliInterface, adr: str) -> None:
+def missing(dali: DaliInterface, adr: str) -> list[str] | None:
     """IEC62386-103-2022 11.6.6 QUERY MISSING SHORT ADDRESS"""
     result = query_device_value(dali, adr, DeviceQueryCommandOpcode.QUERY_MISSING_SHORT_ADDRESS)
+    if result is None:
+        return None
     if result == DaliMax.MASK:
-        click.echo(f"missing: {result} = 0x{result:02X} = {result:08b}b = YES")
-    elif result is None:
-        click.echo("timeout - NO")
-    else:
-        click.echo(f"missing: {result} = 0x{result:02X} = {result:08b}b = undefined")
+        return [f"missing: {result} = 0x{result:02X} = {result:08b}b = YES"]
+    return [f"missing: {result} = 0x{result:02X} = {result:08b}b = undefined"]
 
 
 @click.command(name="version", help="Control device version number.")
 @click.pass_obj
 @device_address_option
-def version(dali: DaliInterface, adr: str) -> None:
+def version(dali: DaliInterface, adr: str) -> list[str] | None:
     """IEC62386-103-2022 11.6.7 QUERY VERSION NUMBER"""
     result = query_device_value(dali, adr, DeviceQueryCommandOpcode.QUERY_VERSION_NUMBER)
-    if result is not None:
-        major_version = result >> 2
-        minor_version = result & 7
-        click.echo(f"version: {result} = 0x{result:02X} = {result:08b}b = {major_version}.{minor_version}")
-    else:
-        click.echo("timeout - NO")
+    if result is None:
+        return None
+    major_version = result >> 2
+    minor_version = result & 7
+    return [f"version: {result} = 0x{result:02X} = {result:08b}b = {major_version}.{minor_version}"]
 
 
 @click.command(name="dtr0", help="Content of DTR0.")
 @click.pass_obj
 @device_address_option
-def dtr0(dali: DaliInterface, adr: str) -> None:
+def dtr0(dali: DaliInterface, adr: str) -> list[str] | None:
     """IEC62386-103-2022 11.6.8 QUERY CONTENT DTR0"""
     result = query_device_value(dali, adr, DeviceQueryCommandOpcode.QUERY_CONTENT_DTR0)
-    if result is not None:
-        click.echo(f"DTR0: {result} = 0x{result:02X} = {result:08b}b")
-    else:
-        click.echo("timeout - NO")
+    if result is None:
+        return None
+    return [f"DTR0: {result} = 0x{result:02X} = {result:08b}b"]
 
 
 # NOT IMPLEMENTED: IEC62386-103-2022
@@ -125,40 +129,37 @@ def dtr0(dali: DaliInterface, adr: str) -> None:
 @click.command(name="dtr1", help="Content of DTR1.")
 @click.pass_obj
 @device_address_option
-def dtr1(dali: DaliInterface, adr: str) -> None:
+def dtr1(dali: DaliInterface, adr: str) -> list[str] | None:
     """IEC62386-103-2022 11.6.10 QUERY CONTENT DTR1"""
     result = query_device_value(dali, adr, DeviceQueryCommandOpcode.QUERY_CONTENT_DTR1)
-    if result is not None:
-        click.echo(f"DTR1: {result} = 0x{result:02X} = {result:08b}b")
-    else:
-        click.echo("timeout - NO")
+    if result is None:
+        return None
+    return [f"DTR1: {result} = 0x{result:02X} = {result:08b}b"]
 
 
 @click.command(name="dtr2", help="Content of DTR2.")
 @click.pass_obj
 @device_address_option
-def dtr2(dali: DaliInterface, adr: str) -> None:
+def dtr2(dali: DaliInterface, adr: str) -> list[str] | None:
     """IEC62386-103-2022 11.6.11 QUERY CONTENT DTR2"""
     result = query_device_value(dali, adr, DeviceQueryCommandOpcode.QUERY_CONTENT_DTR2)
-    if result is not None:
-        click.echo(f"DTR2: {result} = 0x{result:02X} = {result:08b}b")
-    else:
-        click.echo("timeout - NO")
+    if result is None:
+        return None
+    return [f"DTR2: {result} = 0x{result:02X} = {result:08b}b"]
 
 
 @click.command(name="random", help="randomAddress.")
 @click.pass_obj
 @device_address_option
-def random(dali: DaliInterface, adr: str) -> None:
+def random(dali: DaliInterface, adr: str) -> list[str] | None:
     """IEC62386-103-2022 11.6.12 QUERY RANDOM ADDRESS (H), 11.6.13 QUERY RANDOM ADDRESS (M), 11.6.14 QUERY RANDOM ADDRESS (L)"""
     random_h = query_device_value(dali, adr, DeviceQueryCommandOpcode.QUERY_RANDOM_ADDRESS_H)
     random_m = query_device_value(dali, adr, DeviceQueryCommandOpcode.QUERY_RANDOM_ADDRESS_M)
     random_l = query_device_value(dali, adr, DeviceQueryCommandOpcode.QUERY_RANDOM_ADDRESS_L)
     if (random_h is None) or (random_m is None) or (random_l is None):
-        click.echo("timeout - NO")
-    else:
-        random_address = random_h << 16 | random_m << 8 | random_l
-        click.echo(f"random address: 0x{random_address:06X} = " f"{random_address:024b}b = " f"{random_address}")
+        return None
+    random_address = random_h << 16 | random_m << 8 | random_l
+    return [f"random address: 0x{random_address:06X} = " f"{random_address:024b}b = " f"{random_address}"]
 
 
 # NOT IMPLEMENTED: IEC62386-103-2022
@@ -168,13 +169,12 @@ def random(dali: DaliInterface, adr: str) -> None:
 @click.command(name="application", help="Application controller enabled status.")
 @click.pass_obj
 @device_address_option
-def application(dali: DaliInterface, adr: str) -> None:
+def application(dali: DaliInterface, adr: str) -> list[str] | None:
     """IEC62386-103-2022 11.6.16 QUERY APPLICATION CONTROLLER ENABLED"""
     result = query_device_value(dali, adr, DeviceQueryCommandOpcode.QUERY_APPLICATION_CONTROLLER_ENABLED)
-    if result is not None:
-        click.echo(f"application: {result} = 0x{result:02X} = {result:08b}b")
-    else:
-        click.echo("timeout - NO")
+    if result is None:
+        return None
+    return [f"application: {result} = 0x{result:02X} = {result:08b}b"]
 
 
 # NOT IMPLEMENTED: IEC62386-103-2022
@@ -185,85 +185,72 @@ def application(dali: DaliInterface, adr: str) -> None:
 @click.command(name="quiescent", help="Quiescent mode status.")
 @click.pass_obj
 @device_address_option
-def quiescent(dali: DaliInterface, adr: str) -> None:
+def quiescent(dali: DaliInterface, adr: str) -> list[str] | None:
     """IEC62386-103-2022 11.6.19 QUERY QUIESCENT MODE"""
     result = query_device_value(dali, adr, DeviceQueryCommandOpcode.QUERY_QUIESCENT_MODE)
-    if result is not None:
-        click.echo(f"quiescent: {result} = 0x{result:02X} = {result:08b}b")
-    else:
-        click.echo("timeout - NO")
+    if result is None:
+        return None
+    return [f"quiescent: {result} = 0x{result:02X} = {result:08b}b"]
 
 
 @click.command(name="groups", help="Device group settings.")
 @click.pass_obj
 @device_address_option
-def groups(dali: DaliInterface, adr: str) -> None:
+def groups(dali: DaliInterface, adr: str) -> list[str] | None:
     """IEC62386-103-2022 11.6.20 QUERY DEVICE GROUPS 0-7, 11.6.21 QUERY DEVICE GROUPS 8-15, 11.6.22 QUERY DEVICE GROUPS 16-23, 11.6.23 QUERY DEVICE GROUPS 24-31"""
-    result = query_device_value(dali, adr, DeviceQueryCommandOpcode.QUERY_DEVICE_GROUPS_0_7)
-    if result is None:
-        click.echo("timeout - NO")
-        return
-    click.echo(f"groups  0- 7: {result:3} = 0x{result:02X} = {result:08b}b")
-    result = query_device_value(dali, adr, DeviceQueryCommandOpcode.QUERY_DEVICE_GROUPS_8_15)
-    if result is None:
-        click.echo("timeout - NO")
-        return
-    click.echo(f"groups  8-15: {result:3} = 0x{result:02X} = {result:08b}b")
-    result = query_device_value(dali, adr, DeviceQueryCommandOpcode.QUERY_DEVICE_GROUPS_16_23)
-    if result is None:
-        click.echo("timeout - NO")
-        return
-    click.echo(f"groups 16-23: {result:3} = 0x{result:02X} = {result:08b}b")
-    result = query_device_value(dali, adr, DeviceQueryCommandOpcode.QUERY_DEVICE_GROUPS_24_31)
-    if result is None:
-        click.echo("timeout - NO")
-        return
-    click.echo(f"groups 24-31: {result:3} = 0x{result:02X} = {result:08b}b")
+    lines = []
+    for first, opcode in (
+        (0, DeviceQueryCommandOpcode.QUERY_DEVICE_GROUPS_0_7),
+        (8, DeviceQueryCommandOpcode.QUERY_DEVICE_GROUPS_8_15),
+        (16, DeviceQueryCommandOpcode.QUERY_DEVICE_GROUPS_16_23),
+        (24, DeviceQueryCommandOpcode.QUERY_DEVICE_GROUPS_24_31),
+    ):
+        result = query_device_value(dali, adr, opcode)
+        if result is None:
+            return lines + ["timeout - NO"] if lines else None
+        lines.append(f"groups {first:2}-{first + 7:2}: {result:3} = 0x{result:02X} = {result:08b}b")
+    return lines
 
 
 @click.command(name="cycle", help="Power cycle notification enabled status.")
 @click.pass_obj
 @device_address_option
-def cycle(dali: DaliInterface, adr: str) -> None:
+def cycle(dali: DaliInterface, adr: str) -> list[str] | None:
     """IEC62386-103-2022 11.6.24 QUERY POWER CYCLE NOTIFICATION"""
     result = query_device_value(dali, adr, DeviceQueryCommandOpcode.QUERY_POWER_CYCLE_NOTIFICATION)
-    if result is not None:
-        click.echo(f"power cycle notification: {result} = 0x{result:02X} = {result:08b}b")
-    else:
-        click.echo("timeout - NO")
+    if result is None:
+        return None
+    return [f"power cycle notification: {result} = 0x{result:02X} = {result:08b}b"]
 
 
 @click.command(name="extended", help="Control device extended version number for 30X.")
 @click.pass_obj
 @click.argument("x", type=click.INT)
 @device_address_option
-def extended(dali: DaliInterface, x: int, adr: str) -> None:
+def extended(dali: DaliInterface, x: int, adr: str) -> list[str] | None:
     """IEC62386-103-2022 11.6.25 QUERY EXTENDED VERSION NUMBER(DTR0)"""
     if 0 <= x < DaliMax.VALUE:
         set_device_dtr0(dali, x)
         result = query_device_value(dali, adr, DeviceQueryCommandOpcode.QUERY_EXTENDED_VERSION_NUMBER)
-        if result is not None:
-            major_version = result >> 2
-            minor_version = result & 7
-            click.echo(f"version: {result} = 0x{result:02X} = {result:08b}b = {major_version}.{minor_version}")
-        else:
-            click.echo("timeout - NO")
-    else:
-        raise click.BadParameter(f"needs to be between 0 and {DaliMax.VALUE - 1}.", param_hint="X")
+        if result is None:
+            return None
+        major_version = result >> 2
+        minor_version = result & 7
+        return [f"version: {result} = 0x{result:02X} = {result:08b}b = {major_version}.{minor_version}"]
+    raise click.BadParameter(f"needs to be between 0 and {DaliMax.VALUE - 1}.", param_hint="X")
 
 
 @click.command(name="reset", help="Reset state of all variables.")
 @click.pass_obj
 @device_address_option
-def reset(dali: DaliInterface, adr: str) -> None:
+def reset(dali: DaliInterface, adr: str) -> list[str] | None:
     """IEC62386-103-2022 11.6.26 QUERY RESET STATE"""
     result = query_device_value(dali, adr, DeviceQueryCommandOpcode.QUERY_RESET_STATE)
     if result is None:
-        click.echo("timeout - NO")
-    elif result == DaliMax.MASK:
-        click.echo("YES")
-    else:
-        click.echo(f"{result} = 0x{result:02X} = {result:08b}b")
+        return None
+    if result == DaliMax.MASK:
+        return ["YES"]
+    return [f"{result} = 0x{result:02X} = {result:08b}b"]
 
 
 # NOT IMPLEMENTED: IEC62386-103-2022
@@ -277,83 +264,79 @@ def reset(dali: DaliInterface, adr: str) -> None:
 @click.pass_obj
 @device_address_option
 @instance_address_option
-def itype(dali: DaliInterface, adr: str, instance: str) -> None:
+def itype(dali: DaliInterface, adr: str, instance: str) -> list[str] | None:
     """IEC62386-103-2022 11.9.2 QUERY INSTANCE TYPE"""
     result = query_instance_value(dali, adr, instance, DeviceInstanceQueryOpcode.QUERY_INSTANCE_TYPE)
-    if result is not None:
-        click.echo(f"type {result} = 0x{result:02X} = {result:08b}b")
-    else:
-        click.echo("timeout - NO")
+    if result is None:
+        return None
+    return [f"type {result} = 0x{result:02X} = {result:08b}b"]
 
 
 @click.command(name="resolution", help="Instance resolution.")
 @click.pass_obj
 @device_address_option
 @instance_address_option
-def resolution(dali: DaliInterface, adr: str, instance: str) -> None:
+def resolution(dali: DaliInterface, adr: str, instance: str) -> list[str] | None:
     """IEC62386-103-2022 11.9.3 QUERY RESOLUTION"""
     result = query_instance_value(dali, adr, instance, DeviceInstanceQueryOpcode.QUERY_RESOLUTION)
-    if result is not None:
-        click.echo(f"resolution {result} = 0x{result:02X} = {result:08b}b")
-    else:
-        click.echo("timeout - NO")
+    if result is None:
+        return None
+    return [f"resolution {result} = 0x{result:02X} = {result:08b}b"]
 
 
 @click.command(name="error", help="Instance error information.")
 @click.pass_obj
 @device_address_option
 @instance_address_option
-def error(dali: DaliInterface, adr: str, instance: str) -> None:
+def error(dali: DaliInterface, adr: str, instance: str) -> list[str] | None:
     """IEC62386-103-2022 11.9.4 QUERY INSTANCE ERROR"""
     result = query_instance_value(dali, adr, instance, DeviceInstanceQueryOpcode.QUERY_INSTANCE_ERROR)
-    if result is not None:
-        click.echo(f"error {result} = 0x{result:02X} = {result:08b}b")
-    else:
-        click.echo("timeout - NO")
+    if result is None:
+        return None
+    return [f"error {result} = 0x{result:02X} = {result:08b}b"]
 
 
 @click.command(name="istatus", help="Instance status information.")
 @click.pass_obj
 @device_address_option
 @instance_address_option
-def istatus(dali: DaliInterface, adr: str, instance: str) -> None:
+def istatus(dali: DaliInterface, adr: str, instance: str) -> list[str] | None:
     """IEC62386-103-2022 11.9.5 QUERY INSTANCE STATUS"""
     result = query_instance_value(dali, adr, instance, DeviceInstanceQueryOpcode.QUERY_INSTANCE_STATUS)
-    if result is not None:
-        click.echo(f"status: {result} = 0x{result:02X} = {result:08b}b")
-        click.echo("bit : description")
-        click.echo(f"  {(result >> 0 & 0x01)} : instanceError")
-        click.echo(f"  {(result >> 1 & 0x01)} : instanceActive")
-    else:
-        click.echo("timeout - NO")
+    if result is None:
+        return None
+    return [
+        f"status: {result} = 0x{result:02X} = {result:08b}b",
+        "bit : description",
+        f"  {(result >> 0 & 0x01)} : instanceError",
+        f"  {(result >> 1 & 0x01)} : instanceActive",
+    ]
 
 
 @click.command(name="enabled", help="Instance active information.")
 @click.pass_obj
 @device_address_option
 @instance_address_option
-def enabled(dali: DaliInterface, adr: str, instance: str) -> None:
+def enabled(dali: DaliInterface, adr: str, instance: str) -> list[str] | None:
     """IEC62386-103-2022 11.9.6 QUERY INSTANCE ENABLED"""
     result = query_instance_value(dali, adr, instance, DeviceInstanceQueryOpcode.QUERY_INSTANCE_ENABLED)
     if result is None:
-        click.echo("timeout - NO")
-    elif result == DaliMax.MASK:
-        click.echo("YES")
-    else:
-        click.echo(f"{result} = 0x{result:02X} = {result:08b}b")
+        return None
+    if result == DaliMax.MASK:
+        return ["YES"]
+    return [f"{result} = 0x{result:02X} = {result:08b}b"]
 
 
 @click.command(name="primary", help="Primary instance group setting.")
 @click.pass_obj
 @device_address_option
 @instance_address_option
-def primary(dali: DaliInterface, adr: str, instance: str) -> None:
+def primary(dali: DaliInterface, adr: str, instance: str) -> list[str] | None:
     """IEC62386-103-2022 11.9.7 QUERY PRIMARY INSTANCE GROUP"""
     result = query_instance_value(dali, adr, instance, DeviceInstanceQueryOpcode.QUERY_PRIMARY_INSTANCE_GROUP)
-    if result is not None:
-        click.echo(f"primary group {result} = 0x{result:02X} = {result:08b}b")
-    else:
-        click.echo("timeout - NO")
+    if result is None:
+        return None
+    return [f"primary group {result} = 0x{result:02X} = {result:08b}b"]
 
 
 # NOT IMPLEMENTED: IEC62386-103-2022
@@ -365,25 +348,20 @@ def primary(dali: DaliInterface, adr: str, instance: str) -> None:
 @click.pass_obj
 @device_address_option
 @instance_address_option
-def scheme(dali: DaliInterface, adr: str, instance: str) -> None:
+def scheme(dali: DaliInterface, adr: str, instance: str) -> list[str] | None:
     """IEC62386-103-2022 11.9.10 QUERY EVENT SCHEME"""
     result = query_instance_value(dali, adr, instance, DeviceInstanceQueryOpcode.QUERY_EVENT_SCHEME)
-    if result is not None:
-        click.echo(f"event scheme {result} = 0x{result:02X} = {result:08b}b")
-        if result == 0:
-            click.echo("Instance addressing, using instance type and number.")
-        elif result == 1:
-            click.echo("Device addressing, using short address and instance type.")
-        elif result == 2:
-            click.echo("Device and instance addressing, using short address and instance number.")
-        elif result == 3:
-            click.echo("Device group addressing, using device group and instance type.")
-        elif result == 4:
-            click.echo("Instance group addressing, using instance group and type.")
-        else:
-            click.echo("Invalid event scheme.")
-    else:
-        click.echo("timeout - NO")
+    if result is None:
+        return None
+    schemes = (
+        "Instance addressing, using instance type and number.",
+        "Device addressing, using short address and instance type.",
+        "Device and instance addressing, using short address and instance number.",
+        "Device group addressing, using device group and instance type.",
+        "Instance group addressing, using instance group and type.",
+    )
+    scheme_description = schemes[result] if result < len(schemes) else "Invalid event scheme."
+    return [f"event scheme {result} = 0x{result:02X} = {result:08b}b", scheme_description]
 
 
 @click.command(
@@ -392,18 +370,17 @@ def scheme(dali: DaliInterface, adr: str, instance: str) -> None:
 @click.pass_obj
 @device_address_option
 @instance_address_option
-def input_value(dali: DaliInterface, adr: str, instance: str) -> None:
+def input_value(dali: DaliInterface, adr: str, instance: str) -> list[str] | None:
     """IEC62386-103-2022 11.9.11 QUERY INPUT VALUE, 11.9.12 QUERY INPUT VALUE LATCH"""
     result = query_instance_value(dali, adr, instance, DeviceInstanceQueryOpcode.QUERY_INPUT_VALUE)
     if result is None:
-        click.echo("timeout - NO")
-    else:
-        value = result
-        while result is not None:
-            result = query_instance_value(dali, adr, instance, DeviceInstanceQueryOpcode.QUERY_INPUT_VALUE_LATCH)
-            if result is not None:
-                value = (value << 8) | result
-        click.echo(f"input value {value} = 0x{value:X} = {value:b}b")
+        return None
+    value = result
+    while result is not None:
+        result = query_instance_value(dali, adr, instance, DeviceInstanceQueryOpcode.QUERY_INPUT_VALUE_LATCH)
+        if result is not None:
+            value = (value << 8) | result
+    return [f"input value {value} = 0x{value:X} = {value:b}b"]
 
 
 # NOT IMPLEMENTED: IEC62386-103-2022
@@ -4,9 +4,9 @@ import logging
 
 import click
 from dali_interface import DaliFrame, DaliInterface
-from typeguard import typechecked
 
 from ..system.constants import DaliFrameLength, DaliMax
+from ..system.typecheck import typechecked
 from .gear_address import GearAddress
 from .gear_opcode import GearSpecialCommandOpcode
 
@@ -38,6 +38,13 @@ def query_gear_value(dali: DaliInterface, adr_parameter: str, opcode: int) -> in
     return None
 
 
+def reply_lines(result: int | None) -> list[str] | None:
+    """Reply of a query in hexadecimal, decimal and binary, None on a timeout."""
+    if result is None:
+        return None
+    return [f"0x{result:02X} = {result} = {result:08b}b"]
+
+
 @typechecked
 def query_gear_and_display_reply(dali: DaliInterface, adr_parameter: str, opcode: int) -> None:
     logger.debug("gear_query_and_display_reply")
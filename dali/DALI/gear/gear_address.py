@@ -1,8 +1,7 @@
 """Class for control gear addressing."""
 
-from typeguard import typechecked
-
 from ..system.constants import DaliAddressingMode, DaliMax
+from ..system.typecheck import typechecked
 
 
 @typechecked
@@ -4,13 +4,15 @@ import click
 from dali_interface import DaliInterface
 
 from ..system.constants import DaliMax
+from ..system.pipeline import pass_pipeline
+from ..system.presence import forget_presence
 from .gear_action import set_gear_dtr0, write_gear_frame, write_gear_frame_and_wait
 from .gear_address import GearAddress
 from .gear_opcode import GearConfigureCommandOpcode, GearSpecialCommandOpcode
 
 
 @click.command(name="clear", help="Clear all short addresses and group settings.")
-@click.pass_obj
+@pass_pipeline
 def clear(dali: DaliInterface):
     write_gear_frame(dali, GearSpecialCommandOpcode.INITIALISE, send_twice=True)
     set_gear_dtr0(dali, 0xFF)
@@ -22,3 +24,4 @@ def clear(dali: DaliInterface):
             dali, address.byte, (GearConfigureCommandOpcode.REMOVE_GROUP + group), send_twice=True
         )
     write_gear_frame(dali, GearSpecialCommandOpcode.TERMINATE)
+    forget_presence("gear")
@@ -3,6 +3,8 @@
 import click
 
 from ..system.constants import DaliMax
+from ..system.pipeline import pass_pipeline
+from ..system.presence import forget_presence
 from .gear_action import gear_send_forward_frame, set_gear_dtr0
 from .gear_opcode import GearConfigureCommandOpcode
 
@@ -14,21 +16,22 @@ gear_address_option = click.option(
 
 
 @click.command(name="reset", help="Reset all control gear variables to their reset value.")
-@click.pass_obj
+@pass_pipeline
 @gear_address_option
 def reset(dali, adr):
     gear_send_forward_frame(dali, adr, GearConfigureCommandOpcode.RESET, True)
+    forget_presence("gear")
 
 
 @click.command(name="actual", help="Store the actualLevel into DTR0.")
-@click.pass_obj
+@pass_pipeline
 @gear_address_option
 def actual(dali, adr):
     gear_send_forward_frame(dali, adr, GearConfigureCommandOpcode.STORE_ACTUAL_LEVEL, True)
 
 
 @click.command(name="op", help="Set operating mode.")
-@click.pass_obj
+@pass_pipeline
 @gear_address_option
 @click.argument("mode", type=click.INT)
 def op(dali, adr, mode):
@@ -37,7 +40,7 @@ def op(dali, adr, mode):
 
 
 @click.command(name="reset_mem", help="Reset memory bank to reset value.")
-@click.pass_obj
+@pass_pipeline
 @gear_address_option
 @click.argument("bank", type=click.INT)
 def reset_mem(dali, adr, bank):
@@ -46,14 +49,14 @@ def reset_mem(dali, adr, bank):
 
 
 @click.command(name="id", help="Identify device.")
-@click.pass_obj
+@pass_pipeline
 @gear_address_option
 def identify(dali, adr):
     gear_send_forward_frame(dali, adr, GearConfigureCommandOpcode.IDENTIFY_GEAR, True)
 
 
 @click.command(name="max", help="Set maximum level.")
-@click.pass_obj
+@pass_pipeline
 @gear_address_option
 @click.argument("level", type=click.INT)
 def max_level(dali, adr, level):
@@ -62,7 +65,7 @@ def max_level(dali, adr, level):
 
 
 @click.command(name="min", help="Set minimum level.")
-@click.pass_obj
+@pass_pipeline
 @gear_address_option
 @click.argument("level", type=click.INT)
 def min_level(dali, adr, level):
@@ -71,7 +74,7 @@ def min_level(dali, adr, level):
 
 
 @click.command(name="fail", help="Set system failure level.")
-@click.pass_obj
+@pass_pipeline
 @gear_address_option
 @click.argument("level", type=click.INT)
 def fail(dali, adr, level):
@@ -80,7 +83,7 @@ def fail(dali, adr, level):
 
 
 @click.command(name="on", help="Set power on level.")
-@click.pass_obj
+@pass_pipeline
 @gear_address_option
 @click.argument("level", type=click.INT)
 def on(dali, adr, level):
@@ -90,7 +93,7 @@ def on(dali, adr, level):
 
 @click.command(name="time", help="Set fade time.")
 @gear_address_option
-@click.pass_obj
+@pass_pipeline
 @click.argument("value", type=click.INT)
 def time(dali, adr, value):
     set_gear_dtr0(dali, value, "VALUE")
@@ -99,7 +102,7 @@ def time(dali, adr, value):
 
 @click.command(name="rate", help="Set fade rate.")
 @gear_address_option
-@click.pass_obj
+@pass_pipeline
 @click.argument("value", type=click.INT)
 def rate(dali, adr, value):
     set_gear_dtr0(dali, value, "VALUE")
@@ -108,7 +111,7 @@ def rate(dali, adr, value):
 
 @click.command(name="ext", help="Set extended fade time.")
 @gear_address_option
-@click.pass_obj
+@pass_pipeline
 @click.argument("value", type=click.INT)
 def ext(dali, adr, value):
     set_gear_dtr0(dali, value, "VALUE")
@@ -123,7 +126,7 @@ def ext(dali, adr, value):
 @gear_address_option
 @click.argument("number", type=click.INT)
 @click.argument("level", type=click.INT)
-@click.pass_obj
+@pass_pipeline
 def scene(dali, adr, number, level):
     if 0 <= number < DaliMax.SCENE:
         set_gear_dtr0(dali, level, "LEVEL")
@@ -133,7 +136,7 @@ def scene(dali, adr, number, level):
 
 
 @click.command(name="remove", help="Remove from scene.")
-@click.pass_obj
+@pass_pipeline
 @gear_address_option
 @click.argument("number", type=click.INT)
 def remove(dali, adr, number):
@@ -144,7 +147,7 @@ def remove(dali, adr, number):
 
 
 @click.command(name="add", help="Add to group.")
-@click.pass_obj
+@pass_pipeline
 @gear_address_option
 @click.argument("group", type=click.INT)
 def add(dali, adr, group):
@@ -155,7 +158,7 @@ def add(dali, adr, group):
 
 
 @click.command(name="ungroup", help="Remove from group.")
-@click.pass_obj
+@pass_pipeline
 @gear_address_option
 @click.argument("group", type=click.INT)
 def ungroup(dali, adr, group):
@@ -166,7 +169,7 @@ def ungroup(dali, adr, group):
 
 
 @click.command(name="short", help="Set short address to ADDRESS.")
-@click.pass_obj
+@pass_pipeline
 @gear_address_option
 @click.argument("address", type=click.INT)
 def short(dali, adr, address):
@@ -174,12 +177,13 @@ def short(dali, adr, address):
         address = (address * 2) + 1
         set_gear_dtr0(dali, address, "ADDRESS")
         gear_send_forward_frame(dali, adr, GearConfigureCommandOpcode.SET_SHORT_ADDRESS, True)
+        forget_presence("gear")
     else:
         raise click.BadParameter(f"needs to be between 0 and {DaliMax.ADR - 1}", param_hint="ADDRESS")
 
 
 @click.command(name="enable", help="Enable write access.")
-@click.pass_obj
+@pass_pipeline
 @gear_address_option
 def enable(dali, adr):
     gear_send_forward_frame(dali, adr, GearConfigureCommandOpcode.ENABLE_WRITE, True)
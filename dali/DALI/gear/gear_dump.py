@@ -1,32 +1,35 @@
 """Control gear dump memory bank contents."""
 
+from collections.abc import Callable
+
 import click
 from dali_interface import DaliInterface
 
-from ..system.membank_annotation import MemoryBankItemWithAnnotation
+from ..system.membank_dump import dump_banks, dump_options
 from .gear_action import query_gear_value, set_gear_dtr0, set_gear_dtr1
 from .gear_opcode import GearQueryCommandOpcode
 
 
+def bank_access(dali: DaliInterface, adr: str) -> tuple[Callable[[int, int], None], Callable[[], int | None]]:
+    def select(bank: int, location: int) -> None:
+        set_gear_dtr1(dali, bank, "BANK")
+        set_gear_dtr0(dali, location, "LOCATION")
+
+    return select, lambda: query_gear_value(dali, adr, GearQueryCommandOpcode.READ_MEMORY)
+
+
 @click.command(name="dump", help="Dump contents of a memory bank.")
-@click.argument("bank", type=click.INT)
 @click.pass_obj
-@click.option(
-    "--adr",
-    default="BC",
-    help="Address, can be a short address (0..63) or group address (G0..G15).",
-)
-def dump(dali: DaliInterface, adr, bank):
-    set_gear_dtr1(dali, bank, "BANK")
-    set_gear_dtr0(dali, 0, "LOCATION")
-    last_accessible_location = query_gear_value(dali, adr, GearQueryCommandOpcode.READ_MEMORY)
-    if last_accessible_location is None:
-        click.echo(f"memory bank {bank} not implemented")
-        return
-    MemoryBankItemWithAnnotation.show(bank, 0, last_accessible_location)
-    for location in range(1, last_accessible_location + 1):
-        MemoryBankItemWithAnnotation.show(
-            bank,
-            location,
-            query_gear_value(dali, adr, GearQueryCommandOpcode.READ_MEMORY),
-        )
+@dump_options
+def dump(dali: DaliInterface, adr, bank, all_banks, output, output_format, refresh, decoded):
+    dump_banks(
+        lambda address: bank_access(dali, address),
+        "gear",
+        adr,
+        bank,
+        all_banks,
+        output,
+        output_format,
+        refresh,
+        decoded,
+    )
@@ -1,23 +1,74 @@
-"""Control device discovery and enumerate."""
+"""Control gear discovery and enumerate."""
 
 import click
-from dali_interface import DaliFrame, DaliInterface
+from dali_interface import DaliFrame, DaliInterface, DaliStatus
 
 from ..system.constants import DaliFrameLength, DaliMax
-from .gear_action import set_gear_dtr0, write_gear_frame, write_gear_frame_and_wait
+from ..system.enumeration import enumerate_units, enumeration_options
+from ..system.pipeline import DaliPipeline, pass_pipeline
+from ..system.search import bounded_search
+from .gear_action import query_gear_value, set_gear_dtr0, write_gear_frame, write_gear_frame_and_wait
 from .gear_address import GearAddress
-from .gear_opcode import GearConfigureCommandOpcode, GearSpecialCommandOpcode
+from .gear_opcode import GearConfigureCommandOpcode, GearQueryCommandOpcode, GearSpecialCommandOpcode
 
+KIND = "gear"
+PREFIX = "G"
 
-def prepare_bus(dali: DaliInterface) -> None:
-    # INITIALISE ALL
-    write_gear_frame_and_wait(dali, GearSpecialCommandOpcode.INITIALISE, 0xFF, True)
 
+def prepare_bus(dali: DaliInterface, unaddressed: bool = False) -> None:
+    # INITIALISE ALL, or INITIALISE only gears without short address
+    write_gear_frame_and_wait(dali, GearSpecialCommandOpcode.INITIALISE, 0xFF if unaddressed else 0x00, True)
 
-def clear_short_addresses(dali: DaliInterface) -> None:
-    set_gear_dtr0(dali, 0xFF)
+
+def used_short_addresses(dali: DaliInterface) -> set[int]:
+    used = set()
     address = GearAddress()
     address.broadcast()
+    command = address.byte << 8 | GearQueryCommandOpcode.GEAR_PRESENT
+    reply = dali.query_reply(DaliFrame(length=DaliFrameLength.GEAR, data=command))
+    if reply.status == DaliStatus.TIMEOUT:
+        return used
+    for short_address in range(DaliMax.ADR):
+        address.short(short_address)
+        command = address.byte << 8 | GearQueryCommandOpcode.GEAR_PRESENT
+        reply = dali.query_reply(DaliFrame(length=DaliFrameLength.GEAR, data=command))
+        if reply.status != DaliStatus.TIMEOUT:
+            used.add(short_address)
+    return used
+
+
+def read_random_address(dali: DaliInterface, short_address: int) -> int | None:
+    random_address = 0
+    opcodes = (
+        GearQueryCommandOpcode.RANDOM_ADDRESS_H,
+        GearQueryCommandOpcode.RANDOM_ADDRESS_M,
+        GearQueryCommandOpcode.RANDOM_ADDRESS_L,
+    )
+    for opcode in opcodes:
+        value = query_gear_value(dali, str(short_address), opcode)
+        if value is None:
+            return None
+        random_address = random_address << 8 | value
+    return random_address
+
+
+def read_random_addresses(dali: DaliInterface, short_addresses: set[int]) -> dict[int, int]:
+    """Random to short address map of the gears at short_addresses that answer QUERY RANDOM ADDRESS."""
+    address_map = {}
+    for short_address in sorted(short_addresses):
+        random_address = read_random_address(dali, short_address)
+        if random_address is not None:
+            address_map[random_address] = short_address
+    return address_map
+
+
+def clear_short_addresses(dali: DaliInterface, short_address: int | None = None) -> None:
+    set_gear_dtr0(dali, 0xFF)
+    address = GearAddress()
+    if short_address is None:
+        address.broadcast()
+    else:
+        address.short(short_address)
     write_gear_frame_and_wait(dali, address.byte, GearConfigureCommandOpcode.SET_SHORT_ADDRESS, True)
 
 
@@ -42,25 +93,18 @@ def set_search_address(dali: DaliInterface, search: int) -> None:
 def compare(dali: DaliInterface) -> bool:
     data = GearSpecialCommandOpcode.COMPARE << 8
     result = dali.query_reply(DaliFrame(length=DaliFrameLength.GEAR, data=data))
-    return result.length == DaliFrameLength.BACKWARD
+    # several gears answering at once can show up as a framing error
+    return result.status != DaliStatus.TIMEOUT
 
 
-def binary_search(dali: DaliInterface) -> int | None:
-    search = DaliMax.RANDOM_ADR - 1
-    set_search_address(dali, search)
-    if compare(dali):
-        position = 23
-        while position >= 0:
-            set_search_address(dali, search & ~(1 << position))
-            if compare(dali):
-                search = search & ~(1 << position)
-            position = position - 1
-        return search
-    click.echo("No (more) gears.")
-    return None
+def binary_search(dali: DaliInterface, low: int = 0) -> int | None:
+    search = bounded_search(lambda address: set_search_address(dali, address), lambda: compare(dali), low)
+    if search is None:
+        click.echo("No (more) gears.")
+    return search
 
 
-def set_short_address(dali: DaliInterface, new_short_address: int) -> bool:
+def set_short_address(dali: DaliInterface, new_short_address: int) -> DaliFrame:
     write_gear_frame(
         dali,
         GearSpecialCommandOpcode.PROGRAM_SHORT_ADDRESS,
@@ -68,32 +112,53 @@ def set_short_address(dali: DaliInterface, new_short_address: int) -> bool:
     )
     data = (GearSpecialCommandOpcode.VERIFY_SHORT_ADDRESS << 8) | ((new_short_address << 1) | 1)
     result = dali.query_reply(DaliFrame(length=DaliFrameLength.GEAR, data=data))
-    if result.length == DaliFrameLength.BACKWARD:
-        write_gear_frame(dali, GearSpecialCommandOpcode.WITHDRAW)
-        return True
-    return False
+    # withdraw even on failure, the next search continues above this random address
+    write_gear_frame(dali, GearSpecialCommandOpcode.WITHDRAW)
+    return result
+
+
+def initialise_unit(dali: DaliInterface, short_address: int) -> None:
+    """Let only the gears with short_address take part in a new search."""
+    finish_work(dali)
+    write_gear_frame_and_wait(dali, GearSpecialCommandOpcode.INITIALISE, (short_address << 1) | 1, True)
 
 
 def finish_work(dali: DaliInterface) -> None:
     write_gear_frame(dali, GearSpecialCommandOpcode.TERMINATE)
 
 
+class GearUnits:
+    """Search and addressing commands of control gears."""
+
+    kind = KIND
+    prefix = PREFIX
+    prepare_bus = staticmethod(prepare_bus)
+    used_short_addresses = staticmethod(used_short_addresses)
+    read_random_addresses = staticmethod(read_random_addresses)
+    clear_short_addresses = staticmethod(clear_short_addresses)
+    remove_from_all_groups = staticmethod(remove_from_all_groups)
+    request_new_random_addresses = staticmethod(request_new_random_addresses)
+    set_search_address = staticmethod(set_search_address)
+    binary_search = staticmethod(binary_search)
+    set_short_address = staticmethod(set_short_address)
+    initialise_unit = staticmethod(initialise_unit)
+    finish_work = staticmethod(finish_work)
+
+
 @click.command(name="enum", help="Clear and re-program short addresses of all control gears.")
-@click.pass_obj
-def gear_enumerate(dali: DaliInterface):
-    prepare_bus(dali)
-    clear_short_addresses(dali)
-    remove_from_all_groups(dali)
-    request_new_random_addresses(dali)
-    next_short_address = 0
-    while True:
-        search = binary_search(dali)
-        if search is None:
-            break
-        set_search_address(dali, search)
-        if set_short_address(dali, next_short_address):
-            click.echo(f"assigned G{next_short_address:02}.")
-            next_short_address = next_short_address + 1
-        else:
-            click.echo("address search failed.")
-    finish_work(dali)
+@pass_pipeline
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Keep existing short addresses and groups, only address gears without short address.",
+)
+@enumeration_options(KIND)
+def gear_enumerate(
+    pipeline: DaliPipeline,
+    incremental: bool,
+    checkpoint_path: str,
+    resume: bool,
+    keep_addresses: bool,
+    address_map_path: str,
+):
+    enumerate_units(GearUnits(), pipeline, checkpoint_path, resume, keep_addresses, address_map_path, incremental)
@@ -0,0 +1,90 @@
+"""Control gear inventory, one record per present gear."""
+
+import csv
+import json
+
+import click
+from dali_interface import DaliInterface
+
+from ..system.constants import DaliMax
+from .gear_action import query_gear_value
+from .gear_enumerate import read_random_address, used_short_addresses
+from .gear_opcode import GearQueryCommandOpcode
+
+FIELDS = [
+    ("status", GearQueryCommandOpcode.STATUS),
+    ("operating_mode", GearQueryCommandOpcode.OPERATING_MODE),
+    ("version", GearQueryCommandOpcode.VERSION_NUMBER),
+    ("actual_level", GearQueryCommandOpcode.ACTUAL_LEVEL),
+    ("power_on_level", GearQueryCommandOpcode.POWER_ON_LEVEL),
+    ("system_failure_level", GearQueryCommandOpcode.SYSTEM_FAILURE_LEVEL),
+    ("physical_minimum", GearQueryCommandOpcode.PHYSICAL_MINIMUM),
+    ("min_level", GearQueryCommandOpcode.MIN_LEVEL),
+    ("max_level", GearQueryCommandOpcode.MAX_LEVEL),
+    ("device_type", GearQueryCommandOpcode.DEVICE_TYPE),
+    ("dtr0", GearQueryCommandOpcode.CONTENT_DTR0),
+    ("dtr1", GearQueryCommandOpcode.CONTENT_DTR1),
+    ("dtr2", GearQueryCommandOpcode.CONTENT_DTR2),
+    ("fade_time_rate", GearQueryCommandOpcode.FADE_TIME_RATE),
+    ("extended_fade_time", GearQueryCommandOpcode.EXTENDED_FADE_TIME),
+] + [(f"scene_{scene}", GearQueryCommandOpcode.SCENE_LEVEL + scene) for scene in range(DaliMax.SCENE)]
+COLUMNS = ["address"] + [name for name, _ in FIELDS] + ["random_address", "groups"]
+
+
+def query_combined(dali: DaliInterface, adr: str, opcodes: tuple[int, ...]) -> int | None:
+    """Combine the replies to several queries into one value, most significant byte first."""
+    value = 0
+    for opcode in opcodes:
+        reply = query_gear_value(dali, adr, opcode)
+        if reply is None:
+            return None
+        value = value << 8 | reply
+    return value
+
+
+def read_record(dali: DaliInterface, short_address: int) -> dict[str, int | None] | None:
+    """Settings of a gear, None if it does not answer QUERY STATUS."""
+    adr = str(short_address)
+    status = query_gear_value(dali, adr, GearQueryCommandOpcode.STATUS)
+    if status is None:
+        return None
+    record: dict[str, int | None] = {"address": short_address, "status": status}
+    for name, opcode in FIELDS[1:]:
+        record[name] = query_gear_value(dali, adr, opcode)
+    record["random_address"] = read_random_address(dali, short_address)
+    groups = (GearQueryCommandOpcode.GROUPS_8_15, GearQueryCommandOpcode.GROUPS_0_7)
+    record["groups"] = query_combined(dali, adr, groups)
+    return record
+
+
+def write_records(output, output_format: str, records: list[dict[str, int | None]]) -> None:
+    if output_format == "json":
+        json.dump(records, output, indent=2)
+        output.write("\n")
+    elif output_format == "jsonl":
+        for record in records:
+            output.write(json.dumps(record) + "\n")
+    else:
+        writer = csv.DictWriter(output, fieldnames=COLUMNS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(records)
+
+
+@click.command(name="inventory", help="Read the settings of all present control gears.")
+@click.pass_obj
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["json", "jsonl", "csv"]),
+    default="json",
+    show_default=True,
+    help="Output format, one record per gear.",
+)
+@click.option("--output", "-o", type=click.File("w"), default="-", help="File to write the inventory to.")
+def inventory(dali: DaliInterface, output_format: str, output) -> None:
+    records = []
+    for short_address in sorted(used_short_addresses(dali)):
+        record = read_record(dali, short_address)
+        if record is not None:
+            records.append(record)
+    write_records(output, output_format, records)
@@ -0,0 +1,128 @@
+"""Control gear energy and diagnostics poller, IEC 62386-252 and 62386-253."""
+
+import csv
+import json
+import time
+from datetime import datetime, timezone
+
+import click
+from dali_interface import DaliInterface
+
+from ..system.address_list import parse_short_addresses
+from ..system.constants import DaliMax
+from ..system.membank_schema import decode_bank, field_span
+from .gear_dump import bank_access
+from .gear_enumerate import used_short_addresses
+
+METER_FIELDS = {
+    202: ("active_energy_wh", "active_power_w"),
+    203: ("apparent_energy_vah", "apparent_power_va"),
+    204: ("loadside_energy_wh", "loadside_power_w"),
+    205: (
+        "operating_time_s",
+        "start_counter",
+        "supply_voltage_v",
+        "supply_frequency_hz",
+        "power_factor",
+        "failure_counter",
+        "temperature_c",
+        "output_current_percent",
+    ),
+    206: ("light_source_start_counter", "light_source_on_time_s"),
+}
+COLUMNS = ["time", "address"] + [name for names in METER_FIELDS.values() for name in names]
+
+
+def decode(banks: dict[int, list[int | None]]) -> dict[str, float | int | None]:
+    """Values of the meter fields, None if not read or not known by the gear."""
+    values: dict[str, float | int | None] = {}
+    for bank, names in METER_FIELDS.items():
+        fields = decode_bank(bank, banks[bank]) if bank in banks else {}
+        values.update((name, fields.get(name)) for name in names)
+    return values
+
+
+def read_meter(dali: DaliInterface, short_address: int, skip: set[int]) -> dict[int, list[int | None]]:
+    """Read the spans of the meter banks, banks an answering gear does not implement are added to skip."""
+    select, read_location = bank_access(dali, str(short_address))
+    banks = {}
+    missing = set()
+    for bank, names in METER_FIELDS.items():
+        if bank in skip:
+            continue
+        first, last = field_span(bank, names)
+        select(bank, first)
+        value = read_location()
+        if value is None:
+            missing.add(bank)
+            continue
+        content: list[int | None] = [None] * first + [value]
+        content.extend(read_location() for _ in range(first + 1, last + 1))
+        banks[bank] = content
+    if banks:
+        skip.update(missing)
+    return banks
+
+
+def write_row(output, output_format: str, record: dict) -> None:
+    if output_format == "jsonl":
+        output.write(json.dumps(record) + "\n")
+    else:
+        csv.DictWriter(output, fieldnames=COLUMNS, lineterminator="\n").writerow(record)
+    output.flush()
+
+
+@click.command(name="meter", help="Poll energy and diagnostics memory banks and stream the values.")
+@click.pass_obj
+@click.option(
+    "--adr",
+    default="ALL",
+    show_default=True,
+    help="Short address, list or range of short addresses (3,7,9 or 0-15) or ALL for every present gear.",
+)
+@click.option("--interval", type=click.FLOAT, default=60.0, show_default=True, help="Seconds between two samples.")
+@click.option("--count", type=click.INT, default=0, help="Number of samples, 0 polls until interrupted.")
+@click.option(
+    "--bus-load",
+    type=click.FloatRange(1, 100),
+    default=20.0,
+    show_default=True,
+    help="Share of bus time in percent the poller may use, it pauses between gears to stay below.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["jsonl", "csv"]),
+    default="jsonl",
+    show_default=True,
+    help="Output format, one row per gear and sample.",
+)
+@click.option("--output", "-o", type=click.File("w"), default="-", help="File to stream the rows to.")
+def meter(
+    dali: DaliInterface, adr: str, interval: float, count: int, bus_load: float, output_format: str, output
+) -> None:
+    if adr.upper() == "ALL":
+        short_addresses = sorted(used_short_addresses(dali))
+    else:
+        short_addresses = parse_short_addresses(adr)
+        if short_addresses is None:
+            if not adr.isdigit() or int(adr) >= DaliMax.ADR:
+                raise click.BadOptionUsage("adr", "meter needs short addresses.")
+            short_addresses = [int(adr)]
+    if output_format == "csv":
+        csv.DictWriter(output, fieldnames=COLUMNS, lineterminator="\n").writeheader()
+    skip: dict[int, set[int]] = {short_address: set() for short_address in short_addresses}
+    sample = 0
+    while count == 0 or sample < count:
+        started = time.monotonic()
+        for short_address in short_addresses:
+            busy = time.monotonic()
+            banks = read_meter(dali, short_address, skip[short_address])
+            busy = time.monotonic() - busy
+            if banks:
+                timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+                write_row(output, output_format, {"time": timestamp, "address": short_address} | decode(banks))
+            time.sleep(busy * (100 - bus_load) / bus_load)
+        sample = sample + 1
+        if count == 0 or sample < count:
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
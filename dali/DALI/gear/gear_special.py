@@ -4,6 +4,7 @@ import click
 from dali_interface import DaliInterface
 
 from ..system.constants import DaliMax
+from ..system.presence import forget_presence
 from .gear_action import (
     write_frame_and_show_answer,
     write_gear_frame,
@@ -93,6 +94,7 @@ def program(ctx: DaliInterface, address):
         write_gear_frame(ctx, GearSpecialCommandOpcode.PROGRAM_SHORT_ADDRESS, 0xFF)
     else:
         raise click.BadParameter(f"needs to be between 0 and {DaliMax.ADR - 1}.", param_hint="ADDRESS")
+    forget_presence("gear")
 
 
 @click.command(name="verify", help="Verify shortAddress.")
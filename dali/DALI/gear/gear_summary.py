@@ -2,12 +2,29 @@
 
 import click
 from dali_interface import DaliInterface
-from typeguard import typechecked
 
+from ..system.address_list import parse_short_addresses
 from ..system.constants import DaliMax
+from ..system.typecheck import typechecked
 from .gear_action import query_gear_value
+from .gear_inventory import read_record
 from .gear_opcode import GearQueryCommandOpcode
 
+TABLE_COLUMNS = [
+    ("status", "status"),
+    ("mode", "operating_mode"),
+    ("ver", "version"),
+    ("actual", "actual_level"),
+    ("on", "power_on_level"),
+    ("fail", "system_failure_level"),
+    ("phm", "physical_minimum"),
+    ("min", "min_level"),
+    ("max", "max_level"),
+    ("dt", "device_type"),
+    ("fade", "fade_time_rate"),
+    ("ext", "extended_fade_time"),
+]
+
 
 @typechecked
 def gear_summary_item(dali: DaliInterface, adr: str, caption: str, opcode: int) -> None:
@@ -18,15 +35,38 @@ def gear_summary_item(dali: DaliInterface, adr: str, caption: str, opcode: int)
         click.echo(f"{caption:.<20}: NO - timeout")
 
 
+def summary_table(dali: DaliInterface, short_addresses: list[int]) -> None:
+    """One row per short address, replies in hex and -- for a timeout, absent gears are skipped."""
+    click.echo(" ".join(["adr"] + [f"{caption:>6}" for caption, _ in TABLE_COLUMNS] + ["random  ", "groups", "scenes"]))
+    for short_address in short_addresses:
+        record = read_record(dali, short_address)
+        if record is None:
+            click.echo(f"G{short_address:02}  absent")
+            continue
+        cells = [f"G{short_address:02}"] + [
+            f"{'--' if record[name] is None else format(record[name], '02X'):>6}" for _, name in TABLE_COLUMNS
+        ]
+        cells.append("--      " if record["random_address"] is None else f"{record['random_address']:06X}  ")
+        cells.append("--    " if record["groups"] is None else f"{record['groups']:04X}  ")
+        scenes = [record[f"scene_{scene}"] for scene in range(DaliMax.SCENE)]
+        cells.append("".join("--" if level is None else f"{level:02X}" for level in scenes))
+        click.echo(" ".join(cells))
+
+
 @click.command(name="summary", help="Show status summary.")
 @click.pass_obj
 @click.option(
     "--adr",
     default="BC",
-    help="Address, can be a short address (A0..A63) or group address (G0..G15).",
+    help="Address, can be a short address (A0..A63), group address (G0..G15), "
+    "a list or range of short addresses (3,7,9 or 0-15) or ALL.",
 )
 @typechecked
 def summary(dali: DaliInterface, adr: str) -> None:
+    short_addresses = parse_short_addresses(adr)
+    if short_addresses is not None:
+        summary_table(dali, short_addresses)
+        return
     gear_summary_item(dali, adr, "Status", GearQueryCommandOpcode.STATUS)
     gear_summary_item(dali, adr, "Operation mode", GearQueryCommandOpcode.OPERATING_MODE)
     gear_summary_item(dali, adr, "Version", GearQueryCommandOpcode.VERSION_NUMBER)
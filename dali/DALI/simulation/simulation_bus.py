@@ -0,0 +1,107 @@
+"""Simulated DALI bus with virtual control gears and control devices."""
+
+import logging
+import random
+
+from dali_interface import DaliFrame, DaliStatus
+
+from ..system.constants import DaliBusTiming, DaliFrameLength, DaliMax, DaliTimeout
+from ..system.wrapper import DaliLocalInterface
+from .simulation_device import VirtualDevice
+from .simulation_gear import VirtualGear
+from .simulation_unit import VirtualUnit
+
+logger = logging.getLogger(__name__)
+
+
+def frame_duration(length: int) -> float:
+    """Start bit, data bits and stop condition, each bit taking two half bits."""
+    return (2 + 2 * length + 4) * DaliBusTiming.HALF_BIT.value
+
+
+class DaliSimulation(DaliLocalInterface):
+    """Answer frames from virtual units and account bus time on a virtual clock."""
+
+    def __init__(
+        self,
+        gears: int = 0,
+        devices: int = 0,
+        seed: int = 0,
+        reply_timeout: float = DaliTimeout.DEFAULT.value,
+    ) -> None:
+        super().__init__()
+        self.rng = random.Random(seed)
+        self.gears = [
+            VirtualGear(
+                short_address=short_address,
+                random_address=self.rng.randrange(DaliMax.RANDOM_ADR),
+                rng=self.rng,
+                identification=0x1000 + short_address,
+                groups=1 << (short_address % DaliMax.GEAR_GROUP),
+            )
+            for short_address in range(gears)
+        ]
+        self.devices = [
+            VirtualDevice(
+                short_address=short_address,
+                random_address=self.rng.randrange(DaliMax.RANDOM_ADR),
+                rng=self.rng,
+                identification=0x2000 + short_address,
+            )
+            for short_address in range(devices)
+        ]
+        self.reply_timeout = reply_timeout
+        self.clock = 0.0
+        self.frames = 0
+        self.last_frame: DaliFrame | None = None
+        self.last_frame_end = 0.0
+
+    def units(self, frame: DaliFrame) -> list[VirtualUnit]:
+        if frame.length == DaliFrameLength.GEAR:
+            return list(self.gears)
+        if frame.length == DaliFrameLength.DEVICE:
+            return list(self.devices)
+        return []
+
+    def forward(self, frame: DaliFrame) -> list[int]:
+        """Put a forward frame on the bus and collect the replies."""
+        repeated = frame.send_twice or (
+            self.last_frame is not None
+            and self.last_frame.length == frame.length
+            and self.last_frame.data == frame.data
+            and self.clock - self.last_frame_end < DaliBusTiming.SEND_TWICE.value
+        )
+        self.clock += DaliBusTiming.FORWARD_SETTLING.value + frame_duration(frame.length)
+        if frame.send_twice:
+            self.clock += DaliBusTiming.FORWARD_SETTLING.value + frame_duration(frame.length)
+        self.frames += 2 if frame.send_twice else 1
+        self.last_frame = None if repeated else frame
+        self.last_frame_end = self.clock
+        replies = []
+        for unit in self.units(frame):
+            unit.time = self.clock
+            reply = unit.process(frame.data, repeated)
+            if reply is not None:
+                replies.append(reply)
+        return replies
+
+    def transmit(self, frame: DaliFrame, block: bool = False, is_query: bool = False) -> None:
+        self.forward(frame)
+
+    def query_reply(self, request: DaliFrame) -> DaliFrame:
+        replies = self.forward(request)
+        if not replies:
+            self.clock += self.reply_timeout
+            return DaliFrame(timestamp=self.clock, status=DaliStatus.TIMEOUT)
+        self.clock += DaliBusTiming.BACKWARD_DELAY.value + frame_duration(DaliFrameLength.BACKWARD)
+        self.clock += DaliBusTiming.BACKWARD_SETTLING.value
+        if len(replies) > 1:
+            # backward frames of several units are not bit synchronous
+            return DaliFrame(timestamp=self.clock, status=DaliStatus.FRAME)
+        return DaliFrame(timestamp=self.clock, length=DaliFrameLength.BACKWARD, data=replies[0])
+
+    def power(self, power: bool = False) -> None:
+        pass
+
+    def close(self) -> None:
+        logger.info(f"simulated {self.frames} frames in {self.clock:.3f} s bus time")
@@ -0,0 +1,232 @@
+"""Virtual IEC 62386-103 control device."""
+
+import random
+
+from ..device.device_opcode import (
+    DeviceConfigureCommandOpcode,
+    DeviceInstanceQueryOpcode,
+    DeviceQueryCommandOpcode,
+    DeviceSpecialCommandOpcode,
+)
+from ..system.constants import DaliMax
+from .simulation_gear import YES, to_bytes
+from .simulation_unit import InitialisationState, VirtualUnit
+
+DIRECT_WRITE_MEMORY = 0xC5
+DTR1_DTR0 = 0xC7
+DTR2_DTR1 = 0xC9
+
+
+class VirtualDevice(VirtualUnit):  # pylint: disable=too-many-instance-attributes
+    """Control device with a single input instance and memory bank 0."""
+
+    GTIN = 0x0123456789AC
+
+    def __init__(
+        self,
+        short_address: int = DaliMax.MASK,
+        random_address: int = DaliMax.RANDOM_ADR - 1,
+        rng: random.Random | None = None,
+        identification: int = 0,
+        groups: int = 0,
+        instance_type: int = 1,
+    ) -> None:
+        super().__init__(short_address, random_address, rng or random.Random())
+        self.groups = groups
+        self.instance_type = instance_type
+        self.instance_enabled = True
+        self.primary_group = DaliMax.MASK
+        self.event_scheme = 0
+        self.input_value = 0
+        self.quiescent = False
+        self.application_enabled = False
+        self.power_cycle_notification = False
+        self.operating_mode = 0
+        self.version = 0x08
+        self.banks = {
+            0: [0x1B, DaliMax.MASK, 0]
+            + to_bytes(self.GTIN, 6)
+            + [1, 0]
+            + to_bytes(identification, 8)
+            + [1, 0, 0x08, DaliMax.MASK, 0x08, 1, 0, 0, 0],
+        }
+
+    def addressed(self, address_byte: int) -> bool:
+        if address_byte == 0xFF:
+            return True
+        if address_byte == 0xFD:
+            return self.short_address == DaliMax.MASK
+        if address_byte & 0x80:
+            return bool(self.groups & (1 << ((address_byte >> 1) & 0x1F)))
+        return (address_byte >> 1) == self.short_address
+
+    def instance_addressed(self, instance_byte: int) -> bool:
+        if instance_byte == 0xFF:
+            return True
+        if instance_byte < DaliMax.INSTANCE_NUMBER:
+            return instance_byte == 0
+        if instance_byte & 0xE0 == 0x80:
+            return (instance_byte & 0x1F) == self.primary_group
+        if instance_byte & 0xE0 == 0xC0:
+            return (instance_byte & 0x1F) == self.instance_type
+        return False
+
+    def process(self, data: int, repeated: bool) -> int | None:
+        address_byte = data >> 16
+        instance_byte = (data >> 8) & 0xFF
+        opcode = data & 0xFF
+        if 0xC1 <= address_byte < 0xFD:
+            return self.special(address_byte, instance_byte, opcode, repeated)
+        if not address_byte & 0x01 or not self.addressed(address_byte):
+            return None
+        if instance_byte == 0xFE:
+            if opcode < DeviceQueryCommandOpcode.QUERY_STATUS:
+                if repeated:
+                    self.configure(opcode)
+                return None
+            return self.query(opcode)
+        if self.instance_addressed(instance_byte):
+            return self.instance_query(opcode)
+        return None
+
+    def configure(self, opcode: int) -> None:  # pylint: disable=too-many-branches
+        self.reset_state = False
+        if opcode == DeviceConfigureCommandOpcode.RESET:
+            self.groups = 0
+            self.random_address = DaliMax.RANDOM_ADR - 1
+            self.quiescent = False
+            self.reset_state = True
+        elif opcode == DeviceConfigureCommandOpcode.SET_SHORT_ADDRESS:
+            if self.dtr0 == DaliMax.MASK or self.dtr0 < DaliMax.ADR:
+                self.short_address = self.dtr0
+        elif opcode == DeviceConfigureCommandOpcode.ENABLE_WRITE_MEMORY:
+            self.write_enabled = True
+        elif opcode == DeviceConfigureCommandOpcode.ENABLE_APPLICATION_CONTROLLER:
+            self.application_enabled = True
+        elif opcode == DeviceConfigureCommandOpcode.DISABLE_APPLICATION_CONTROLLER:
+            self.application_enabled = False
+        elif opcode == DeviceConfigureCommandOpcode.ADD_TO_DEVICE_GROUPS_0_15:
+            self.groups |= self.dtr2 << 8 | self.dtr1
+        elif opcode == DeviceConfigureCommandOpcode.ADD_TO_DEVICE_GROUPS_16_31:
+            self.groups |= (self.dtr2 << 8 | self.dtr1) << 16
+        elif opcode == DeviceConfigureCommandOpcode.REMOVE_FROM_DEVICE_GROUPS_0_15:
+            self.groups &= ~(self.dtr2 << 8 | self.dtr1)
+        elif opcode == DeviceConfigureCommandOpcode.REMOVE_FROM_DEVICE_GROUPS_16_31:
+            self.groups &= ~((self.dtr2 << 8 | self.dtr1) << 16)
+        elif opcode == DeviceConfigureCommandOpcode.START_QUIESCENT_MODE:
+            self.quiescent = True
+        elif opcode == DeviceConfigureCommandOpcode.STOP_QUIESCENT_MODE:
+            self.quiescent = False
+        elif opcode == DeviceConfigureCommandOpcode.ENABLE_POWER_CYCLE_NOTIFICATION:
+            self.power_cycle_notification = True
+        elif opcode == DeviceConfigureCommandOpcode.DISABLE_POWER_CYCLE_NOTIFICATION:
+            self.power_cycle_notification = False
+
+    def query(self, opcode: int) -> int | None:
+        values = {
+            DeviceQueryCommandOpcode.QUERY_STATUS: (
+                self.quiescent << 1
+                | (self.short_address == DaliMax.MASK) << 2
+                | self.application_enabled << 3
+                | self.reset_state << 6
+            ),
+            DeviceQueryCommandOpcode.QUERY_MISSING_SHORT_ADDRESS: YES if self.short_address == DaliMax.MASK else None,
+            DeviceQueryCommandOpcode.QUERY_VERSION_NUMBER: self.version,
+            DeviceQueryCommandOpcode.QUERY_NUMBER_OF_INSTANCES: 1,
+            DeviceQueryCommandOpcode.QUERY_CONTENT_DTR0: self.dtr0,
+            DeviceQueryCommandOpcode.QUERY_CONTENT_DTR1: self.dtr1,
+            DeviceQueryCommandOpcode.QUERY_CONTENT_DTR2: self.dtr2,
+            DeviceQueryCommandOpcode.QUERY_RANDOM_ADDRESS_H: self.random_address >> 16,
+            DeviceQueryCommandOpcode.QUERY_RANDOM_ADDRESS_M: (self.random_address >> 8) & 0xFF,
+            DeviceQueryCommandOpcode.QUERY_RANDOM_ADDRESS_L: self.random_address & 0xFF,
+            DeviceQueryCommandOpcode.QUERY_APPLICATION_CONTROLLER_ENABLED: YES if self.application_enabled else None,
+            DeviceQueryCommandOpcode.QUERY_OPERATING_MODE: self.operating_mode,
+            DeviceQueryCommandOpcode.QUERY_QUIESCENT_MODE: YES if self.quiescent else None,
+            DeviceQueryCommandOpcode.QUERY_DEVICE_GROUPS_0_7: self.groups & 0xFF,
+            DeviceQueryCommandOpcode.QUERY_DEVICE_GROUPS_8_15: (self.groups >> 8) & 0xFF,
+            DeviceQueryCommandOpcode.QUERY_DEVICE_GROUPS_16_23: (self.groups >> 16) & 0xFF,
+            DeviceQueryCommandOpcode.QUERY_DEVICE_GROUPS_24_31: (self.groups >> 24) & 0xFF,
+            DeviceQueryCommandOpcode.QUERY_POWER_CYCLE_NOTIFICATION: YES if self.power_cycle_notification else None,
+            DeviceQueryCommandOpcode.QUERY_DEVICE_CAPABILITIES: 0x02,
+            DeviceQueryCommandOpcode.QUERY_RESET_STATE: YES if self.reset_state else None,
+        }
+        if opcode in values:
+            return values[opcode]
+        if opcode == DeviceQueryCommandOpcode.READ_MEMORY:
+            return self.read_memory()
+        return None
+
+    def instance_query(self, opcode: int) -> int | None:
+        values = {
+            DeviceInstanceQueryOpcode.QUERY_INSTANCE_TYPE: self.instance_type,
+            DeviceInstanceQueryOpcode.QUERY_RESOLUTION: 1,
+            DeviceInstanceQueryOpcode.QUERY_INSTANCE_ERROR: 0,
+            DeviceInstanceQueryOpcode.QUERY_INSTANCE_STATUS: self.instance_enabled << 1,
+            DeviceInstanceQueryOpcode.QUERY_INSTANCE_ENABLED: YES if self.instance_enabled else None,
+            DeviceInstanceQueryOpcode.QUERY_PRIMARY_INSTANCE_GROUP: self.primary_group,
+            DeviceInstanceQueryOpcode.QUERY_EVENT_SCHEME: self.event_scheme,
+            DeviceInstanceQueryOpcode.QUERY_INPUT_VALUE: self.input_value,
+        }
+        return values.get(opcode)
+
+    def special(
+        self, address_byte: int, instance_byte: int, data: int, repeated: bool
+    ) -> int | None:  # pylint: disable=too-many-return-statements, too-many-branches
+        if address_byte == DTR1_DTR0:
+            self.dtr1, self.dtr0 = instance_byte, data
+            return None
+        if address_byte == DTR2_DTR1:
+            self.dtr2, self.dtr1 = instance_byte, data
+            return None
+        if address_byte == DIRECT_WRITE_MEMORY:
+            self.dtr0 = instance_byte
+            return self.write_memory(data)
+        if address_byte != 0xC1:
+            return None
+        opcode = instance_byte
+        if opcode == DeviceSpecialCommandOpcode.TERMINATE:
+            self.terminate()
+        elif opcode == DeviceSpecialCommandOpcode.INITIALISE:
+            if repeated and (
+                data == DaliMax.MASK
+                or (data == 0x7F and self.short_address == DaliMax.MASK)
+                or data == self.short_address
+            ):
+                self.initialise()
+        elif opcode == DeviceSpecialCommandOpcode.RANDOMISE:
+            if repeated:
+                self.randomise()
+        elif opcode == DeviceSpecialCommandOpcode.COMPARE:
+            return YES if self.compare() else None
+        elif opcode == DeviceSpecialCommandOpcode.WITHDRAW:
+            self.withdraw()
+        elif opcode == DeviceSpecialCommandOpcode.SEARCHADDRH:
+            self.set_search_byte(16, data)
+        elif opcode == DeviceSpecialCommandOpcode.SEARCHADDRM:
+            self.set_search_byte(8, data)
+        elif opcode == DeviceSpecialCommandOpcode.SEARCHADDRL:
+            self.set_search_byte(0, data)
+        elif opcode == DeviceSpecialCommandOpcode.PROGRAM_SHORT_ADDRESS:
+            if self.selected() and (data == DaliMax.MASK or data < DaliMax.ADR):
+                self.short_address = data
+        elif opcode == DeviceSpecialCommandOpcode.VERIFY_SHORT_ADDRESS:
+            if self.in_initialisation() and data == self.short_address:
+                return YES
+        elif opcode == DeviceSpecialCommandOpcode.QUERY_SHORT_ADDRESS:
+            if self.selected():
+                return self.short_address
+        elif opcode == DeviceSpecialCommandOpcode.DTR0:
+            self.dtr0 = data
+        elif opcode == DeviceSpecialCommandOpcode.DTR1:
+            self.dtr1 = data
+        elif opcode == DeviceSpecialCommandOpcode.DTR2:
+            self.dtr2 = data
+        elif opcode == DeviceSpecialCommandOpcode.WRITE_MEMORY:
+            return self.write_memory(data)
+        elif opcode == DeviceSpecialCommandOpcode.WRITE_MEMORY_NO_REPLY:
+            self.write_memory(data)
+        return None
+
+    def __repr__(self) -> str:
+        state = "" if self.initialisation == InitialisationState.DISABLED else f" {self.initialisation.name}"
+        return f"VirtualDevice(short={self.short_address}, random=0x{self.random_address:06X}{state})"
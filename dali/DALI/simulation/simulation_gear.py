@@ -0,0 +1,280 @@
+"""Virtual IEC 62386-102 control gear."""
+
+import random
+
+from ..gear.gear_opcode import (
+    GearConfigureCommandOpcode,
+    GearLevelCommandOpcode,
+    GearQueryCommandOpcode,
+    GearSpecialCommandOpcode,
+)
+from ..system.constants import DaliMax
+from .simulation_unit import InitialisationState, VirtualUnit
+
+YES = DaliMax.MASK
+
+
+def to_bytes(value: int, length: int) -> list[int]:
+    return list(value.to_bytes(length, "big"))
+
+
+class VirtualGear(VirtualUnit):  # pylint: disable=too-many-instance-attributes
+    """Control gear with levels, scenes, groups and memory banks 0, 1, 202 and 205."""
+
+    GTIN = 0x0123456789AB
+    PHYSICAL_MINIMUM = 1
+
+    def __init__(
+        self,
+        short_address: int = DaliMax.MASK,
+        random_address: int = DaliMax.RANDOM_ADR - 1,
+        rng: random.Random | None = None,
+        identification: int = 0,
+        groups: int = 0,
+        power: float = 20.0,
+    ) -> None:
+        super().__init__(short_address, random_address, rng or random.Random())
+        self.identification = identification
+        self.power = power
+        self.device_type = 6
+        self.light_source_type = 6
+        self.version = 0x08
+        self.enabled_device_type = None
+        self.power_cycle_seen = True
+        self.reset_variables()
+        self.random_address = random_address
+        self.groups = groups
+        self.reset_state = False
+        self.banks = {
+            0: [0x1B, DaliMax.MASK, 205]
+            + to_bytes(self.GTIN, 6)
+            + [1, 0]
+            + to_bytes(identification, 8)
+            + [1, 0, 0x08, 0x08, DaliMax.MASK, 0, 1, 0, 0],
+            1: [0x10, 0, 0] + [DaliMax.MASK] * 14,
+            202: [0x0F, 0, 0, 1] + [0] * 12,
+            205: [0x1C, 0, 0, 1] + [0] * 25,
+        }
+
+    def reset_variables(self) -> None:
+        """Reset values, IEC 62386-102:2022 Table 22"""
+        self.actual_level = 254
+        self.last_active_level = 254
+        self.power_on_level = 254
+        self.system_failure_level = 254
+        self.min_level = self.PHYSICAL_MINIMUM
+        self.max_level = 254
+        self.fade_rate = 7
+        self.fade_time = 0
+        self.extended_fade_time = 0
+        self.scenes = [DaliMax.MASK] * DaliMax.SCENE
+        self.groups = 0
+        self.random_address = DaliMax.RANDOM_ADR - 1
+        self.operating_mode = 0
+        self.reset_state = True
+
+    def memory_bank(self, bank: int) -> list[int] | None:
+        content = self.banks.get(bank)
+        if bank == 202 and content is not None:
+            energy = int(self.power * self.time / 3600)
+            content[4:16] = [0] + to_bytes(energy, 6) + [DaliMax.MASK] + to_bytes(int(self.power * 10), 4)
+        if bank == 205 and content is not None:
+            content[4:15] = to_bytes(int(self.time), 4) + to_bytes(1, 3) + to_bytes(2300, 2) + [50, 95]
+            content[27:29] = [60 + 35, 100]
+        return content
+
+    def addressed(self, address_byte: int) -> bool:
+        if address_byte >= 0xFE:
+            return True
+        if address_byte >= 0xFC:
+            return self.short_address == DaliMax.MASK
+        if address_byte & 0x80:
+            return bool(self.groups & (1 << ((address_byte >> 1) & 0x0F)))
+        return (address_byte >> 1) == self.short_address
+
+    def set_level(self, level: int) -> None:
+        self.power_cycle_seen = False
+        if level == DaliMax.MASK:
+            return
+        if level == 0:
+            self.actual_level = 0
+            return
+        self.actual_level = min(max(level, self.min_level), self.max_level)
+        self.last_active_level = self.actual_level
+
+    def process(self, data: int, repeated: bool) -> int | None:
+        address_byte = data >> 8
+        opcode = data & 0xFF
+        if 0xA0 <= address_byte < 0xFC:
+            return self.special(address_byte, opcode, repeated)
+        if not self.addressed(address_byte):
+            return None
+        if not address_byte & 0x01:
+            self.set_level(opcode)
+            return None
+        if opcode < GearConfigureCommandOpcode.RESET:
+            self.level_command(opcode)
+            return None
+        if opcode < GearQueryCommandOpcode.STATUS:
+            if repeated:
+                self.configure(opcode)
+            return None
+        return self.query(opcode)
+
+    def level_command(self, opcode: int) -> None:
+        level = self.actual_level
+        if opcode == GearLevelCommandOpcode.OFF:
+            self.set_level(0)
+        elif opcode in (GearLevelCommandOpcode.UP, 0x03):
+            if 0 < level < self.max_level:
+                self.set_level(level + 1)
+        elif opcode in (GearLevelCommandOpcode.DOWN, 0x04):
+            if level > self.min_level:
+                self.set_level(level - 1)
+        elif opcode == GearLevelCommandOpcode.RECALL_MAX:
+            self.set_level(self.max_level)
+        elif opcode == GearLevelCommandOpcode.RECALL_MIN:
+            self.set_level(self.min_level)
+        elif opcode == 0x07:
+            self.set_level(0 if level <= self.min_level else level - 1)
+        elif opcode == 0x08:
+            self.set_level(self.min_level if level == 0 else level + 1)
+        elif opcode == 0x0A:
+            self.set_level(self.last_active_level)
+        elif opcode >= GearLevelCommandOpcode.GOTO_SCENE:
+            self.set_level(self.scenes[opcode - GearLevelCommandOpcode.GOTO_SCENE])
+
+    def configure(self, opcode: int) -> None:  # pylint: disable=too-many-branches
+        self.reset_state = False
+        if opcode == GearConfigureCommandOpcode.RESET:
+            self.reset_variables()
+        elif opcode == GearConfigureCommandOpcode.STORE_ACTUAL_LEVEL:
+            self.dtr0 = self.actual_level
+        elif opcode == GearConfigureCommandOpcode.SET_OPERATION_MODE:
+            self.operating_mode = self.dtr0
+        elif opcode == GearConfigureCommandOpcode.SET_MAX_LEVEL:
+            self.max_level = min(max(self.dtr0, self.min_level), 254)
+        elif opcode == GearConfigureCommandOpcode.SET_MIN_LEVEL:
+            self.min_level = min(max(self.dtr0, self.PHYSICAL_MINIMUM), self.max_level)
+        elif opcode == GearConfigureCommandOpcode.SET_FAIL_LEVEL:
+            self.system_failure_level = self.dtr0
+        elif opcode == GearConfigureCommandOpcode.SET_POWER_ON_LEVEL:
+            self.power_on_level = self.dtr0
+        elif opcode == GearConfigureCommandOpcode.SET_FADE_TIME:
+            self.fade_time = min(self.dtr0, 15)
+        elif opcode == GearConfigureCommandOpcode.SET_FADE_RATE:
+            self.fade_rate = min(max(self.dtr0, 1), 15)
+        elif opcode == GearConfigureCommandOpcode.SET_EXT_FADE:
+            self.extended_fade_time = self.dtr0 if self.dtr0 < 0x50 else 0
+        elif GearConfigureCommandOpcode.SET_SCENE <= opcode < GearConfigureCommandOpcode.REMOVE_SCENE:
+            self.scenes[opcode - GearConfigureCommandOpcode.SET_SCENE] = self.dtr0
+        elif GearConfigureCommandOpcode.REMOVE_SCENE <= opcode < GearConfigureCommandOpcode.ADD_GROUP:
+            self.scenes[opcode - GearConfigureCommandOpcode.REMOVE_SCENE] = DaliMax.MASK
+        elif GearConfigureCommandOpcode.ADD_GROUP <= opcode < GearConfigureCommandOpcode.REMOVE_GROUP:
+            self.groups |= 1 << (opcode - GearConfigureCommandOpcode.ADD_GROUP)
+        elif GearConfigureCommandOpcode.REMOVE_GROUP <= opcode < GearConfigureCommandOpcode.SET_SHORT_ADDRESS:
+            self.groups &= ~(1 << (opcode - GearConfigureCommandOpcode.REMOVE_GROUP))
+        elif opcode == GearConfigureCommandOpcode.SET_SHORT_ADDRESS:
+            if self.dtr0 == DaliMax.MASK:
+                self.short_address = DaliMax.MASK
+            elif (self.dtr0 & 0x81) == 0x01:
+                self.short_address = self.dtr0 >> 1
+        elif opcode == GearConfigureCommandOpcode.ENABLE_WRITE:
+            self.write_enabled = True
+
+    def status(self) -> int:
+        return (
+            (self.actual_level > 0) << 2
+            | self.reset_state << 5
+            | (self.short_address == DaliMax.MASK) << 6
+            | self.power_cycle_seen << 7
+        )
+
+    def query(self, opcode: int) -> int | None:  # pylint: disable=too-many-return-statements
+        values = {
+            GearQueryCommandOpcode.STATUS: self.status(),
+            GearQueryCommandOpcode.GEAR_PRESENT: YES,
+            GearQueryCommandOpcode.LAMP_POWER_ON: YES if self.actual_level > 0 else None,
+            GearQueryCommandOpcode.RESET_STATE: YES if self.reset_state else None,
+            GearQueryCommandOpcode.MISSING_SHORT_ADDRESS: YES if self.short_address == DaliMax.MASK else None,
+            GearQueryCommandOpcode.VERSION_NUMBER: self.version,
+            GearQueryCommandOpcode.CONTENT_DTR0: self.dtr0,
+            GearQueryCommandOpcode.DEVICE_TYPE: self.device_type,
+            GearQueryCommandOpcode.PHYSICAL_MINIMUM: self.PHYSICAL_MINIMUM,
+            GearQueryCommandOpcode.POWER_FAILURE: YES if self.power_cycle_seen else None,
+            GearQueryCommandOpcode.CONTENT_DTR1: self.dtr1,
+            GearQueryCommandOpcode.CONTENT_DTR2: self.dtr2,
+            GearQueryCommandOpcode.OPERATING_MODE: self.operating_mode,
+            GearQueryCommandOpcode.LIGHT_SOURCE_TYPE: self.light_source_type,
+            GearQueryCommandOpcode.ACTUAL_LEVEL: self.actual_level,
+            GearQueryCommandOpcode.MAX_LEVEL: self.max_level,
+            GearQueryCommandOpcode.MIN_LEVEL: self.min_level,
+            GearQueryCommandOpcode.POWER_ON_LEVEL: self.power_on_level,
+            GearQueryCommandOpcode.SYSTEM_FAILURE_LEVEL: self.system_failure_level,
+            GearQueryCommandOpcode.FADE_TIME_RATE: self.fade_time << 4 | self.fade_rate,
+            GearQueryCommandOpcode.EXTENDED_FADE_TIME: self.extended_fade_time,
+            GearQueryCommandOpcode.GROUPS_0_7: self.groups & 0xFF,
+            GearQueryCommandOpcode.GROUPS_8_15: self.groups >> 8,
+            GearQueryCommandOpcode.RANDOM_ADDRESS_H: self.random_address >> 16,
+            GearQueryCommandOpcode.RANDOM_ADDRESS_M: (self.random_address >> 8) & 0xFF,
+            GearQueryCommandOpcode.RANDOM_ADDRESS_L: self.random_address & 0xFF,
+        }
+        if opcode in values:
+            return values[opcode]
+        if GearQueryCommandOpcode.SCENE_LEVEL <= opcode < GearQueryCommandOpcode.GROUPS_0_7:
+            return self.scenes[opcode - GearQueryCommandOpcode.SCENE_LEVEL]
+        if opcode == GearQueryCommandOpcode.READ_MEMORY:
+            return self.read_memory()
+        return None
+
+    def special(
+        self, address_byte: int, data: int, repeated: bool
+    ) -> int | None:  # pylint: disable=too-many-return-statements, too-many-branches
+        if address_byte == GearSpecialCommandOpcode.TERMINATE:
+            self.terminate()
+        elif address_byte == GearSpecialCommandOpcode.DTR0:
+            self.dtr0 = data
+        elif address_byte == GearSpecialCommandOpcode.INITIALISE:
+            if repeated and (
+                data == 0x00
+                or (data == DaliMax.MASK and self.short_address == DaliMax.MASK)
+                or ((data & 0x81) == 0x01 and (data >> 1) == self.short_address)
+            ):
+                self.initialise()
+        elif address_byte == GearSpecialCommandOpcode.RANDOMISE:
+            if repeated:
+                self.randomise()
+        elif address_byte == GearSpecialCommandOpcode.COMPARE:
+            return YES if self.compare() else None
+        elif address_byte == GearSpecialCommandOpcode.WITHDRAW:
+            self.withdraw()
+        elif address_byte == GearSpecialCommandOpcode.SEARCHADDRH:
+            self.set_search_byte(16, data)
+        elif address_byte == GearSpecialCommandOpcode.SEARCHADDRM:
+            self.set_search_byte(8, data)
+        elif address_byte == GearSpecialCommandOpcode.SEARCHADDRL:
+            self.set_search_byte(0, data)
+        elif address_byte == GearSpecialCommandOpcode.PROGRAM_SHORT_ADDRESS:
+            if self.selected() and (data == DaliMax.MASK or (data & 0x81) == 0x01):
+                self.short_address = data if data == DaliMax.MASK else data >> 1
+        elif address_byte == GearSpecialCommandOpcode.VERIFY_SHORT_ADDRESS:
+            if self.in_initialisation() and (data >> 1) == self.short_address:
+                return YES
+        elif address_byte == GearSpecialCommandOpcode.QUERY_SHORT_ADDRESS:
+            if self.selected():
+                return DaliMax.MASK if self.short_address == DaliMax.MASK else (self.short_address << 1) | 1
+        elif address_byte == GearSpecialCommandOpcode.ENABLE_DEVICE_TYPE:
+            self.enabled_device_type = data
+        elif address_byte == GearSpecialCommandOpcode.DTR1:
+            self.dtr1 = data
+        elif address_byte == GearSpecialCommandOpcode.DTR2:
+            self.dtr2 = data
+        elif address_byte == GearSpecialCommandOpcode.WRITE:
+            return self.write_memory(data)
+        elif address_byte == GearSpecialCommandOpcode.WRITE_NR:
+            self.write_memory(data)
+        return None
+
+    def __repr__(self) -> str:
+        state = "" if self.initialisation == InitialisationState.DISABLED else f" {self.initialisation.name}"
+        return f"VirtualGear(short={self.short_address}, random=0x{self.random_address:06X}{state})"
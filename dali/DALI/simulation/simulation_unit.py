@@ -0,0 +1,84 @@
+"""State shared by virtual control gears and control devices."""
+
+import random
+from enum import Enum
+
+from ..system.constants import DaliMax
+
+
+class InitialisationState(Enum):
+    """Initialisation state of a unit, IEC 62386-102:2022 9.14.2"""
+
+    DISABLED = 0
+    ENABLED = 1
+    WITHDRAWN = 2
+
+
+class VirtualUnit:
+    """Addressing, data transfer registers and memory banks of a virtual bus unit."""
+
+    def __init__(self, short_address: int, random_address: int, rng: random.Random) -> None:
+        self.short_address = short_address
+        self.random_address = random_address
+        self.search_address = DaliMax.RANDOM_ADR - 1
+        self.initialisation = InitialisationState.DISABLED
+        self.rng = rng
+        self.dtr0 = 0
+        self.dtr1 = 0
+        self.dtr2 = 0
+        self.write_enabled = False
+        self.reset_state = False
+        self.banks: dict[int, list[int]] = {}
+        self.time = 0.0
+
+    def initialise(self) -> None:
+        self.initialisation = InitialisationState.ENABLED
+
+    def terminate(self) -> None:
+        self.initialisation = InitialisationState.DISABLED
+
+    def in_initialisation(self) -> bool:
+        return self.initialisation != InitialisationState.DISABLED
+
+    def randomise(self) -> None:
+        if self.in_initialisation():
+            self.random_address = self.rng.randrange(DaliMax.RANDOM_ADR)
+
+    def compare(self) -> bool:
+        return self.initialisation == InitialisationState.ENABLED and self.random_address <= self.search_address
+
+    def withdraw(self) -> None:
+        if self.initialisation == InitialisationState.ENABLED and self.random_address == self.search_address:
+            self.initialisation = InitialisationState.WITHDRAWN
+
+    def set_search_byte(self, shift: int, value: int) -> None:
+        if self.in_initialisation():
+            self.search_address = (self.search_address & ~(0xFF << shift)) | (value << shift)
+
+    def selected(self) -> bool:
+        return self.in_initialisation() and self.random_address == self.search_address
+
+    def memory_bank(self, bank: int) -> list[int] | None:
+        """Content of a memory bank, location 0 holds the last accessible location."""
+        return self.banks.get(bank)
+
+    def read_memory(self) -> int | None:
+        content = self.memory_bank(self.dtr1)
+        if content is None:
+            return None
+        value = content[self.dtr0] if self.dtr0 < len(content) else None
+        if self.dtr0 < DaliMax.MASK:
+            self.dtr0 = self.dtr0 + 1
+        return value
+
+    def write_memory(self, value: int) -> int | None:
+        content = self.memory_bank(self.dtr1)
+        if not self.write_enabled or content is None or self.dtr1 == 0:
+            return None
+        reply = None
+        if self.dtr0 == 2 or (2 < self.dtr0 < len(content) and content[2] == 0x55):
+            content[self.dtr0] = value
+            reply = value
+        if self.dtr0 < DaliMax.MASK:
+            self.dtr0 = self.dtr0 + 1
+        return reply
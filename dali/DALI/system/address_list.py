@@ -0,0 +1,59 @@
+"""Address options that accept lists and ranges of short addresses."""
+
+import functools
+
+import click
+
+from .constants import DaliMax
+
+
+def parse_short_addresses(text: str) -> list[int] | None:
+    """Short addresses of ALL, a range like 0-15 or a list like 3,7,9; None for a single address."""
+    text = text.strip().upper()
+    if text == "ALL":
+        return list(range(DaliMax.ADR))
+    if "," not in text and "-" not in text:
+        return None
+    short_addresses: list[int] = []
+    for part in text.split(","):
+        first, _, last = part.partition("-")
+        try:
+            low = int(first)
+            high = int(last) if last else low
+        except ValueError as error:
+            raise click.BadOptionUsage("adr", f"invalid address list {text}.") from error
+        if not 0 <= low <= high < DaliMax.ADR:
+            raise click.BadOptionUsage("adr", f"invalid address range {part}.")
+        short_addresses.extend(short for short in range(low, high + 1) if short not in short_addresses)
+    return short_addresses
+
+
+def show_reply(lines: list[str] | None, label: str = "") -> None:
+    """Print the reply lines of a query, the first one after the label of its table row."""
+    lines = lines or ["timeout - NO"]
+    click.echo(f"{label}{lines[0]}")
+    for line in lines[1:]:
+        click.echo(f"{'':{len(label)}}{line}")
+
+
+def multi_address_option(option, prefix: str):
+    """Extend an --adr option to lists and ranges of short addresses.
+
+    The query returns the lines of its reply, None on a timeout. For a list
+    it runs once per short address over the same connection and prints a
+    table with a row per address.
+    """
+
+    def decorator(f):
+        @functools.wraps(f)
+        def new_func(*args, adr: str, **kwargs) -> None:
+            short_addresses = parse_short_addresses(adr)
+            if short_addresses is None:
+                show_reply(f(*args, adr=adr, **kwargs))
+                return
+            for short_address in short_addresses:
+                show_reply(f(*args, adr=str(short_address), **kwargs), f"{prefix}{short_address:02}  ")
+
+        return option(new_func)
+
+    return decorator
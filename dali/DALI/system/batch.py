@@ -0,0 +1,52 @@
+"""Execute command lines from a file over a single connection."""
+
+import logging
+import shlex
+
+import click
+
+logger = logging.getLogger(__name__)
+
+
+def execute(ctx: click.Context, args: list[str]) -> None:
+    """Run one command line of the dali command tree with the open connection of ctx."""
+    root = ctx.find_root()
+    if not args:
+        return
+    if args[0].startswith("-"):
+        raise click.UsageError(f"global option {args[0]} can not be used here.")
+    name, command, arguments = root.command.resolve_command(root, args)
+    if command is None:
+        raise click.UsageError(f"no such command {name}.")
+    # a child of the root context shares its connection, parameters and resources
+    try:
+        with command.make_context(name, arguments, parent=root) as command_ctx:
+            command.invoke(command_ctx)
+    except click.exceptions.Exit as done:
+        if done.exit_code:
+            raise click.ClickException(f"exit code {done.exit_code}.") from done
+
+
+@click.command(name="run", help="Execute the commands listed in FILE, one per line. Use - for stdin.")
+@click.argument("file", type=click.File("r"))
+@click.option("--keep-going", "-k", is_flag=True, help="Continue with the next line after an error.")
+@click.pass_context
+def run(ctx: click.Context, file, keep_going: bool) -> None:
+    errors = 0
+    for number, line in enumerate(file, start=1):
+        try:
+            args = shlex.split(line, comments=True)
+            logger.debug(f"{file.name}:{number}: {args}")
+            execute(ctx, args)
+        except click.ClickException as error:
+            problem = error.format_message()
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            problem = f"{type(error).__name__}: {error}"
+        else:
+            continue
+        errors = errors + 1
+        click.echo(f"{file.name}:{number}: {problem}", err=True)
+        if not keep_going:
+            raise click.ClickException(f"stopped at line {number}.")
+    if errors:
+        raise click.ClickException(f"{errors} commands failed.")
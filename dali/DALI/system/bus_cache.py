@@ -0,0 +1,183 @@
+"""Answer queries for static facts of the units from a cache on disk."""
+
+import json
+import os
+import re
+import time
+
+from dali_interface import DaliFrame, DaliInterface, DaliStatus
+
+from ..device.device_opcode import (
+    DeviceConfigureCommandOpcode,
+    DeviceQueryCommandOpcode,
+    DeviceSpecialCommandOpcode,
+)
+from ..gear.gear_opcode import GearConfigureCommandOpcode, GearQueryCommandOpcode, GearSpecialCommandOpcode
+from .checkpoint import save_json, state_directory
+from .constants import DaliFrameLength
+from .wrapper import DaliWrapper
+
+DAY = 24 * 60 * 60
+
+# time to live in seconds of the cached replies
+GEAR_TTL = {
+    GearQueryCommandOpcode.DEVICE_TYPE: 30 * DAY,
+    GearQueryCommandOpcode.VERSION_NUMBER: 30 * DAY,
+    GearQueryCommandOpcode.PHYSICAL_MINIMUM: 30 * DAY,
+}
+DEVICE_TTL = {
+    DeviceQueryCommandOpcode.QUERY_VERSION_NUMBER: 30 * DAY,
+    DeviceQueryCommandOpcode.QUERY_NUMBER_OF_INSTANCES: 30 * DAY,
+    DeviceQueryCommandOpcode.QUERY_DEVICE_CAPABILITIES: 30 * DAY,
+}
+# every unit answers these, the random address tells whether the cached unit is still there
+RANDOM_ADDRESS_OPCODES = {
+    "G": (
+        GearQueryCommandOpcode.RANDOM_ADDRESS_H,
+        GearQueryCommandOpcode.RANDOM_ADDRESS_M,
+        GearQueryCommandOpcode.RANDOM_ADDRESS_L,
+    ),
+    "D": (
+        DeviceQueryCommandOpcode.QUERY_RANDOM_ADDRESS_H,
+        DeviceQueryCommandOpcode.QUERY_RANDOM_ADDRESS_M,
+        DeviceQueryCommandOpcode.QUERY_RANDOM_ADDRESS_L,
+    ),
+}
+DEVICE_INSTANCE_BYTE = 0xFE
+
+
+def default_cache_path(bus: str) -> str:
+    return os.path.join(state_directory(), f"cache-{re.sub(r'[^A-Za-z0-9_.-]', '_', bus)}.json")
+
+
+def query_key(frame: DaliFrame) -> tuple[str, int] | None:
+    """Unit key and opcode of a query to a single short address, if its reply can be cached or is a random address."""
+    if frame.length == DaliFrameLength.GEAR:
+        address_byte = frame.data >> 8
+        opcode = frame.data & 0xFF
+        cached = opcode in GEAR_TTL or opcode in RANDOM_ADDRESS_OPCODES["G"]
+        if address_byte < 0x80 and address_byte & 0x01 and cached:
+            return f"G{address_byte >> 1:02}", opcode
+    if frame.length == DaliFrameLength.DEVICE:
+        address_byte = frame.data >> 16
+        instance_byte = (frame.data >> 8) & 0xFF
+        opcode = frame.data & 0xFF
+        short_addressed = address_byte < 0x80 and address_byte & 0x01
+        cached = opcode in DEVICE_TTL or opcode in RANDOM_ADDRESS_OPCODES["D"]
+        if short_addressed and instance_byte == DEVICE_INSTANCE_BYTE and cached:
+            return f"D{address_byte >> 1:02}", opcode
+    return None
+
+
+def changes_addresses(frame: DaliFrame) -> str | None:
+    """Prefix of the unit keys a frame can move to other short addresses or randomise."""
+    if frame.length == DaliFrameLength.GEAR:
+        address_byte = frame.data >> 8
+        if address_byte in (GearSpecialCommandOpcode.RANDOMISE, GearSpecialCommandOpcode.PROGRAM_SHORT_ADDRESS):
+            return "G"
+        configure = (address_byte & 0x01) and not 0xA0 <= address_byte < 0xFC
+        if configure and frame.data & 0xFF in (
+            GearConfigureCommandOpcode.SET_SHORT_ADDRESS,
+            GearConfigureCommandOpcode.RESET,
+        ):
+            return "G"
+    if frame.length == DaliFrameLength.DEVICE:
+        address_byte = frame.data >> 16
+        instance_byte = (frame.data >> 8) & 0xFF
+        special = (DeviceSpecialCommandOpcode.RANDOMISE, DeviceSpecialCommandOpcode.PROGRAM_SHORT_ADDRESS)
+        if address_byte == 0xC1 and instance_byte in special:
+            return "D"
+        configure = (address_byte & 0x01) and not 0xC1 <= address_byte < 0xFD and instance_byte == DEVICE_INSTANCE_BYTE
+        if configure and frame.data & 0xFF in (
+            DeviceConfigureCommandOpcode.SET_SHORT_ADDRESS,
+            DeviceConfigureCommandOpcode.RESET,
+        ):
+            return "D"
+    return None
+
+
+class DaliBusCache(DaliWrapper):
+    """Answer queries for static facts like device type or version from disk.
+
+    Entries are kept per short address with the time they were read. The
+    first cached query to a unit in a session reads its random address, which
+    then also answers the random address queries of the session. Entries of a
+    unit with another random address are dropped, the unit was swapped or got
+    a new random address. Frames that program short addresses, randomise or
+    reset drop the entries of that unit kind.
+    """
+
+    def __init__(self, dali: DaliInterface, path: str) -> None:
+        super().__init__(dali)
+        self.path = path
+        self.units: dict[str, dict[str, list]] = {}
+        self.random_addresses: dict[str, list[DaliFrame]] = {}
+        self.load()
+
+    def load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                self.units = json.load(file)
+        except (OSError, ValueError):
+            self.units = {}
+
+    def save(self) -> None:
+        save_json(self.path, self.units)
+
+    def lookup(self, unit: str, opcode: int) -> int | None:
+        entry = self.units.get(unit, {}).get(f"{opcode:02X}")
+        ttl = GEAR_TTL.get(opcode) if unit.startswith("G") else DEVICE_TTL.get(opcode)
+        if entry is None or ttl is None or time.time() - entry[1] > ttl:
+            return None
+        return int(entry[0])
+
+    def store(self, unit: str, opcode: int, value: int) -> None:
+        self.units.setdefault(unit, {})[f"{opcode:02X}"] = [value, time.time()]
+
+    def random_address_replies(self, request: DaliFrame, unit: str) -> list[DaliFrame]:
+        """Replies of a unit to the random address queries, sent once per session and stopped by a timeout."""
+        if unit not in self.random_addresses:
+            replies: list[DaliFrame] = []
+            for opcode in RANDOM_ADDRESS_OPCODES[unit[0]]:
+                replies.append(
+                    self.dali.query_reply(DaliFrame(length=request.length, data=request.data & ~0xFF | opcode))
+                )
+                if replies[-1].status == DaliStatus.TIMEOUT:
+                    break
+            self.random_addresses[unit] = replies
+            random_address = None
+            if all(reply.length == DaliFrameLength.BACKWARD for reply in replies):
+                random_address = replies[0].data << 16 | replies[1].data << 8 | replies[2].data
+            if random_address is None or self.units.get(unit, {}).get("random", [None])[0] != random_address:
+                self.units.pop(unit, None)
+            if random_address is not None:
+                self.units.setdefault(unit, {})["random"] = [random_address, time.time()]
+        return self.random_addresses[unit]
+
+    def transmit(self, frame: DaliFrame, block: bool = False, is_query: bool = False) -> None:
+        prefix = changes_addresses(frame)
+        if prefix is not None:
+            self.units = {unit: entry for unit, entry in self.units.items() if not unit.startswith(prefix)}
+            self.random_addresses = {
+                unit: replies for unit, replies in self.random_addresses.items() if not unit.startswith(prefix)
+            }
+        self.dali.transmit(frame, block=block)
+
+    def query_reply(self, request: DaliFrame) -> DaliFrame:
+        key = query_key(request)
+        if key is None:
+            return self.dali.query_reply(request)
+        unit, opcode = key
+        replies = self.random_address_replies(request, unit)
+        if replies[-1].status == DaliStatus.TIMEOUT:
+            # every unit answers its random address, the short address is not used
+            return DaliFrame(status=DaliStatus.TIMEOUT)
+        if opcode in RANDOM_ADDRESS_OPCODES[unit[0]]:
+            return replies[RANDOM_ADDRESS_OPCODES[unit[0]].index(opcode)]
+        value = self.lookup(unit, opcode)
+        if value is not None:
+            return DaliFrame(length=DaliFrameLength.BACKWARD, data=value, status=DaliStatus.OK)
+        reply = self.dali.query_reply(request)
+        if reply.length == DaliFrameLength.BACKWARD:
+            self.store(unit, opcode, reply.data)
+        return reply
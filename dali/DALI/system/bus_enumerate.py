@@ -0,0 +1,66 @@
+"""Enumerate control gears and control devices in one session."""
+
+import os
+
+import click
+
+from ..device.device_enumerate import DeviceUnits
+from ..gear.gear_enumerate import GearUnits
+from .checkpoint import EnumerationCheckpoint, default_checkpoint_path
+from .enumeration import assign_short_addresses, resolve_collisions
+from .pipeline import DaliPipeline, pass_pipeline
+from .search import SearchAddressShadow
+
+
+def show_table(gears: EnumerationCheckpoint, devices: EnumerationCheckpoint) -> None:
+    click.echo(f"{'unit':<8}{'address':<9}random")
+    for kind, prefix, checkpoint in (("gear", "G", gears), ("device", "D", devices)):
+        for random_address, short_address in sorted(checkpoint.assigned.items(), key=lambda item: item[1]):
+            click.echo(f"{kind:<8}{prefix}{short_address:02}      0x{random_address:06X}")
+
+
+@click.command(name="enum", help="Clear and re-program short addresses of all control gears and control devices.")
+@pass_pipeline
+@click.option("--resume", is_flag=True, help="Continue an interrupted enumeration from the checkpoints.")
+def enumerate_bus(pipeline: DaliPipeline, resume: bool) -> None:
+    dali = SearchAddressShadow(pipeline)
+    gear_units = GearUnits()
+    device_units = DeviceUnits()
+    gears = EnumerationCheckpoint(default_checkpoint_path("gear"), "gear")
+    devices = EnumerationCheckpoint(default_checkpoint_path("device"), "device")
+    if resume:
+        # the gear checkpoint is removed once all gears are addressed, then only the devices continue
+        gears_done = not os.path.exists(gears.path)
+        devices.load()
+        if not gears_done:
+            gears.load()
+        device_units.prepare_bus(dali, unaddressed=True)
+        if not gears_done:
+            gear_units.prepare_bus(dali, unaddressed=True)
+    else:
+        gears_done = False
+        # quiescent devices send no events that could disturb the gear search
+        device_units.prepare_bus(dali)
+        gear_units.prepare_bus(dali)
+        device_units.clear_short_addresses(dali)
+        gear_units.clear_short_addresses(dali)
+        device_units.remove_from_all_groups(dali)
+        gear_units.remove_from_all_groups(dali)
+        # gears and devices settle after RANDOMISE at the same time
+        gear_units.request_new_random_addresses(dali)
+        device_units.request_new_random_addresses(dali)
+        gears.save()
+        devices.save()
+    assigned = 0
+    if not gears_done:
+        assigned = assign_short_addresses(gear_units, dali, gears)
+        assigned = assigned + resolve_collisions(gear_units, dali, gears)
+        gear_units.finish_work(dali)
+        gears.remove()
+    assigned = assigned + assign_short_addresses(device_units, dali, devices)
+    assigned = assigned + resolve_collisions(device_units, dali, devices)
+    device_units.finish_work(dali)
+    devices.remove()
+    show_table(gears, devices)
+    if assigned:
+        click.echo(f"{pipeline.frames} frames, {pipeline.frames / assigned:.1f} frames per assigned address.")
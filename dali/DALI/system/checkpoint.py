@@ -0,0 +1,128 @@
+"""Progress of an enumeration, saved after each assignment to resume after an interruption."""
+
+import json
+import os
+
+import click
+
+from .constants import DaliMax
+
+
+def state_directory() -> str:
+    state_home = os.environ.get("XDG_STATE_HOME", os.path.join(os.path.expanduser("~"), ".local", "state"))
+    return os.path.join(state_home, "dali")
+
+
+def save_json(path: str, content, indent: int | None = 2) -> None:
+    """Write content to a temporary file first, an interruption never leaves a partial file at path."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        json.dump(content, file, indent=indent, sort_keys=True)
+    os.replace(temporary, path)
+
+
+def default_checkpoint_path(kind: str) -> str:
+    return os.path.join(state_directory(), f"enum-{kind}.json")
+
+
+def default_address_map_path(kind: str) -> str:
+    return os.path.join(state_directory(), f"addresses-{kind}.json")
+
+
+def load_address_map(path: str) -> dict[int, int]:
+    """Random to short address map saved by an earlier enumeration, empty if there is none."""
+    try:
+        with open(path, encoding="utf-8") as file:
+            content = json.load(file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as error:
+        raise click.ClickException(f"can not read address map {path}: {error}") from error
+    return {int(random_address, 16): short for random_address, short in content.items()}
+
+
+def save_address_map(path: str, address_map: dict[int, int]) -> None:
+    content = {f"{random_address:06X}": short for random_address, short in sorted(address_map.items())}
+    save_json(path, content)
+
+
+def merge_address_map(address_map: dict[int, int], update: dict[int, int]) -> dict[int, int]:
+    """Entries of update replace those of address_map with the same random or short address."""
+    shorts = set(update.values())
+    kept = {r: short for r, short in address_map.items() if r not in update and short not in shorts}
+    return kept | update
+
+
+class EnumerationCheckpoint:
+    """Random to short address map and free short addresses of a running enumeration."""
+
+    def __init__(self, path: str, kind: str) -> None:
+        self.path = path
+        self.kind = kind
+        self.assigned: dict[int, int] = {}
+        self.free: list[int] = list(range(DaliMax.ADR))
+        self.collisions: list[int] = []
+        self.preferred: dict[int, int] = {}
+        # addresses being programmed, a unit may hold one after an interruption
+        self.pending: dict[int, int] = {}
+
+    def load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                content = json.load(file)
+        except (OSError, ValueError) as error:
+            raise click.ClickException(f"can not resume from {self.path}: {error}") from error
+        if content.get("kind") != self.kind:
+            raise click.ClickException(f"{self.path} is not a checkpoint of a {self.kind} enumeration.")
+        self.assigned = {int(random_address, 16): short for random_address, short in content["assigned"].items()}
+        self.free = content["free"]
+        self.collisions = content["collisions"]
+        self.preferred = {int(r, 16): short for r, short in content.get("preferred", {}).items()}
+        self.pending = {int(r, 16): short for r, short in content.get("pending", {}).items()}
+
+    def save(self) -> None:
+        content = {
+            "kind": self.kind,
+            "assigned": {f"{random_address:06X}": short for random_address, short in self.assigned.items()},
+            "free": self.free,
+            "collisions": self.collisions,
+            "preferred": {f"{random_address:06X}": short for random_address, short in self.preferred.items()},
+            "pending": {f"{random_address:06X}": short for random_address, short in self.pending.items()},
+        }
+        save_json(self.path, content)
+
+    def next_short_address(self, random_address: int) -> int | None:
+        """Previous short address of a known unit, else the lowest free one not kept for a known unit."""
+        preferred = self.preferred.get(random_address)
+        if preferred in self.free:
+            return preferred
+        kept = set(self.preferred.values())
+        for short_address in self.free:
+            if short_address not in kept:
+                return short_address
+        return self.free[0] if self.free else None
+
+    def reserve(self, random_address: int, short_address: int) -> None:
+        """Take short_address out of the free ones before it is programmed."""
+        self.free.remove(short_address)
+        self.pending[random_address] = short_address
+
+    def release(self, random_address: int) -> None:
+        """Return the address of a failed programming to the free ones."""
+        self.free.append(self.pending.pop(random_address))
+        self.free.sort()
+
+    def assign(self, random_address: int, short_address: int) -> None:
+        del self.pending[random_address]
+        self.assigned[random_address] = short_address
+
+    def collide(self, random_address: int, short_address: int) -> None:
+        # the colliding units get new random addresses, none of them is known anymore
+        del self.pending[random_address]
+        self.collisions.append(short_address)
+        self.preferred = {r: short for r, short in self.preferred.items() if short != short_address}
+
+    def remove(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -1,9 +1,12 @@
 """Connection resource to handle the connection with click"""
 
+# pylint: disable=import-outside-toplevel
+# backends are imported once a connection type is chosen to keep the startup fast
+
 from contextlib import contextmanager
 
 import click
-from dali_interface import DaliFrame, DaliInterface, DaliMock, DaliSerial, DaliUsb
+from dali_interface import DaliFrame, DaliInterface
 
 
 class DaliNone(DaliInterface):
@@ -26,16 +29,36 @@ class DaliNone(DaliInterface):
 
 
 @contextmanager
-def dali_connection(connection_type: str, serial_port: None | str = None):  # pylint disable=raise-missing-from
+def dali_connection(
+    connection_type: str,
+    serial_port: None | str = None,
+    socket_path: None | str = None,
+    simulation: None | str = None,
+):  # pylint disable=raise-missing-from
     try:
         if connection_type == "None":
             resource = DaliNone()
         elif connection_type == "Serial":
+            from dali_interface import DaliSerial
+
             resource = DaliSerial(portname=serial_port)
         elif connection_type == "Usb":
+            from dali_interface import DaliUsb
+
             resource = DaliUsb()
         elif connection_type == "Mock":
+            from dali_interface import DaliMock
+
             resource = DaliMock()
+        elif connection_type == "Daemon":
+            from .daemon import DaliDaemonClient
+
+            resource = DaliDaemonClient(socket_path)
+        elif connection_type == "Simulation":
+            from ..simulation.simulation_bus import DaliSimulation
+
+            gears, _, devices = simulation.partition(":")
+            resource = DaliSimulation(int(gears), int(devices or 0))
         else:
             raise click.BadArgumentUsage("no valid DALI connection selected.")
     except Exception as error:
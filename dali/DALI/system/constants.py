@@ -26,6 +26,23 @@ class DaliTimeout(Enum):
     DEFAULT = 0.2
 
 
+class DaliSettlingTime(Enum):
+    """Processing time units need after a command, IEC 62386-102/103"""
+
+    RANDOMISE = 0.1
+    RESET = 0.3
+
+
+class DaliBusTiming(Enum):
+    """Bus timing in seconds, IEC 62386-101:2022 8.1"""
+
+    HALF_BIT = 1 / 2400
+    FORWARD_SETTLING = 0.0149
+    BACKWARD_DELAY = 0.0080
+    BACKWARD_SETTLING = 0.0024
+    SEND_TWICE = 0.1
+
+
 class DaliFrameLength(IntEnum):
     """Length for DALI frames"""
 
@@ -0,0 +1,153 @@
+"""Serve a DALI interface to other processes via a unix socket."""
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+
+import click
+from dali_interface import DaliFrame, DaliInterface, DaliStatus
+
+from .reply_timeout import query_within
+from .wrapper import DaliLocalInterface
+
+logger = logging.getLogger(__name__)
+
+
+def default_socket_path() -> str:
+    return os.path.join(os.environ.get("XDG_RUNTIME_DIR", tempfile.gettempdir()), "dali.sock")
+
+
+def frame_to_message(frame: DaliFrame) -> dict:
+    return {"length": frame.length, "data": frame.data, "send_twice": frame.send_twice}
+
+
+def message_to_frame(message: dict) -> DaliFrame:
+    return DaliFrame(length=message["length"], data=message["data"], send_twice=message.get("send_twice", False))
+
+
+class DaliRequestHandler(socketserver.StreamRequestHandler):
+    """Process newline separated JSON requests of one client."""
+
+    server: "DaliDaemon"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                response = self.server.process(json.loads(line))
+            except Exception as error:
+                logger.debug(f"request failed: {error}")
+                response = {"error": str(error)}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class DaliDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Own a DALI interface and forward frame requests to it."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, dali: DaliInterface) -> None:
+        self.dali = dali
+        self.lock = threading.Lock()
+        self.socket_path = socket_path
+        if os.path.exists(socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(socket_path)
+            except OSError:
+                os.unlink(socket_path)
+            else:
+                raise click.ClickException(f"a daemon is already serving {socket_path}.")
+            finally:
+                probe.close()
+        super().__init__(socket_path, DaliRequestHandler)
+        os.chmod(socket_path, 0o600)
+
+    def process(self, request: dict) -> dict:
+        command = request["command"]
+        with self.lock:
+            if command == "transmit":
+                self.dali.transmit(message_to_frame(request), block=request.get("block", False))
+                return {}
+            if command == "query":
+                if "timeout" not in request:
+                    reply = self.dali.query_reply(message_to_frame(request))
+                elif hasattr(self.dali, "reply_timeout"):
+                    default_timeout = self.dali.reply_timeout
+                    self.dali.reply_timeout = request["timeout"]
+                    try:
+                        reply = self.dali.query_reply(message_to_frame(request))
+                    finally:
+                        self.dali.reply_timeout = default_timeout
+                else:
+                    reply = query_within(self.dali, message_to_frame(request), request["timeout"])
+                return {"length": reply.length, "data": reply.data, "status": reply.status.name}
+            if command == "power":
+                self.dali.power(request["on"])
+                return {}
+        raise ValueError(f"unknown command {command}")
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+class DaliDaemonClient(DaliLocalInterface):
+    """Forward frames to a running dali daemon."""
+
+    def __init__(self, socket_path: str) -> None:
+        super().__init__()
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(socket_path)
+        self.stream = self.socket.makefile("rwb")
+        self.reply_timeout: float | None = None
+
+    def request(self, message: dict) -> dict:
+        self.stream.write(json.dumps(message).encode() + b"\n")
+        self.stream.flush()
+        line = self.stream.readline()
+        if not line:
+            raise click.ClickException("connection to dali daemon lost.")
+        response = json.loads(line)
+        if "error" in response:
+            raise click.ClickException(f"dali daemon: {response['error']}")
+        return response
+
+    def transmit(self, frame: DaliFrame, block: bool = False, is_query: bool = False) -> None:
+        self.request({"command": "transmit", "block": block} | frame_to_message(frame))
+
+    def query_reply(self, request: DaliFrame) -> DaliFrame:
+        message = {"command": "query"} | frame_to_message(request)
+        if self.reply_timeout is not None:
+            message["timeout"] = self.reply_timeout
+        response = self.request(message)
+        return DaliFrame(length=response["length"], data=response["data"], status=DaliStatus[response["status"]])
+
+    def power(self, power: bool = False) -> None:
+        self.request({"command": "power", "on": power})
+
+    def close(self) -> None:
+        if not self.stream.closed:
+            self.stream.close()
+            self.socket.close()
+
+
+@click.command(name="daemon", help="Keep the DALI interface open and serve frames to other dali calls.")
+@click.pass_context
+def daemon(ctx: click.Context) -> None:
+    dali = ctx.obj
+    if isinstance(dali, DaliDaemonClient):
+        raise click.UsageError("the daemon needs a serial or HID interface, not --daemon.")
+    socket_path = ctx.find_root().params["socket_path"]
+    server = DaliDaemon(socket_path, dali)
+    click.echo(f"serving DALI frames on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,192 @@
+"""Assign short addresses to control gears or control devices.
+
+The steps are the same for both unit kinds, the commands come from a
+UnitKind, GearUnits of gear_enumerate or DeviceUnits of device_enumerate.
+"""
+
+from typing import Protocol
+
+import click
+from dali_interface import DaliFrame, DaliInterface, DaliStatus
+
+from .checkpoint import (
+    EnumerationCheckpoint,
+    default_address_map_path,
+    default_checkpoint_path,
+    load_address_map,
+    merge_address_map,
+    save_address_map,
+)
+from .constants import DaliFrameLength, DaliMax
+from .pipeline import DaliPipeline
+from .presence import forget_presence
+from .search import SearchAddressShadow
+
+COLLISION_ROUNDS = 3
+
+
+class UnitKind(Protocol):
+    """Search and addressing commands of one kind of unit."""
+
+    kind: str
+    prefix: str
+
+    def prepare_bus(self, dali: DaliInterface, unaddressed: bool = False) -> None: ...
+
+    def used_short_addresses(self, dali: DaliInterface) -> set[int]: ...
+
+    def read_random_addresses(self, dali: DaliInterface, short_addresses: set[int]) -> dict[int, int]: ...
+
+    def clear_short_addresses(self, dali: DaliInterface, short_address: int | None = None) -> None: ...
+
+    def remove_from_all_groups(self, dali: DaliInterface) -> None: ...
+
+    def request_new_random_addresses(self, dali: DaliInterface) -> None: ...
+
+    def set_search_address(self, dali: DaliInterface, search: int) -> None: ...
+
+    def binary_search(self, dali: DaliInterface, low: int = 0) -> int | None: ...
+
+    def set_short_address(self, dali: DaliInterface, new_short_address: int) -> DaliFrame: ...
+
+    def initialise_unit(self, dali: DaliInterface, short_address: int) -> None: ...
+
+    def finish_work(self, dali: DaliInterface) -> None: ...
+
+
+def assign_short_addresses(units: UnitKind, dali: DaliInterface, checkpoint: EnumerationCheckpoint) -> int:
+    """Program short addresses in order of the random addresses, save the progress after each.
+
+    Known units get their previous short address, other units the lowest free one.
+    """
+    assigned = 0
+    search = -1
+    while True:
+        search = units.binary_search(dali, search + 1)
+        if search is None:
+            break
+        next_short_address = checkpoint.next_short_address(search)
+        if next_short_address is None:
+            click.echo("no free short address left.")
+            break
+        # saved before programming, a resume never hands out an address a unit may already hold
+        checkpoint.reserve(search, next_short_address)
+        checkpoint.save()
+        units.set_search_address(dali, search)
+        result = units.set_short_address(dali, next_short_address)
+        if result.length == DaliFrameLength.BACKWARD:
+            click.echo(f"assigned {units.prefix}{next_short_address:02}.")
+            assigned = assigned + 1
+            checkpoint.assign(search, next_short_address)
+        elif result.status != DaliStatus.TIMEOUT:
+            click.echo(f"random address collision on {units.prefix}{next_short_address:02}.")
+            checkpoint.collide(search, next_short_address)
+        else:
+            click.echo("address search failed.")
+            checkpoint.release(search)
+        checkpoint.save()
+    return assigned
+
+
+def resolve_collision(
+    units: UnitKind, dali: DaliInterface, short_address: int, checkpoint: EnumerationCheckpoint
+) -> int:
+    """Re-randomise only the units sharing short_address, all other units stay out of initialisation."""
+    units.initialise_unit(dali, short_address)
+    units.clear_short_addresses(dali, short_address)
+    checkpoint.collisions.remove(short_address)
+    checkpoint.free.insert(0, short_address)
+    checkpoint.save()
+    units.request_new_random_addresses(dali)
+    return assign_short_addresses(units, dali, checkpoint)
+
+
+def resolve_collisions(units: UnitKind, dali: DaliInterface, checkpoint: EnumerationCheckpoint) -> int:
+    assigned = 0
+    for _ in range(COLLISION_ROUNDS):
+        for short_address in list(checkpoint.collisions):
+            assigned = assigned + resolve_collision(units, dali, short_address, checkpoint)
+    for short_address in checkpoint.collisions:
+        click.echo(f"unresolved collision on {units.prefix}{short_address:02}.")
+    return assigned
+
+
+def enumeration_options(kind: str):
+    """Options shared by the enum commands of gears and devices."""
+
+    def decorator(f):
+        options = [
+            click.option(
+                "--checkpoint",
+                "checkpoint_path",
+                type=click.Path(dir_okay=False),
+                default=default_checkpoint_path(kind),
+                show_default=True,
+                help="File to save the progress to after each assignment.",
+            ),
+            click.option("--resume", is_flag=True, help="Continue an interrupted enumeration from the checkpoint."),
+            click.option(
+                "--keep-addresses",
+                is_flag=True,
+                help=f"Keep random addresses and give known {kind}s their previous short address from the address map.",
+            ),
+            click.option(
+                "--address-map",
+                "address_map_path",
+                type=click.Path(dir_okay=False),
+                default=default_address_map_path(kind),
+                show_default=True,
+                help=f"File with the random to short address map of the {kind}s.",
+            ),
+        ]
+        for option in reversed(options):
+            f = option(f)
+        return f
+
+    return decorator
+
+
+def enumerate_units(
+    units: UnitKind,
+    pipeline: DaliPipeline,
+    checkpoint_path: str,
+    resume: bool,
+    keep_addresses: bool,
+    address_map_path: str,
+    incremental: bool = False,
+) -> None:
+    dali = SearchAddressShadow(pipeline)
+    checkpoint = EnumerationCheckpoint(checkpoint_path, units.kind)
+    forget_presence(units.kind)
+    if resume:
+        # units keep their random addresses, only those without short address continue
+        checkpoint.load()
+        units.prepare_bus(dali, unaddressed=True)
+    else:
+        if incremental or keep_addresses:
+            # units with a short address keep it and their groups, only the others are searched
+            used = units.used_short_addresses(dali)
+            checkpoint.free = sorted(set(range(DaliMax.ADR)) - used)
+            if keep_addresses:
+                address_map = merge_address_map(
+                    load_address_map(address_map_path), units.read_random_addresses(dali, used)
+                )
+                save_address_map(address_map_path, address_map)
+                checkpoint.preferred = address_map
+            units.prepare_bus(dali, unaddressed=True)
+        else:
+            units.prepare_bus(dali)
+            units.clear_short_addresses(dali)
+            units.remove_from_all_groups(dali)
+        # known units are recognised by their random address, only colliding units get new ones
+        if not keep_addresses:
+            units.request_new_random_addresses(dali)
+        checkpoint.save()
+    assigned = assign_short_addresses(units, dali, checkpoint)
+    assigned = assigned + resolve_collisions(units, dali, checkpoint)
+    units.finish_work(dali)
+    if keep_addresses:
+        save_address_map(address_map_path, merge_address_map(load_address_map(address_map_path), checkpoint.assigned))
+    checkpoint.remove()
+    if assigned:
+        click.echo(f"{pipeline.frames} frames, {pipeline.frames / assigned:.1f} frames per assigned address.")
@@ -0,0 +1,26 @@
+"""Command group that imports the module of a subcommand only when it is used."""
+
+import importlib
+
+import click
+
+
+class LazyGroup(click.Group):
+    """Resolve subcommands from "module:attribute" import paths on first use."""
+
+    def __init__(self, *args, lazy_subcommands: dict[str, str] | None = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name in self.commands or cmd_name not in self.lazy_subcommands:
+            return super().get_command(ctx, cmd_name)
+        module_name, attribute = self.lazy_subcommands[cmd_name].split(":")
+        command = getattr(importlib.import_module(module_name), attribute)
+        if not isinstance(command, click.Command):
+            raise click.ClickException(f"lazy loading of {cmd_name} did not return a command.")
+        self.add_command(command, cmd_name)
+        return command
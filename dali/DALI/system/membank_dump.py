@@ -0,0 +1,106 @@
+"""Dump memory bank contents of control gears or control devices."""
+
+from collections.abc import Callable
+
+import click
+
+from .membank_annotation import MemoryBankItemWithAnnotation
+from .membank_reader import read_bank, short_addresses_option, write_dumps
+from .membank_schema import decode_dumps, show_fields
+from .membank_store import MemoryBankStore, default_store_path, refresh_all_banks, refresh_bank
+
+BankAccess = Callable[[str], tuple[Callable[[int, int], None], Callable[[], int | None]]]
+
+
+def dump_options(f):
+    """Argument and options of the dump commands of gears and devices."""
+    options = [
+        click.argument("bank", type=click.INT, required=False),
+        click.option(
+            "--adr",
+            default="BC",
+            help="Address, can be a short address (0..63) or group address (G0..G15). "
+            "With --all-banks also a list or range of short addresses (3,7,9 or 0-15) or ALL.",
+        ),
+        click.option("--all-banks", is_flag=True, help="Read all implemented memory banks into a file."),
+        click.option(
+            "--output",
+            type=click.Path(dir_okay=False, allow_dash=True),
+            default="-",
+            help="File for the memory banks read with --all-banks.",
+        ),
+        click.option(
+            "--format",
+            "output_format",
+            type=click.Choice(["json", "binary"]),
+            default="json",
+            show_default=True,
+            help="Format of the --all-banks output.",
+        ),
+        click.option(
+            "--refresh",
+            type=click.Choice(["volatile", "all"]),
+            default="all",
+            show_default=True,
+            help="With volatile, banks 0 and 1 of a known unit come from the memory bank store, "
+            "only other banks are read.",
+        ),
+        click.option("--decoded", is_flag=True, help="Show typed fields like energy or GTIN instead of single bytes."),
+    ]
+    for option in reversed(options):
+        f = option(f)
+    return f
+
+
+def dump_banks(
+    bank_access: BankAccess,
+    kind: str,
+    adr: str,
+    bank: int | None,
+    all_banks: bool,
+    output: str,
+    output_format: str,
+    refresh: str,
+    decoded: bool,
+) -> None:
+    """
+    Dump the contents of a memory bank
+
+    :param bank_access: select and read functions of the memory banks at an address
+    :param kind: gear or device, names the memory bank store and the units in the output
+    :param adr: Address information
+    :param bank: Memory bank number
+    :param all_banks: Read all implemented memory banks of a list of short addresses
+    :param output: File for the memory banks read with all_banks
+    :param output_format: json or binary
+    :param refresh: volatile reads banks 0 and 1 of a known unit from the memory bank store
+    :param decoded: show typed fields instead of single bytes
+    """
+    if decoded and all_banks and output_format != "json":
+        raise click.BadOptionUsage("decoded", "decoded memory banks are written as json.")
+    if all_banks:
+        # the store learns every unit read in full, a later volatile refresh skips its static banks
+        store = MemoryBankStore(default_store_path(kind))
+        dumps = {}
+        for short_address in short_addresses_option(adr):
+            banks = refresh_all_banks(*bank_access(str(short_address)), store, refresh)
+            if banks:
+                dumps[f"{kind[0].upper()}{short_address:02}"] = banks
+        store.save()
+        write_dumps(output, output_format, decode_dumps(dumps) if decoded else dumps)
+        return
+    if bank is None:
+        raise click.BadParameter("needs a memory bank or --all-banks.", param_hint="BANK")
+    if refresh == "volatile" and adr.isdigit():
+        store = MemoryBankStore(default_store_path(kind))
+        content = refresh_bank(*bank_access(adr), store, bank)
+        store.save()
+    else:
+        content = read_bank(*bank_access(adr), bank)
+    if content is None:
+        click.echo(f"memory bank {bank} not implemented")
+    elif decoded:
+        show_fields(bank, content)
+    else:
+        for location, value in enumerate(content):
+            MemoryBankItemWithAnnotation.show(bank, location, value)
@@ -0,0 +1,79 @@
+"""Read all implemented memory banks of units and store the raw bytes."""
+
+import json
+import struct
+from collections.abc import Callable
+
+import click
+
+from .address_list import parse_short_addresses
+from .constants import DaliMax
+
+MAGIC = b"DALIMB1\n"
+LAST_BANK_LOCATION = 2
+
+
+def read_bank(
+    select: Callable[[int, int], None], read_location: Callable[[], int | None], bank: int
+) -> list[int | None] | None:
+    """Content of a memory bank from location 0 to the last accessible location, None if not implemented."""
+    select(bank, 0)
+    last_location = read_location()
+    if last_location is None:
+        return None
+    return [last_location] + [read_location() for _ in range(last_location)]
+
+
+def read_all_banks(
+    select: Callable[[int, int], None], read_location: Callable[[], int | None]
+) -> dict[int, list[int | None]]:
+    """Bank 0 tells the last accessible bank, every bank up to it is tried."""
+    bank_0 = read_bank(select, read_location, 0)
+    if bank_0 is None:
+        return {}
+    banks = {0: bank_0}
+    last_bank = bank_0[LAST_BANK_LOCATION] if len(bank_0) > LAST_BANK_LOCATION else None
+    for bank in range(1, (last_bank or 0) + 1):
+        content = read_bank(select, read_location, bank)
+        if content is not None:
+            banks[bank] = content
+    return banks
+
+
+def short_addresses_option(adr: str) -> list[int]:
+    """Short addresses of an --adr option for reading memory banks, replies of several units would collide."""
+    short_addresses = parse_short_addresses(adr)
+    if short_addresses is not None:
+        return short_addresses
+    if adr.isdigit() and int(adr) < DaliMax.ADR:
+        return [int(adr)]
+    raise click.BadOptionUsage("adr", "reading all banks needs short addresses.")
+
+
+def write_dumps(path: str, output_format: str, dumps: dict[str, dict[int, list[int | None]]]) -> None:
+    if output_format == "json":
+        with click.open_file(path, "w") as file:
+            write_json(file, dumps)
+    else:
+        with click.open_file(path, "wb") as file:
+            write_binary(file, dumps)
+
+
+def write_json(file, dumps: dict[str, dict[int, list[int | None]]]) -> None:
+    content = {unit: {str(bank): data for bank, data in banks.items()} for unit, banks in dumps.items()}
+    file.write(json.dumps(content) + "\n")
+
+
+def write_binary(file, dumps: dict[str, dict[int, list[int | None]]]) -> None:
+    """Magic line, then per bank: unit kind, short address, bank, last location, bytes and a mask of read bytes."""
+    file.write(MAGIC)
+    for unit, banks in dumps.items():
+        short_address = int(unit[1:])
+        for bank, data in banks.items():
+            file.write(struct.pack(">cBBB", unit[0].encode(), short_address, bank, len(data) - 1))
+            file.write(bytes(0xFF if value is None else value for value in data))
+            mask = bytearray((len(data) + 7) // 8)
+            for location, value in enumerate(data):
+                if value is not None:
+                    mask[location // 8] |= 0x80 >> (location % 8)
+            file.write(bytes(mask))
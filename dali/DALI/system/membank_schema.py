@@ -0,0 +1,154 @@
+"""Decode whole memory banks into typed fields, IEC 62386-102, 252 and 253."""
+
+from collections.abc import Callable
+
+import click
+
+from .constants import DaliMax
+
+Content = list[int | None]
+Converter = Callable[[int, Content], int | float | None]
+
+
+def uint(name: str, location: int, length: int = 1) -> tuple[str, int, int, Converter, int]:
+    """Unsigned integer, most significant byte first."""
+    return name, location, length, lambda value, _: value, location
+
+
+def measured(
+    name: str, location: int, length: int = 1, factor: float = 1, offset: int = 0, precision: int = 0
+) -> tuple[str, int, int, Converter, int]:
+    """Measured value with a fixed factor and offset, all bytes 0xFF mean unknown.
+
+    precision is the number of decimals of the scaled value, without decimals it is an integer.
+    """
+    unknown = (1 << 8 * length) - 1
+
+    def convert(value: int, _: Content) -> int | float | None:
+        if value == unknown:
+            return None
+        scaled = value * factor + offset
+        return round(scaled, precision) if precision else round(scaled)
+
+    return name, location, length, convert, location
+
+
+def metered(name: str, location: int, length: int, exponent_location: int) -> tuple[str, int, int, Converter, int]:
+    """Measured value scaled by a signed power of 10 at another location, all bytes 0xFF mean unknown.
+
+    A negative exponent gives as many decimals, a positive one an integer.
+    """
+    unknown = (1 << 8 * length) - 1
+
+    def convert(value: int, content: Content) -> int | float | None:
+        exponent = content[exponent_location] if exponent_location < len(content) else None
+        if value == unknown or exponent is None:
+            return None
+        if exponent & 0x80:
+            precision = DaliMax.VALUE - exponent
+            return round(value * 10.0**-precision, precision)
+        return value * 10**exponent
+
+    return name, location, length, convert, min(location, exponent_location)
+
+
+HEADER = [uint("last_location", 0), uint("indicator", 1), uint("lock", 2)]
+
+
+def counted(name: str, location: int) -> list[tuple[str, int, int, Converter, int]]:
+    """Condition byte followed by its counter."""
+    return [uint(name, location), uint(f"{name}_counter", location + 1)]
+
+
+BANK_SCHEMAS = {
+    0: [
+        uint("last_location", 0),
+        uint("last_bank", 2),
+        uint("gtin", 3, 6),
+        uint("firmware_major", 9),
+        uint("firmware_minor", 10),
+        uint("identification", 11, 8),
+        uint("hardware_major", 19),
+        uint("hardware_minor", 20),
+        uint("version_101", 21),
+        uint("version_102", 22),
+        uint("version_103", 23),
+        uint("device_units", 24),
+        uint("gear_units", 25),
+        uint("gear_index", 26),
+        uint("bus_unit_configuration", 27),
+    ],
+    1: HEADER + [uint("oem_gtin", 3, 6), uint("oem_identification", 9, 8)],
+    202: HEADER + [uint("version", 3), metered("active_energy_wh", 5, 6, 4), metered("active_power_w", 12, 4, 11)],
+    203: HEADER
+    + [uint("version", 3), metered("apparent_energy_vah", 5, 6, 4), metered("apparent_power_va", 12, 4, 11)],
+    204: HEADER + [uint("version", 3), metered("loadside_energy_wh", 5, 6, 4), metered("loadside_power_w", 12, 4, 11)],
+    205: HEADER
+    + [
+        uint("version", 3),
+        measured("operating_time_s", 4, 4),
+        measured("start_counter", 8, 3),
+        measured("supply_voltage_v", 11, 2, 0.1, precision=1),
+        measured("supply_frequency_hz", 13),
+        measured("power_factor", 14, 1, 0.01, precision=2),
+    ]
+    + counted("failure", 15)
+    + counted("undervoltage", 17)
+    + counted("overvoltage", 19)
+    + counted("power_limitation", 21)
+    + counted("thermal_derating", 23)
+    + counted("thermal_shutdown", 25)
+    + [measured("temperature_c", 27, 1, 1, -60), measured("output_current_percent", 28)],
+    206: HEADER
+    + [
+        uint("version", 3),
+        measured("light_source_start_counter_resettable", 4, 3),
+        measured("light_source_start_counter", 7, 3),
+        measured("light_source_on_time_resettable_s", 10, 4),
+        measured("light_source_on_time_s", 14, 4),
+        measured("light_source_voltage_v", 18, 2, 0.1, precision=1),
+        measured("light_source_current_a", 20, 2, 0.001, precision=3),
+    ]
+    + counted("light_source_failure", 22)
+    + counted("short_circuit", 24)
+    + counted("open_circuit", 26)
+    + counted("light_source_thermal_derating", 28)
+    + counted("light_source_thermal_shutdown", 30)
+    + [measured("light_source_temperature_c", 32, 1, 1, -60)],
+}
+
+
+def schema(bank: int) -> list[tuple[str, int, int, Converter, int]]:
+    """Fields of a bank, banks without a schema only have the common header."""
+    if bank in BANK_SCHEMAS:
+        return BANK_SCHEMAS[bank]
+    return HEADER if bank else []
+
+
+def decode_bank(bank: int, content: Content) -> dict[str, int | float | None]:
+    """Typed fields of a bank, None for fields with locations that were not read."""
+    fields: dict[str, int | float | None] = {}
+    for name, location, length, convert, _ in schema(bank):
+        data = content[location : location + length]
+        if len(data) != length or None in data:
+            fields[name] = None
+        else:
+            fields[name] = convert(int.from_bytes(bytes(data), "big"), content)
+    return fields
+
+
+def field_span(bank: int, names: tuple[str, ...]) -> tuple[int, int]:
+    """First and last location to read for the named fields of a bank."""
+    rows = [row for row in schema(bank) if row[0] in names]
+    return min(row[4] for row in rows), max(row[1] + row[2] - 1 for row in rows)
+
+
+def decode_dumps(dumps: dict[str, dict[int, Content]]) -> dict[str, dict[int, dict[str, int | float | None]]]:
+    return {
+        unit: {bank: decode_bank(bank, content) for bank, content in banks.items()} for unit, banks in dumps.items()
+    }
+
+
+def show_fields(bank: int, content: Content) -> None:
+    for name, value in decode_bank(bank, content).items():
+        click.echo(f"{name} = {'NO - timeout' if value is None else value}")
@@ -0,0 +1,125 @@
+"""Keep the static memory banks of units on disk, keyed by GTIN and identification number."""
+
+import json
+import os
+from collections.abc import Callable
+
+from .checkpoint import save_json, state_directory
+from .membank_reader import read_all_banks, read_bank
+
+# banks 0 and 1 hold GTIN, identification number and firmware, all other banks may change
+STATIC_BANKS = (0, 1)
+GTIN_LOCATION = 3
+GTIN_LENGTH = 6
+IDENTIFICATION_LOCATION = 11
+IDENTIFICATION_LENGTH = 8
+
+
+def default_store_path(kind: str) -> str:
+    return os.path.join(state_directory(), f"membanks-{kind}.json")
+
+
+def identity_key(gtin: list[int | None], identification: list[int | None]) -> str | None:
+    if None in gtin or None in identification:
+        return None
+    return f"{bytes(gtin).hex().upper()}-{bytes(identification).hex().upper()}"
+
+
+def identity_of_bank_0(content: list[int | None] | None) -> str | None:
+    if content is None or len(content) < IDENTIFICATION_LOCATION + IDENTIFICATION_LENGTH:
+        return None
+    return identity_key(
+        content[GTIN_LOCATION : GTIN_LOCATION + GTIN_LENGTH],
+        content[IDENTIFICATION_LOCATION : IDENTIFICATION_LOCATION + IDENTIFICATION_LENGTH],
+    )
+
+
+def read_identity(select: Callable[[int, int], None], read_location: Callable[[], int | None]) -> str | None:
+    """Read only GTIN and identification number from bank 0."""
+    select(0, GTIN_LOCATION)
+    gtin = [read_location() for _ in range(GTIN_LENGTH)]
+    select(0, IDENTIFICATION_LOCATION)
+    identification = [read_location() for _ in range(IDENTIFICATION_LENGTH)]
+    return identity_key(gtin, identification)
+
+
+class MemoryBankStore:
+    """Memory bank contents per unit identity, saved as JSON.
+
+    A unit is walked once all its banks were tried, only then the store
+    knows which volatile banks it implements.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.units: dict[str, dict[int, list[int | None]]] = {}
+        self.walked: set[str] = set()
+        try:
+            with open(path, encoding="utf-8") as file:
+                content = json.load(file)
+            for identity, unit in content.items():
+                self.units[identity] = {int(bank): data for bank, data in unit["banks"].items()}
+                if unit["walked"]:
+                    self.walked.add(identity)
+        except (OSError, ValueError, KeyError, AttributeError):
+            self.units = {}
+            self.walked = set()
+
+    def banks(self, identity: str | None) -> dict[int, list[int | None]]:
+        return self.units.get(identity, {}) if identity else {}
+
+    def update(self, identity: str | None, banks: dict[int, list[int | None]], walked: bool = False) -> None:
+        if identity:
+            self.units.setdefault(identity, {}).update(banks)
+            if walked:
+                self.walked.add(identity)
+
+    def save(self) -> None:
+        content = {
+            identity: {"walked": identity in self.walked, "banks": {str(bank): data for bank, data in banks.items()}}
+            for identity, banks in self.units.items()
+        }
+        save_json(self.path, content, indent=None)
+
+
+def refresh_all_banks(
+    select: Callable[[int, int], None],
+    read_location: Callable[[], int | None],
+    store: MemoryBankStore,
+    refresh: str,
+) -> dict[int, list[int | None]]:
+    """All implemented banks, with refresh volatile a known unit only re-reads its volatile banks."""
+    if refresh == "volatile":
+        identity = read_identity(select, read_location)
+        known = store.banks(identity)
+        if identity in store.walked:
+            banks = {bank: content for bank, content in known.items() if bank in STATIC_BANKS}
+            for bank in sorted(known):
+                if bank not in STATIC_BANKS:
+                    content = read_bank(select, read_location, bank)
+                    if content is not None:
+                        banks[bank] = content
+            store.update(identity, banks)
+            return banks
+    banks = read_all_banks(select, read_location)
+    store.update(identity_of_bank_0(banks.get(0)), banks, walked=True)
+    return banks
+
+
+def refresh_bank(
+    select: Callable[[int, int], None],
+    read_location: Callable[[], int | None],
+    store: MemoryBankStore,
+    bank: int,
+) -> list[int | None] | None:
+    """Content of a bank, a static bank of a known unit comes from the store."""
+    if bank not in STATIC_BANKS:
+        return read_bank(select, read_location, bank)
+    identity = read_identity(select, read_location)
+    known = store.banks(identity)
+    if bank in known:
+        return known[bank]
+    content = read_bank(select, read_location, bank)
+    if content is not None:
+        store.update(identity, {bank: content})
+    return content
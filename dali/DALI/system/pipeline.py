@@ -0,0 +1,121 @@
+"""Pipelined transmission of forward frames."""
+
+import functools
+import logging
+import time
+
+import click
+from dali_interface import DaliFrame, DaliInterface
+
+from ..device.device_address import DeviceAddress
+from ..device.device_opcode import DeviceConfigureCommandOpcode, DeviceSpecialCommandOpcode
+from ..gear.gear_opcode import GearConfigureCommandOpcode, GearSpecialCommandOpcode
+from .constants import DaliFrameLength, DaliSettlingTime
+from .wrapper import DaliWrapper
+
+logger = logging.getLogger(__name__)
+
+
+def settling_time(frame: DaliFrame) -> float:
+    """Time the units need to process a frame before they accept the next one."""
+    if frame.length == DaliFrameLength.GEAR:
+        address_byte = frame.data >> 8
+        if address_byte == GearSpecialCommandOpcode.RANDOMISE:
+            return DaliSettlingTime.RANDOMISE.value
+        if (
+            (address_byte & 0x01)
+            and not 0xA0 <= address_byte < 0xFC
+            and (frame.data & 0xFF) == GearConfigureCommandOpcode.RESET
+        ):
+            return DaliSettlingTime.RESET.value
+    if frame.length == DaliFrameLength.DEVICE:
+        address_byte = frame.data >> 16
+        special = DeviceAddress("SPECIAL").byte
+        if address_byte == special and ((frame.data >> 8) & 0xFF) == DeviceSpecialCommandOpcode.RANDOMISE:
+            return DaliSettlingTime.RANDOMISE.value
+        if (
+            (address_byte & 0x01)
+            and not special <= address_byte < 0xFD
+            and (frame.data & 0xFFFF) == (0xFE00 | DeviceConfigureCommandOpcode.RESET)
+        ):
+            return DaliSettlingTime.RESET.value
+    return 0.0
+
+
+class DaliPipeline(DaliWrapper):
+    """Queue forward frames and only wait for their completion before a query.
+
+    The interface keeps the minimum settling time between frames, commands
+    that need processing time on the units are followed by an explicit pause.
+    Control gears and control devices settle independently, a pause after a
+    16 bit frame does not delay 24 bit frames and vice versa.
+    """
+
+    def __init__(self, dali: DaliInterface, depth: int = 8) -> None:
+        super().__init__(dali)
+        self.depth = depth
+        self.pending: DaliFrame | None = None
+        self.unconfirmed = 0
+        self.ready_at: dict[int, float] = {}
+        self.frames = 0
+
+    def wait_until_ready(self, length: int | None = None) -> None:
+        if length is None:
+            ready_at = max(self.ready_at.values(), default=0.0)
+        else:
+            ready_at = self.ready_at.get(length, 0.0)
+        delay = ready_at - time.monotonic()
+        if delay > 0:
+            logger.debug(f"settle for {delay:.3f} s")
+            time.sleep(delay)
+
+    def send_pending(self, block: bool) -> None:
+        if self.pending is None:
+            return
+        self.wait_until_ready(self.pending.length)
+        self.unconfirmed = self.unconfirmed + 1
+        if block or self.unconfirmed >= self.depth:
+            self.dali.transmit(self.pending, block=True)
+            self.unconfirmed = 0
+        else:
+            self.dali.transmit(self.pending)
+        self.pending = None
+
+    def sync(self) -> None:
+        """Wait until all queued frames are on the bus."""
+        self.send_pending(block=True)
+
+    def transmit(self, frame: DaliFrame, block: bool = False, is_query: bool = False) -> None:
+        self.send_pending(block=False)
+        self.pending = frame
+        self.frames = self.frames + (2 if frame.send_twice else 1)
+        settle = settling_time(frame)
+        if settle:
+            self.sync()
+            self.ready_at[frame.length] = time.monotonic() + settle
+
+    def query_reply(self, request: DaliFrame) -> DaliFrame:
+        self.sync()
+        self.wait_until_ready(request.length)
+        self.frames = self.frames + 1
+        return self.dali.query_reply(request)
+
+    def power(self, power: bool = False) -> None:
+        self.sync()
+        self.wait_until_ready()
+        self.dali.power(power)
+
+    def close(self) -> None:
+        self.sync()
+
+
+def pass_pipeline(f):
+    """Like click.pass_obj, but pass a pipeline wrapped around the interface."""
+
+    @click.pass_obj
+    @functools.wraps(f)
+    def new_func(dali: DaliInterface, *args, **kwargs):
+        with DaliPipeline(dali) as bus:
+            return f(bus, *args, **kwargs)
+
+    return new_func
@@ -0,0 +1,158 @@
+"""Remember unused short addresses so queries to them cost no reply timeout."""
+
+import json
+import os
+import re
+import time
+
+import click
+from dali_interface import DaliFrame, DaliInterface, DaliStatus
+
+from ..device.device_opcode import DeviceQueryCommandOpcode
+from ..gear.gear_opcode import GearQueryCommandOpcode
+from .bus_cache import DEVICE_INSTANCE_BYTE, changes_addresses
+from .checkpoint import save_json, state_directory
+from .constants import DaliFrameLength
+from .wrapper import DaliWrapper
+
+# absent short addresses are queried again after an hour
+PRESENCE_TTL = 60 * 60
+# queries every present unit answers, a timeout means the short address is not used
+GEAR_ANSWERED = (
+    GearQueryCommandOpcode.STATUS,
+    GearQueryCommandOpcode.GEAR_PRESENT,
+    GearQueryCommandOpcode.VERSION_NUMBER,
+    GearQueryCommandOpcode.DEVICE_TYPE,
+    GearQueryCommandOpcode.ACTUAL_LEVEL,
+    GearQueryCommandOpcode.RANDOM_ADDRESS_H,
+    GearQueryCommandOpcode.RANDOM_ADDRESS_M,
+    GearQueryCommandOpcode.RANDOM_ADDRESS_L,
+)
+DEVICE_ANSWERED = (
+    DeviceQueryCommandOpcode.QUERY_STATUS,
+    DeviceQueryCommandOpcode.QUERY_VERSION_NUMBER,
+    DeviceQueryCommandOpcode.QUERY_NUMBER_OF_INSTANCES,
+    DeviceQueryCommandOpcode.QUERY_RANDOM_ADDRESS_H,
+    DeviceQueryCommandOpcode.QUERY_RANDOM_ADDRESS_M,
+    DeviceQueryCommandOpcode.QUERY_RANDOM_ADDRESS_L,
+)
+
+
+def bus_key() -> str:
+    """Name of the bus of the running command, state files are kept per bus."""
+    context = click.get_current_context(silent=True)
+    return context.meta.get("dali.bus", "default") if context else "default"
+
+
+def default_presence_path(bus: str) -> str:
+    return os.path.join(state_directory(), f"presence-{re.sub(r'[^A-Za-z0-9_.-]', '_', bus)}.json")
+
+
+def addressed_unit(frame: DaliFrame) -> tuple[str, int, bool] | None:
+    """Unit kind and short address of a frame to a single short address, and if every unit answers it."""
+    if frame.length == DaliFrameLength.GEAR:
+        address_byte = frame.data >> 8
+        if address_byte < 0x80 and address_byte & 0x01:
+            return "gear", address_byte >> 1, frame.data & 0xFF in GEAR_ANSWERED
+    if frame.length == DaliFrameLength.DEVICE:
+        address_byte = frame.data >> 16
+        if address_byte < 0x80 and address_byte & 0x01:
+            device_query = (frame.data >> 8) & 0xFF == DEVICE_INSTANCE_BYTE
+            return "device", address_byte >> 1, device_query and frame.data & 0xFF in DEVICE_ANSWERED
+    return None
+
+
+def empty_bitmap() -> dict:
+    return {"present": 0, "absent": 0, "since": time.time()}
+
+
+def load_bitmaps(path: str) -> dict[str, dict]:
+    bitmaps = {kind: empty_bitmap() for kind in ("gear", "device")}
+    try:
+        with open(path, encoding="utf-8") as file:
+            content = json.load(file)
+        for kind, bitmap in bitmaps.items():
+            bitmap.update(
+                present=int(content[kind]["present"], 16),
+                absent=int(content[kind]["absent"], 16),
+                since=float(content[kind]["since"]),
+            )
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return bitmaps
+
+
+def save_bitmaps(path: str, bitmaps: dict[str, dict]) -> None:
+    content = {
+        kind: {
+            "present": f"{bitmap['present']:016X}",
+            "absent": f"{bitmap['absent']:016X}",
+            "since": bitmap["since"],
+        }
+        for kind, bitmap in bitmaps.items()
+    }
+    save_json(path, content)
+
+
+def forget_presence(kind: str) -> None:
+    """Forget the used short addresses of a unit kind on the bus of the running command.
+
+    Commands that move short addresses call it, so a later run that trusts
+    the presence file does not skip the new addresses, also when this run
+    did not trust it.
+    """
+    path = default_presence_path(bus_key())
+    if os.path.exists(path):
+        bitmaps = load_bitmaps(path)
+        bitmaps[kind] = empty_bitmap()
+        save_bitmaps(path, bitmaps)
+
+
+class DaliPresenceMemo(DaliWrapper):
+    """Skip queries to short addresses that are known to be absent.
+
+    Presence and absence are kept as bitmaps of the 64 short addresses per
+    unit kind and bus. Any reply marks a unit present, a timeout of a query
+    every unit answers marks it absent. Frames that program short addresses,
+    randomise or reset forget the bitmaps of that unit kind, and absent
+    addresses are queried again once the bitmap is older than PRESENCE_TTL.
+    """
+
+    def __init__(self, dali: DaliInterface, path: str) -> None:
+        super().__init__(dali)
+        self.path = path
+        self.bitmaps = load_bitmaps(path)
+
+    def save(self) -> None:
+        save_bitmaps(self.path, self.bitmaps)
+
+    def forget(self, kind: str) -> None:
+        self.bitmaps[kind] = empty_bitmap()
+
+    def absent(self, kind: str, short_address: int) -> bool:
+        bitmap = self.bitmaps[kind]
+        if time.time() - bitmap["since"] > PRESENCE_TTL:
+            bitmap.update(absent=0, since=time.time())
+        return bool(bitmap["absent"] >> short_address & 1)
+
+    def transmit(self, frame: DaliFrame, block: bool = False, is_query: bool = False) -> None:
+        prefix = changes_addresses(frame)
+        if prefix is not None:
+            self.forget("gear" if prefix == "G" else "device")
+        self.dali.transmit(frame, block=block)
+
+    def query_reply(self, request: DaliFrame) -> DaliFrame:
+        unit = addressed_unit(request)
+        if unit is None:
+            return self.dali.query_reply(request)
+        kind, short_address, answered = unit
+        if self.absent(kind, short_address):
+            return DaliFrame(status=DaliStatus.TIMEOUT)
+        reply = self.dali.query_reply(request)
+        bitmap = self.bitmaps[kind]
+        if reply.status != DaliStatus.TIMEOUT:
+            bitmap["present"] = bitmap["present"] | 1 << short_address
+        elif answered:
+            bitmap["present"] = bitmap["present"] & ~(1 << short_address)
+            bitmap["absent"] = bitmap["absent"] | 1 << short_address
+        return reply
@@ -0,0 +1,108 @@
+"""Calibrate the reply timeout of an adapter from the latency of its replies."""
+
+import json
+import os
+import queue
+import re
+import time
+
+from dali_interface import DaliFrame, DaliInterface, DaliStatus
+
+from .checkpoint import save_json, state_directory
+from .constants import DaliFrameLength, DaliTimeout
+from .wrapper import DaliWrapper
+
+# a backward frame ends at most 22 ms after the forward frame, IEC 62386-101:2022 8.1.2
+MINIMUM_TIMEOUT = 0.022
+CALIBRATION_SAMPLES = 8
+SAFETY_FACTOR = 1.5
+SAFETY_MARGIN = 0.005
+
+
+def default_timeout_path() -> str:
+    return os.path.join(state_directory(), "reply-timeouts.json")
+
+
+def calibrated_timeout(latency: float) -> float:
+    """Timeout for the slowest reply seen, with a safety margin and never above the default."""
+    return min(DaliTimeout.DEFAULT.value, max(MINIMUM_TIMEOUT, latency * SAFETY_FACTOR + SAFETY_MARGIN))
+
+
+def drain_late_replies(dali: DaliInterface) -> int:
+    """Empty the receive queue of the adapter and count the backward frames that came after their deadline."""
+    late = 0
+    while not dali.queue.empty():
+        if dali.queue.get_nowait().length == DaliFrameLength.BACKWARD:
+            late += 1
+    return late
+
+
+def query_within(dali: DaliInterface, request: DaliFrame, timeout: float) -> DaliFrame:
+    """Transmit a query and read the receive queue of the adapter until the timeout, for adapters without one."""
+    drain_late_replies(dali)
+    dali.transmit(request, block=False, is_query=True)
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            frame = dali.queue.get(timeout=deadline - time.perf_counter())
+        except (queue.Empty, ValueError):
+            break
+        if frame.status != DaliStatus.LOOPBACK:
+            return frame
+    return DaliFrame(status=DaliStatus.TIMEOUT, message="no reply within the calibrated timeout")
+
+
+class DaliReplyTimeout(DaliWrapper):
+    """Measure the reply latency of an adapter and use a tight reply timeout once it is known.
+
+    The slowest reply over all runs with enough replies is recorded per
+    adapter, a reply found in the receive queue after its deadline raises
+    the record above the timeout it missed. Later runs hand the calibrated
+    timeout to adapters with a reply_timeout attribute, other adapters get
+    the query transmitted and their receive queue read up to the calibrated
+    deadline, so a query to an absent unit no longer costs the default.
+    """
+
+    def __init__(self, dali: DaliInterface, path: str, adapter: str) -> None:
+        super().__init__(dali)
+        self.path = path
+        self.adapter = re.sub(r"[^A-Za-z0-9_.:/-]", "_", adapter)
+        self.latencies: list[float] = []
+        self.late_replies = 0
+        self.records: dict[str, dict[str, float]] = {}
+        try:
+            with open(path, encoding="utf-8") as file:
+                self.records = json.load(file)
+        except (OSError, ValueError):
+            self.records = {}
+        record = self.records.get(self.adapter)
+        self.timeout: float | None = None
+        if record and hasattr(dali, "reply_timeout"):
+            dali.reply_timeout = record["timeout"]
+        elif record:
+            self.timeout = record["timeout"]
+
+    def query_reply(self, request: DaliFrame) -> DaliFrame:
+        start = self.now()
+        if self.timeout is None:
+            reply = self.dali.query_reply(request)
+        else:
+            self.late_replies += drain_late_replies(self.dali)
+            reply = query_within(self.dali, request, self.timeout)
+        if reply.status != DaliStatus.TIMEOUT:
+            self.latencies.append(self.now() - start)
+        return reply
+
+    def save(self) -> None:
+        """Record the calibration of this run if it saw enough replies or a late one."""
+        if self.timeout is not None:
+            self.late_replies += drain_late_replies(self.dali)
+        if len(self.latencies) < CALIBRATION_SAMPLES and not self.late_replies:
+            return
+        latencies = self.latencies + [self.records.get(self.adapter, {}).get("latency", 0.0)]
+        if self.late_replies and self.timeout is not None:
+            # the reply came later than the timeout that was in use
+            latencies.append(self.timeout)
+        latency = max(latencies)
+        self.records[self.adapter] = {"latency": round(latency, 4), "timeout": round(calibrated_timeout(latency), 4)}
+        save_json(self.path, self.records)
@@ -0,0 +1,91 @@
+"""Search for the lowest random address of the units in initialisation state."""
+
+from collections.abc import Callable
+
+from dali_interface import DaliFrame, DaliInterface
+
+from ..device.device_opcode import DeviceConfigureCommandOpcode, DeviceSpecialCommandOpcode
+from ..gear.gear_opcode import GearConfigureCommandOpcode, GearSpecialCommandOpcode
+from .constants import DaliFrameLength, DaliMax
+from .wrapper import DaliWrapper
+
+GEAR_SEARCH_OPCODES = (
+    GearSpecialCommandOpcode.SEARCHADDRH,
+    GearSpecialCommandOpcode.SEARCHADDRM,
+    GearSpecialCommandOpcode.SEARCHADDRL,
+)
+GEAR_INITIALISATION_OPCODES = (GearSpecialCommandOpcode.INITIALISE, GearSpecialCommandOpcode.TERMINATE)
+DEVICE_SEARCH_OPCODES = (
+    DeviceSpecialCommandOpcode.SEARCHADDRH,
+    DeviceSpecialCommandOpcode.SEARCHADDRM,
+    DeviceSpecialCommandOpcode.SEARCHADDRL,
+)
+DEVICE_INITIALISATION_OPCODES = (DeviceSpecialCommandOpcode.INITIALISE, DeviceSpecialCommandOpcode.TERMINATE)
+
+
+def bounded_search(set_search_address: Callable[[int], None], compare: Callable[[], bool], low: int = 0) -> int | None:
+    """Bisect between low and the largest random address.
+
+    One COMPARE at the largest address tells whether any unit is left.
+    Withdrawn units no longer answer COMPARE and every hit is the minimum
+    of the remaining units, so the next search can start above the last hit.
+    """
+    high = DaliMax.RANDOM_ADR - 1
+    if low > high:
+        return None
+    set_search_address(high)
+    if not compare():
+        return None
+    while low < high:
+        middle = (low + high) // 2
+        set_search_address(middle)
+        if compare():
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+class SearchAddressShadow(DaliWrapper):
+    """Drop SEARCHADDRH, SEARCHADDRM and SEARCHADDRL frames that would not change the search address.
+
+    A shadow of the search address bytes is kept for control gears and for
+    control devices. INITIALISE, TERMINATE and RESET make it unknown again.
+    """
+
+    def __init__(self, dali: DaliInterface) -> None:
+        super().__init__(dali)
+        self.shadow: dict[tuple[int, int], int] = {}
+
+    def classify(self, frame: DaliFrame) -> tuple[int | None, bool]:
+        """Search address opcode of the frame and whether the frame invalidates the shadow."""
+        opcode = frame.data & 0xFF
+        if frame.length == DaliFrameLength.GEAR:
+            address_byte = frame.data >> 8
+            if address_byte in GEAR_SEARCH_OPCODES:
+                return address_byte, False
+            if address_byte in GEAR_INITIALISATION_OPCODES:
+                return None, True
+            addressed = address_byte & 0x01 and address_byte < 0xA0
+            return None, bool(addressed) and opcode == GearConfigureCommandOpcode.RESET
+        if frame.length == DaliFrameLength.DEVICE:
+            address_byte = frame.data >> 16
+            instance_byte = (frame.data >> 8) & 0xFF
+            if address_byte == 0xC1 and instance_byte in DEVICE_SEARCH_OPCODES:
+                return instance_byte, False
+            if address_byte == 0xC1:
+                return None, instance_byte in DEVICE_INITIALISATION_OPCODES
+            addressed = address_byte & 0x01 and instance_byte == 0xFE
+            return None, bool(addressed) and opcode == DeviceConfigureCommandOpcode.RESET
+        return None, False
+
+    def transmit(self, frame: DaliFrame, block: bool = False, is_query: bool = False) -> None:
+        opcode, invalidate = self.classify(frame)
+        if opcode is not None:
+            key = (frame.length, opcode)
+            if self.shadow.get(key) == frame.data & 0xFF:
+                return
+            self.shadow[key] = frame.data & 0xFF
+        elif invalidate:
+            self.shadow = {key: value for key, value in self.shadow.items() if key[0] != frame.length}
+        self.dali.transmit(frame, block=block)
@@ -0,0 +1,105 @@
+"""Interactive shell that keeps the DALI interface open between commands."""
+
+import os
+import shlex
+import sys
+
+import click
+
+from .batch import execute
+from .constants import DaliMax
+
+try:
+    import readline
+except ImportError:  # not available on all platforms
+    readline = None
+
+PROMPT = "dali> "
+HISTORY_LENGTH = 1000
+ADDRESSES = ["BC", "BCU"] + [f"G{group}" for group in range(DaliMax.GEAR_GROUP)] + [str(a) for a in range(DaliMax.ADR)]
+SHELL_COMMANDS = ["exit", "help", "quit"]
+
+
+def complete_words(ctx: click.Context, words: list[str], incomplete: str) -> list[str]:
+    """Candidates for the word that follows words in a command line."""
+    if words and words[-1] == "--adr":
+        return [address for address in ADDRESSES if address.startswith(incomplete.upper())]
+    root = ctx.find_root()
+    command: click.Command = root.command
+    for word in words:
+        if word.startswith("-") or not isinstance(command, click.Group):
+            continue
+        subcommand = command.get_command(root, word)
+        if subcommand is None:
+            return []
+        command = subcommand
+    if incomplete.startswith("-"):
+        options = [option for param in command.params if isinstance(param, click.Option) for option in param.opts]
+        return sorted(option for option in options + ["--help"] if option.startswith(incomplete))
+    if isinstance(command, click.Group):
+        names = command.list_commands(root) + (SHELL_COMMANDS if not words else [])
+        return sorted(name for name in names if name.startswith(incomplete))
+    return []
+
+
+def setup_readline(ctx: click.Context, history: str) -> None:
+    def complete(text: str, state: int) -> str | None:
+        try:
+            words = shlex.split(readline.get_line_buffer()[: readline.get_begidx()])
+        except ValueError:
+            return None
+        candidates = complete_words(ctx, words, text)
+        return candidates[state] + " " if state < len(candidates) else None
+
+    readline.set_completer(complete)
+    readline.set_completer_delims(" \t\n")
+    if "libedit" in (readline.__doc__ or ""):
+        readline.parse_and_bind("bind ^I rl_complete")
+    else:
+        readline.parse_and_bind("tab: complete")
+    readline.set_history_length(HISTORY_LENGTH)
+    if os.path.exists(history):
+        readline.read_history_file(history)
+    ctx.call_on_close(lambda: readline.write_history_file(history))
+
+
+@click.command(name="shell", help="Interactive shell, keeps the DALI interface open between commands.")
+@click.option(
+    "--history",
+    envvar="DALI_HISTORY",
+    show_envvar=True,
+    type=click.Path(dir_okay=False),
+    default=os.path.expanduser("~/.dali_history"),
+    show_default=True,
+    help="File to keep the command history.",
+)
+@click.pass_context
+def shell(ctx: click.Context, history: str) -> None:
+    interactive = sys.stdin.isatty()
+    if interactive and readline is not None:
+        setup_readline(ctx, history)
+    while True:
+        try:
+            line = input(PROMPT if interactive else "")
+        except EOFError:
+            break
+        except KeyboardInterrupt:
+            click.echo()
+            continue
+        try:
+            args = shlex.split(line, comments=True)
+            if args and args[0] in ("exit", "quit"):
+                break
+            if args and args[0] == "help":
+                click.echo(ctx.find_root().get_help())
+            elif args and args[0] == "shell":
+                raise click.UsageError("already running a shell.")
+            else:
+                execute(ctx, args)
+        except click.ClickException as error:
+            click.echo(f"Error: {error.format_message()}", err=True)
+        except (click.Abort, KeyboardInterrupt):
+            # an interrupted command returns to the prompt
+            click.echo()
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            click.echo(f"Error: {type(error).__name__}: {error}", err=True)
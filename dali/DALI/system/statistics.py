@@ -0,0 +1,173 @@
+"""Count frames and measure their latency per opcode."""
+
+import json
+from enum import IntEnum
+
+import click
+from dali_interface import DaliFrame, DaliInterface, DaliStatus
+
+from ..device.device_opcode import (
+    DeviceConfigureCommandOpcode,
+    DeviceInstanceConfigureOpcode,
+    DeviceInstanceQueryOpcode,
+    DeviceQueryCommandOpcode,
+    DeviceSpecialCommandOpcode,
+)
+from ..gear.gear_opcode import (
+    GearConfigureCommandOpcode,
+    GearLevelCommandOpcode,
+    GearQueryCommandOpcode,
+    GearSpecialCommandOpcode,
+)
+from .constants import DaliFrameLength
+from .wrapper import DaliWrapper
+
+LATENCY_BUCKETS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0)
+
+GEAR_OPCODE_RANGES = (
+    (GearLevelCommandOpcode.GOTO_SCENE, 0x10),
+    (GearConfigureCommandOpcode.SET_SCENE, 0x10),
+    (GearConfigureCommandOpcode.REMOVE_SCENE, 0x10),
+    (GearConfigureCommandOpcode.ADD_GROUP, 0x10),
+    (GearConfigureCommandOpcode.REMOVE_GROUP, 0x10),
+    (GearQueryCommandOpcode.SCENE_LEVEL, 0x10),
+)
+
+
+def opcode_name(value: int, opcodes: tuple[type[IntEnum], ...]) -> str:
+    for opcode in opcodes:
+        try:
+            return opcode(value).name
+        except ValueError:
+            pass
+    return f"0x{value:02X}"
+
+
+def frame_name(frame: DaliFrame) -> str:
+    """Name of the command carried by a forward frame."""
+    if frame.length == DaliFrameLength.GEAR:
+        address_byte = (frame.data >> 8) & 0xFF
+        opcode = frame.data & 0xFF
+        if 0xA0 <= address_byte < 0xFC:
+            return opcode_name(address_byte, (GearSpecialCommandOpcode,))
+        if not address_byte & 0x01:
+            return "DAPC"
+        for first, count in GEAR_OPCODE_RANGES:
+            if first <= opcode < first + count:
+                return first.name
+        return opcode_name(opcode, (GearLevelCommandOpcode, GearConfigureCommandOpcode, GearQueryCommandOpcode))
+    if frame.length == DaliFrameLength.DEVICE:
+        address_byte = (frame.data >> 16) & 0xFF
+        instance_byte = (frame.data >> 8) & 0xFF
+        opcode = frame.data & 0xFF
+        if address_byte == 0xC1:
+            return opcode_name(instance_byte, (DeviceSpecialCommandOpcode,))
+        if 0xC1 < address_byte < 0xFD:
+            return opcode_name(address_byte, (DeviceSpecialCommandOpcode,))
+        if instance_byte == 0xFE:
+            return opcode_name(opcode, (DeviceConfigureCommandOpcode, DeviceQueryCommandOpcode))
+        return opcode_name(opcode, (DeviceInstanceConfigureOpcode, DeviceInstanceQueryOpcode))
+    return f"{frame.length} bit frame"
+
+
+class OpcodeStatistics:
+    """Counters and latency histogram for one opcode."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.replies = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add(self, latency: float) -> None:
+        self.count = self.count + 1
+        self.total = self.total + latency
+        self.maximum = max(self.maximum, latency)
+        bucket = 0
+        while bucket < len(LATENCY_BUCKETS) and latency >= LATENCY_BUCKETS[bucket]:
+            bucket = bucket + 1
+        self.histogram[bucket] = self.histogram[bucket] + 1
+
+    def as_dict(self) -> dict:
+        labels = [f"<{bound * 1000:g}ms" for bound in LATENCY_BUCKETS] + [f">={LATENCY_BUCKETS[-1] * 1000:g}ms"]
+        return {
+            "count": self.count,
+            "replies": self.replies,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "total_s": round(self.total, 6),
+            "mean_s": round(self.total / self.count, 6) if self.count else 0.0,
+            "max_s": round(self.maximum, 6),
+            "histogram": dict(zip(labels, self.histogram)),
+        }
+
+
+class DaliStatistics(DaliWrapper):
+    """Record count, latency and outcome of every frame passed to the interface."""
+
+    def __init__(self, dali: DaliInterface) -> None:
+        super().__init__(dali)
+        self.opcodes: dict[str, OpcodeStatistics] = {}
+
+    def record(self, frame: DaliFrame, start: float) -> OpcodeStatistics:
+        statistics = self.opcodes.setdefault(frame_name(frame), OpcodeStatistics())
+        statistics.add(self.now() - start)
+        return statistics
+
+    def transmit(self, frame: DaliFrame, block: bool = False, is_query: bool = False) -> None:
+        start = self.now()
+        self.dali.transmit(frame, block=block)
+        self.record(frame, start)
+
+    def query_reply(self, request: DaliFrame) -> DaliFrame:
+        start = self.now()
+        reply = self.dali.query_reply(request)
+        statistics = self.record(request, start)
+        if reply.length == DaliFrameLength.BACKWARD:
+            statistics.replies = statistics.replies + 1
+        elif reply.status == DaliStatus.TIMEOUT:
+            statistics.timeouts = statistics.timeouts + 1
+        else:
+            statistics.errors = statistics.errors + 1
+        return reply
+
+    def summary(self) -> OpcodeStatistics:
+        total = OpcodeStatistics()
+        for statistics in self.opcodes.values():
+            total.count = total.count + statistics.count
+            total.replies = total.replies + statistics.replies
+            total.timeouts = total.timeouts + statistics.timeouts
+            total.errors = total.errors + statistics.errors
+            total.total = total.total + statistics.total
+            total.maximum = max(total.maximum, statistics.maximum)
+            total.histogram = [a + b for a, b in zip(total.histogram, statistics.histogram)]
+        return total
+
+    def as_json(self) -> str:
+        return json.dumps(
+            {
+                "opcodes": {name: statistics.as_dict() for name, statistics in sorted(self.opcodes.items())},
+                "total": self.summary().as_dict(),
+            },
+            indent=2,
+        )
+
+    def show(self) -> None:
+        by_time = sorted(self.opcodes.items(), key=lambda item: item[1].total, reverse=True)
+        click.echo(
+            f"{'opcode':<32} {'count':>6} {'reply':>6} {'timeout':>7} {'error':>5} "
+            f"{'total s':>8} {'mean ms':>8} {'max ms':>8}",
+            err=True,
+        )
+        for name, statistics in by_time + [("TOTAL", self.summary())]:
+            mean = statistics.total / statistics.count if statistics.count else 0.0
+            click.echo(
+                f"{name:<32} {statistics.count:6} {statistics.replies:6} {statistics.timeouts:7} "
+                f"{statistics.errors:5} {statistics.total:8.3f} {mean * 1000:8.1f} {statistics.maximum * 1000:8.1f}",
+                err=True,
+            )
+        histogram = self.summary().as_dict()["histogram"]
+        click.echo("latency: " + " ".join(f"{label}: {count}" for label, count in histogram.items()), err=True)
@@ -0,0 +1,13 @@
+"""Runtime type checks, compiled out when DALI_FAST is set."""
+
+import os
+
+FAST_MODE = os.environ.get("DALI_FAST", "") not in ("", "0")
+
+if FAST_MODE:
+
+    def typechecked(target):
+        return target
+
+else:
+    from typeguard import typechecked  # pylint: disable=unused-import
@@ -0,0 +1,46 @@
+"""Base classes for interfaces without receive thread and for wrappers around another interface."""
+
+import time
+
+from dali_interface import DaliFrame, DaliInterface
+
+
+class DaliLocalInterface(DaliInterface):
+    """Interface that needs no receive thread, used as its own context manager."""
+
+    def __init__(self) -> None:
+        super().__init__(start_receive=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, traceback):
+        self.close()
+
+    def close(self) -> None:
+        pass
+
+
+class DaliWrapper(DaliLocalInterface):
+    """Pass all frames on to another interface, subclasses change what passes."""
+
+    def __init__(self, dali: DaliInterface) -> None:
+        super().__init__()
+        self.dali = dali
+
+    def now(self) -> float:
+        """Virtual clock of a simulated bus below the wrappers, else the performance counter."""
+        dali = self.dali
+        while isinstance(dali, DaliWrapper):
+            dali = dali.dali
+        clock = getattr(dali, "clock", None)
+        return time.perf_counter() if clock is None else clock
+
+    def transmit(self, frame: DaliFrame, block: bool = False, is_query: bool = False) -> None:
+        self.dali.transmit(frame, block=block)
+
+    def query_reply(self, request: DaliFrame) -> DaliFrame:
+        return self.dali.query_reply(request)
+
+    def power(self, power: bool = False) -> None:
+        self.dali.power(power)
@@ -4,24 +4,145 @@ import logging
 
 import click
 
-from .DALI.device import device_configure as device_configure_cmd
-from .DALI.device import device_dump as device_dump_cmd
-from .DALI.device import device_enumerate as device_enumerate_cmd
-from .DALI.device import device_query as device_query_cmd
-from .DALI.device import device_special as device_special_cmd
-from .DALI.gear import gear_clear as gear_clear_cmd
-from .DALI.gear import gear_configure as gear_conf_cmd
-from .DALI.gear import gear_dump as gear_dump_cmd
-from .DALI.gear import gear_enumerate as gear_enumerate_cmd
-from .DALI.gear import gear_level as level_cmd
-from .DALI.gear import gear_list as gear_list_cmd
-from .DALI.gear import gear_query as gear_query_cmd
-from .DALI.gear import gear_special as gear_special_cmd
-from .DALI.gear import gear_summary as gear_summary_cmd
 from .DALI.system.connection import dali_connection
+from .DALI.system.daemon import default_socket_path
+from .DALI.system.lazy_group import LazyGroup
 
+COMMANDS = {
+    "off": "dali.DALI.gear.gear_level:off",
+    "up": "dali.DALI.gear.gear_level:up",
+    "down": "dali.DALI.gear.gear_level:down",
+    "max": "dali.DALI.gear.gear_level:max_level",
+    "min": "dali.DALI.gear.gear_level:min_level",
+    "dapc": "dali.DALI.gear.gear_level:dapc",
+    "goto": "dali.DALI.gear.gear_level:goto",
+    "daemon": "dali.DALI.system.daemon:daemon",
+    "enum": "dali.DALI.system.bus_enumerate:enumerate_bus",
+    "run": "dali.DALI.system.batch:run",
+    "shell": "dali.DALI.system.shell:shell",
+}
 
-@click.group(name="dali")
+GEAR_COMMANDS = {
+    "summary": "dali.DALI.gear.gear_summary:summary",
+    "list": "dali.DALI.gear.gear_list:gear_list",
+    "inventory": "dali.DALI.gear.gear_inventory:inventory",
+    "meter": "dali.DALI.gear.gear_meter:meter",
+    "dump": "dali.DALI.gear.gear_dump:dump",
+    "clear": "dali.DALI.gear.gear_clear:clear",
+    "reset": "dali.DALI.gear.gear_configure:reset",
+    "actual": "dali.DALI.gear.gear_configure:actual",
+    "op": "dali.DALI.gear.gear_configure:op",
+    "reset_mem": "dali.DALI.gear.gear_configure:reset_mem",
+    "id": "dali.DALI.gear.gear_configure:identify",
+    "max": "dali.DALI.gear.gear_configure:max_level",
+    "min": "dali.DALI.gear.gear_configure:min_level",
+    "fail": "dali.DALI.gear.gear_configure:fail",
+    "on": "dali.DALI.gear.gear_configure:on",
+    "time": "dali.DALI.gear.gear_configure:time",
+    "rate": "dali.DALI.gear.gear_configure:rate",
+    "ext": "dali.DALI.gear.gear_configure:ext",
+    "scene": "dali.DALI.gear.gear_configure:scene",
+    "remove": "dali.DALI.gear.gear_configure:remove",
+    "add": "dali.DALI.gear.gear_configure:add",
+    "ungroup": "dali.DALI.gear.gear_configure:ungroup",
+    "short": "dali.DALI.gear.gear_configure:short",
+    "enable": "dali.DALI.gear.gear_configure:enable",
+    "enum": "dali.DALI.gear.gear_enumerate:gear_enumerate",
+    "term": "dali.DALI.gear.gear_special:term",
+    "dtr0": "dali.DALI.gear.gear_special:dtr0",
+    "init": "dali.DALI.gear.gear_special:init",
+    "rand": "dali.DALI.gear.gear_special:rand",
+    "comp": "dali.DALI.gear.gear_special:comp",
+    "withdraw": "dali.DALI.gear.gear_special:withdraw",
+    "ping": "dali.DALI.gear.gear_special:ping",
+    "search": "dali.DALI.gear.gear_special:search",
+    "program": "dali.DALI.gear.gear_special:program",
+    "verify": "dali.DALI.gear.gear_special:verify",
+    "dt": "dali.DALI.gear.gear_special:dt",
+    "dtr1": "dali.DALI.gear.gear_special:dtr1",
+    "dtr2": "dali.DALI.gear.gear_special:dtr2",
+    "write": "dali.DALI.gear.gear_special:write",
+    "noreply": "dali.DALI.gear.gear_special:noreply",
+}
+
+GEAR_QUERY_COMMANDS = {
+    "status": "dali.DALI.gear.gear_query:status",
+    "present": "dali.DALI.gear.gear_query:present",
+    "failure": "dali.DALI.gear.gear_query:failure",
+    "power": "dali.DALI.gear.gear_query:power",
+    "limit": "dali.DALI.gear.gear_query:limit",
+    "reset": "dali.DALI.gear.gear_query:reset",
+    "missing": "dali.DALI.gear.gear_query:missing",
+    "version": "dali.DALI.gear.gear_query:version",
+    "dtr0": "dali.DALI.gear.gear_query:dtr0",
+    "dt": "dali.DALI.gear.gear_query:device_type",
+    "next": "dali.DALI.gear.gear_query:next_device_type",
+    "phm": "dali.DALI.gear.gear_query:phm",
+    "power_cycle": "dali.DALI.gear.gear_query:power_cycles",
+    "dtr1": "dali.DALI.gear.gear_query:dtr1",
+    "dtr2": "dali.DALI.gear.gear_query:dtr2",
+    "op": "dali.DALI.gear.gear_query:op_mode",
+    "light": "dali.DALI.gear.gear_query:light_source",
+    "actual": "dali.DALI.gear.gear_query:actual_level",
+    "min": "dali.DALI.gear.gear_query:min_level",
+    "max": "dali.DALI.gear.gear_query:max_level",
+    "on": "dali.DALI.gear.gear_query:power_level",
+    "fail": "dali.DALI.gear.gear_query:failure_level",
+    "fade": "dali.DALI.gear.gear_query:fade",
+    "short": "dali.DALI.gear.gear_special:short",
+    "groups": "dali.DALI.gear.gear_query:groups",
+}
+
+DEVICE_COMMANDS = {
+    "dump": "dali.DALI.device.device_dump:dump",
+    "dtr0": "dali.DALI.device.device_special:dtr0",
+    "dtr1": "dali.DALI.device.device_special:dtr1",
+    "dtr2": "dali.DALI.device.device_special:dtr2",
+    "init": "dali.DALI.device.device_special:init",
+    "rand": "dali.DALI.device.device_special:rand",
+    "testframe": "dali.DALI.device.device_special:testframe",
+    "add": "dali.DALI.device.device_configure:add",
+    "start": "dali.DALI.device.device_configure:start",
+    "stop": "dali.DALI.device.device_configure:stop",
+    "reset": "dali.DALI.device.device_configure:reset",
+    "ungroup": "dali.DALI.device.device_configure:ungroup",
+    "short": "dali.DALI.device.device_configure:short",
+    "scheme": "dali.DALI.device.device_configure:scheme",
+    "primary": "dali.DALI.device.device_configure:primary",
+    "application": "dali.DALI.device.device_configure:application",
+    "cycle": "dali.DALI.device.device_configure:cycle",
+    "enum": "dali.DALI.device.device_enumerate:device_enumerate",
+    "list": "dali.DALI.device.device_list:device_list",
+}
+
+DEVICE_QUERY_COMMANDS = {
+    "capabilities": "dali.DALI.device.device_query:capabilities",
+    "dtr0": "dali.DALI.device.device_query:dtr0",
+    "dtr1": "dali.DALI.device.device_query:dtr1",
+    "dtr2": "dali.DALI.device.device_query:dtr2",
+    "extended": "dali.DALI.device.device_query:extended",
+    "groups": "dali.DALI.device.device_query:groups",
+    "quiescent": "dali.DALI.device.device_query:quiescent",
+    "status": "dali.DALI.device.device_query:status",
+    "short": "dali.DALI.device.device_query:short",
+    "version": "dali.DALI.device.device_query:version",
+    "random": "dali.DALI.device.device_query:random",
+    "reset": "dali.DALI.device.device_query:reset",
+    "scheme": "dali.DALI.device.device_query:scheme",
+    "type": "dali.DALI.device.device_query:itype",
+    "resolution": "dali.DALI.device.device_query:resolution",
+    "error": "dali.DALI.device.device_query:error",
+    "istatus": "dali.DALI.device.device_query:istatus",
+    "enabled": "dali.DALI.device.device_query:enabled",
+    "primary": "dali.DALI.device.device_query:primary",
+    "input": "dali.DALI.device.device_query:input_value",
+    "application": "dali.DALI.device.device_query:application",
+    "cycle": "dali.DALI.device.device_query:cycle",
+    "missing": "dali.DALI.device.device_query:missing",
+}
+
+
+@click.group(name="dali", cls=LazyGroup, lazy_subcommands=COMMANDS)
 @click.version_option("0.2.8")
 @click.option(
     "--serial-port",
@@ -53,10 +174,71 @@ from .DALI.system.connection import dali_connection
     hidden=True,
     is_flag=True,
 )
+@click.option(
+    "--simulate",
+    metavar="GEARS[:DEVICES]",
+    envvar="DALI_SIMULATE",
+    show_envvar=True,
+    help="Simulated DALI bus with virtual control gears and control devices.",
+)
+@click.option(
+    "--daemon",
+    help="Forward DALI communication to a running dali daemon.",
+    envvar="DALI_DAEMON",
+    show_envvar=True,
+    is_flag=True,
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    envvar="DALI_SOCKET",
+    show_envvar=True,
+    type=click.Path(),
+    default=default_socket_path(),
+    show_default=True,
+    help="Unix socket of the dali daemon.",
+)
+@click.option(
+    "--cache",
+    help="Answer queries for static facts like device type and version from a cache on disk.",
+    envvar="DALI_CACHE",
+    show_envvar=True,
+    is_flag=True,
+)
+@click.option(
+    "--trust-presence",
+    help="Skip queries to short addresses a previous reply timeout showed to be unused.",
+    envvar="DALI_TRUST_PRESENCE",
+    show_envvar=True,
+    is_flag=True,
+)
+@click.option(
+    "--calibrated-timeout",
+    help="Learn the reply latency of the adapter and wait only that long, with a margin, for replies.",
+    envvar="DALI_CALIBRATED_TIMEOUT",
+    show_envvar=True,
+    is_flag=True,
+)
+@click.option("--stats", is_flag=True, help="Show frame statistics per opcode at exit.")
+@click.option("--stats-json", type=click.File("w"), help="Write frame statistics per opcode as JSON to file.")
 @click.option("--debug", is_flag=True, help="Enable debug logging.")
 @click.pass_context
 def cli(
-    ctx, serial_port, hid, mock, debug, on, off
+    ctx,
+    serial_port,
+    hid,
+    mock,
+    simulate,
+    daemon,
+    socket_path,
+    cache,
+    trust_presence,
+    calibrated_timeout,
+    stats,
+    stats_json,
+    debug,
+    on,
+    off,
 ):  # pylint: disable=locally-disabled, too-many-arguments, too-many-positional-arguments
     """
     Command line interface for DALI systems.
@@ -65,175 +247,83 @@ def cli(
     if debug:
         logging.basicConfig(level=logging.DEBUG)
 
-    dali_interface = "None"
-    if serial_port and not hid and not mock:
-        dali_interface = "Serial"
+    selected = [
+        name
+        for name, choice in (
+            ("Serial", serial_port),
+            ("Usb", hid),
+            ("Mock", mock),
+            ("Simulation", simulate),
+            ("Daemon", daemon),
+        )
+        if choice
+    ]
+    dali_interface = selected[0] if len(selected) == 1 else "None"
+    ctx.obj = ctx.with_resource(dali_connection(dali_interface, serial_port, socket_path, simulate))
+    detail = {"Serial": serial_port, "Daemon": socket_path, "Simulation": simulate}.get(dali_interface)
+    bus = f"{dali_interface}-{detail}" if detail else dali_interface
+    ctx.meta["dali.bus"] = bus
+    if calibrated_timeout:
+        from .DALI.system.reply_timeout import (  # pylint: disable=import-outside-toplevel
+            DaliReplyTimeout,
+            default_timeout_path,
+        )
+
+        reply_timeout = DaliReplyTimeout(ctx.obj, default_timeout_path(), bus)
+        ctx.call_on_close(reply_timeout.save)
+        ctx.obj = reply_timeout
+    if stats or stats_json:
+        from .DALI.system.statistics import DaliStatistics  # pylint: disable=import-outside-toplevel
 
-    if hid and not serial_port and not mock:
-        dali_interface = "Usb"
+        statistics = DaliStatistics(ctx.obj)
+        if stats:
+            ctx.call_on_close(statistics.show)
+        if stats_json:
+            ctx.call_on_close(lambda: stats_json.write(statistics.as_json() + "\n"))
+        ctx.obj = statistics
+    if trust_presence:
+        from .DALI.system.presence import (  # pylint: disable=import-outside-toplevel
+            DaliPresenceMemo,
+            default_presence_path,
+        )
 
-    if mock and not serial_port and not hid:
-        dali_interface = "Mock"
-    ctx.obj = ctx.with_resource(dali_connection(dali_interface, serial_port))
+        presence_memo = DaliPresenceMemo(ctx.obj, default_presence_path(bus))
+        ctx.call_on_close(presence_memo.save)
+        ctx.obj = presence_memo
+    if cache:
+        from .DALI.system.bus_cache import DaliBusCache, default_cache_path  # pylint: disable=import-outside-toplevel
 
-    if hid and on:
+        bus_cache = DaliBusCache(ctx.obj, default_cache_path(bus))
+        ctx.call_on_close(bus_cache.save)
+        ctx.obj = bus_cache
+
+    if (hid or daemon) and on:
         logging.debug("Enable power supply")
         ctx.obj.power(True)
-    if hid and off:
+    if (hid or daemon) and off:
         logging.debug("Disable power supply")
         ctx.obj.power(False)
 
 
-cli.add_command(level_cmd.off)
-cli.add_command(level_cmd.up)
-cli.add_command(level_cmd.down)
-cli.add_command(level_cmd.max_level)
-cli.add_command(level_cmd.min_level)
-cli.add_command(level_cmd.dapc)
-cli.add_command(level_cmd.goto)
-
-
 #
 # ---- gear commands
-@cli.group(name="gear", help="Control gear commands.")
+@cli.group(name="gear", help="Control gear commands.", cls=LazyGroup, lazy_subcommands=GEAR_COMMANDS)
 def gear():
     pass
 
 
-gear.add_command(gear_summary_cmd.summary)
-gear.add_command(gear_list_cmd.gear_list)
-gear.add_command(gear_dump_cmd.dump)
-gear.add_command(gear_clear_cmd.clear)
-
-# ---- gear configure commands
-gear.add_command(gear_conf_cmd.reset)
-gear.add_command(gear_conf_cmd.actual)
-gear.add_command(gear_conf_cmd.op)
-gear.add_command(gear_conf_cmd.reset_mem)
-gear.add_command(gear_conf_cmd.identify)
-gear.add_command(gear_conf_cmd.max_level)
-gear.add_command(gear_conf_cmd.min_level)
-gear.add_command(gear_conf_cmd.fail)
-gear.add_command(gear_conf_cmd.on)
-gear.add_command(gear_conf_cmd.time)
-gear.add_command(gear_conf_cmd.rate)
-gear.add_command(gear_conf_cmd.ext)
-gear.add_command(gear_conf_cmd.scene)
-gear.add_command(gear_conf_cmd.remove)
-gear.add_command(gear_conf_cmd.add)
-gear.add_command(gear_conf_cmd.ungroup)
-gear.add_command(gear_conf_cmd.short)
-gear.add_command(gear_conf_cmd.enable)
-gear.add_command(gear_enumerate_cmd.gear_enumerate)
-
-
-# ---- gear special commands
-gear.add_command(gear_special_cmd.term)
-gear.add_command(gear_special_cmd.dtr0)
-gear.add_command(gear_special_cmd.init)
-gear.add_command(gear_special_cmd.rand)
-gear.add_command(gear_special_cmd.comp)
-gear.add_command(gear_special_cmd.withdraw)
-gear.add_command(gear_special_cmd.ping)
-gear.add_command(gear_special_cmd.search)
-gear.add_command(gear_special_cmd.program)
-gear.add_command(gear_special_cmd.verify)
-gear.add_command(gear_special_cmd.dt)
-gear.add_command(gear_special_cmd.dtr1)
-gear.add_command(gear_special_cmd.dtr2)
-gear.add_command(gear_special_cmd.write)
-gear.add_command(gear_special_cmd.noreply)
-
-
-@gear.group(name="query", help="Query gear status commands.")
+@gear.group(name="query", help="Query gear status commands.", cls=LazyGroup, lazy_subcommands=GEAR_QUERY_COMMANDS)
 def gear_query():
     pass
 
 
-# ---- gear query commands
-gear_query.add_command(gear_query_cmd.status)
-gear_query.add_command(gear_query_cmd.present)
-gear_query.add_command(gear_query_cmd.failure)
-gear_query.add_command(gear_query_cmd.power)
-gear_query.add_command(gear_query_cmd.limit)
-gear_query.add_command(gear_query_cmd.reset)
-gear_query.add_command(gear_query_cmd.missing)
-gear_query.add_command(gear_query_cmd.version)
-gear_query.add_command(gear_query_cmd.dtr0)
-gear_query.add_command(gear_query_cmd.device_type)
-gear_query.add_command(gear_query_cmd.next_device_type)
-gear_query.add_command(gear_query_cmd.phm)
-gear_query.add_command(gear_query_cmd.power_cycles)
-gear_query.add_command(gear_query_cmd.dtr1)
-gear_query.add_command(gear_query_cmd.dtr2)
-gear_query.add_command(gear_query_cmd.op_mode)
-gear_query.add_command(gear_query_cmd.light_source)
-gear_query.add_command(gear_query_cmd.actual_level)
-gear_query.add_command(gear_query_cmd.min_level)
-gear_query.add_command(gear_query_cmd.max_level)
-gear_query.add_command(gear_query_cmd.power_level)
-gear_query.add_command(gear_query_cmd.failure_level)
-gear_query.add_command(gear_query_cmd.fade)
-gear_query.add_command(gear_special_cmd.short)
-gear_query.add_command(gear_query_cmd.groups)
-
-
 #
 # ---- device commands
-@cli.group(name="device", help="Control device commands.")
+@cli.group(name="device", help="Control device commands.", cls=LazyGroup, lazy_subcommands=DEVICE_COMMANDS)
 def device():
     pass
 
 
-device.add_command(device_dump_cmd.dump)
-device.add_command(device_special_cmd.dtr0)
-device.add_command(device_special_cmd.dtr1)
-device.add_command(device_special_cmd.dtr2)
-device.add_command(device_special_cmd.init)
-device.add_command(device_special_cmd.rand)
-device.add_command(device_special_cmd.testframe)
-
-#
-# ---- configure commands
-device.add_command(device_configure_cmd.add)
-device.add_command(device_configure_cmd.start)
-device.add_command(device_configure_cmd.stop)
-device.add_command(device_configure_cmd.reset)
-device.add_command(device_configure_cmd.ungroup)
-device.add_command(device_configure_cmd.short)
-device.add_command(device_configure_cmd.scheme)
-device.add_command(device_configure_cmd.primary)
-device.add_command(device_configure_cmd.application)
-device.add_command(device_configure_cmd.cycle)
-device.add_command(device_enumerate_cmd.device_enumerate)
-
-
-@device.group(name="query", help="Query device status commands")
+@device.group(name="query", help="Query device status commands", cls=LazyGroup, lazy_subcommands=DEVICE_QUERY_COMMANDS)
 def device_query():
     pass
-
-
-# ---- query commands
-device_query.add_command(device_query_cmd.capabilities)
-device_query.add_command(device_query_cmd.dtr0)
-device_query.add_command(device_query_cmd.dtr1)
-device_query.add_command(device_query_cmd.dtr2)
-device_query.add_command(device_query_cmd.extended)
-device_query.add_command(device_query_cmd.groups)
-device_query.add_command(device_query_cmd.quiescent)
-device_query.add_command(device_query_cmd.status)
-device_query.add_command(device_query_cmd.short)
-device_query.add_command(device_query_cmd.version)
-device_query.add_command(device_query_cmd.random)
-device_query.add_command(device_query_cmd.reset)
-device_query.add_command(device_query_cmd.scheme)
-device_query.add_command(device_query_cmd.itype)
-device_query.add_command(device_query_cmd.resolution)
-device_query.add_command(device_query_cmd.error)
-device_query.add_command(device_query_cmd.istatus)
-device_query.add_command(device_query_cmd.enabled)
-device_query.add_command(device_query_cmd.primary)
-device_query.add_command(device_query_cmd.input_value)
-device_query.add_command(device_query_cmd.application)
-device_query.add_command(device_query_cmd.cycle)
-device_query.add_command(device_query_cmd.missing)
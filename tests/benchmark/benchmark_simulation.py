@@ -0,0 +1,28 @@
+"""Benchmark bus heavy commands on a simulated DALI bus."""
+
+import click
+import contextlib
+import io
+import time
+from dali.DALI.device.device_enumerate import device_enumerate
+from dali.DALI.gear.gear_dump import dump
+from dali.DALI.gear.gear_enumerate import gear_enumerate
+from dali.DALI.gear.gear_list import gear_list
+from dali.DALI.simulation.simulation_bus import DaliSimulation
+
+
+def run(command: click.Command, args: list[str], gears: int, devices: int = 0) -> None:
+    bus = DaliSimulation(gears, devices)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        command.main(args, obj=bus, standalone_mode=False)
+    wall = time.perf_counter() - start
+    print(f"{command.name:<6} {' '.join(args):<12} {bus.frames:6} frames {bus.clock:8.2f} s bus {wall:6.3f} s cpu")
+
+
+if __name__ == "__main__":
+    run(gear_enumerate, [], 64)
+    run(device_enumerate, [], 0, 64)
+    run(gear_list, [], 64)
+    run(gear_list, [], 8)
+    run(dump, ["0", "--adr", "5"], 64)
@@ -0,0 +1,54 @@
+"""Benchmark frames built per second with and without runtime type checks."""
+
+import os
+import subprocess
+import sys
+import time
+from dali.DALI.gear.gear_action import (
+    gear_send_forward_frame,
+    query_gear_value,
+    set_gear_dtr0,
+)
+from dali.DALI.gear.gear_opcode import GearLevelCommandOpcode, GearQueryCommandOpcode
+from dali.DALI.system.typecheck import FAST_MODE
+from dali_interface import DaliFrame, DaliInterface
+
+DURATION = 2.0
+
+
+class DaliCounter(DaliInterface):
+    """Count frames without putting them on a bus."""
+
+    def __init__(self) -> None:
+        super().__init__(start_receive=False)
+        self.frames = 0
+
+    def transmit(self, frame: DaliFrame, block: bool = False, is_query: bool = False) -> None:
+        self.frames += 1
+
+    def query_reply(self, request: DaliFrame) -> DaliFrame:
+        self.frames += 1
+        return DaliFrame(length=8, data=0)
+
+    def close(self) -> None:
+        pass
+
+
+def measure() -> None:
+    dali = DaliCounter()
+    start = time.perf_counter()
+    while time.perf_counter() - start < DURATION:
+        for short in range(64):
+            gear_send_forward_frame(dali, str(short), GearLevelCommandOpcode.OFF)
+            query_gear_value(dali, str(short), GearQueryCommandOpcode.STATUS)
+            set_gear_dtr0(dali, short)
+    rate = dali.frames / (time.perf_counter() - start)
+    print(f"{'fast' if FAST_MODE else 'typechecked':<12} {rate:10.0f} frames/s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        measure()
+    else:
+        for fast in ("0", "1"):
+            subprocess.run([sys.executable, __file__, "measure"], env=os.environ | {"DALI_FAST": fast}, check=True)
@@ -0,0 +1,7 @@
+"""Keep runtime type checks enabled and state files out of the home directory in the test suite."""
+
+import os
+import tempfile
+
+os.environ.pop("DALI_FAST", None)
+os.environ["XDG_STATE_HOME"] = tempfile.mkdtemp(prefix="dali-test-")
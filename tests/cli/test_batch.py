@@ -0,0 +1,84 @@
+"""Test execution of command lines from a file."""
+
+import click
+from click.testing import CliRunner
+from dali.DALI.gear.gear_list import gear_list
+from dali.DALI.system.batch import run
+from dali.dali_cli import cli
+from dali_interface import DaliFrame, DaliInterface, DaliStatus
+
+SCRIPT = """# set level and read it back
+dapc 100 --adr 3
+gear query actual --adr 3
+
+gear query actual --adr X3
+gear query min --adr 3
+"""
+
+
+def test_run_stdin():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--simulate", "4", "run", "-"], input=SCRIPT)
+    assert result.exit_code == 1
+    assert result.stdout == "0x64 = 100 = 01100100b\n"
+    assert "<stdin>:5: ValueError" in result.stderr
+    assert "stopped at line 5." in result.stderr
+
+
+def test_run_keep_going(tmp_path):
+    script = tmp_path / "script.txt"
+    script.write_text(SCRIPT + "nonsense\n", encoding="utf-8")
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--simulate", "4", "run", "--keep-going", str(script)])
+    assert result.exit_code == 1
+    assert result.stdout == "0x64 = 100 = 01100100b\n0x01 = 1 = 00000001b\n"
+    assert f"{script}:7: No such command 'nonsense'." in result.stderr
+    assert "2 commands failed." in result.stderr
+
+
+def test_run_rejects_global_option():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--simulate", "1", "run", "-"], input="--hid off\n")
+    assert result.exit_code == 1
+    assert "global option --hid can not be used here." in result.stderr
+
+
+class ClosingInterface(DaliInterface):
+    def __init__(self):
+        super().__init__(start_receive=False)
+        self.closed = False
+
+    def transmit(self, frame, block=False, is_query=False):
+        pass
+
+    def query_reply(self, request):
+        return DaliFrame(status=DaliStatus.TIMEOUT)
+
+    def close(self):
+        self.closed = True
+
+
+@click.group()
+@click.option("--socket", "socket_path", default="dali.sock")
+def root(socket_path):  # pylint: disable=unused-argument
+    pass
+
+
+@root.command(name="where")
+@click.pass_context
+def where(ctx):
+    click.echo(ctx.find_root().params["socket_path"])
+
+
+root.add_command(run)
+root.add_command(gear_list)
+
+
+def test_run_in_root_context():
+    dali = ClosingInterface()
+    runner = CliRunner()
+    result = runner.invoke(root, ["--socket", "other.sock", "run", "-"], input="where\nlist\nwhere --help\n", obj=dali)
+    assert result.exit_code == 0
+    assert result.stdout.splitlines()[0] == "other.sock"
+    assert "Usage: root where" in result.stdout
+    assert not dali.closed
@@ -0,0 +1,83 @@
+"""Test the cache for static facts of the units."""
+
+from click.testing import CliRunner
+from dali.DALI.gear.gear_action import query_gear_value
+from dali.DALI.gear.gear_configure import short
+from dali.DALI.gear.gear_opcode import GearQueryCommandOpcode
+from dali.DALI.gear.gear_summary import summary
+from dali.DALI.simulation.simulation_bus import DaliSimulation
+from dali.DALI.system.bus_cache import DaliBusCache, changes_addresses, query_key
+from dali.DALI.system.statistics import DaliStatistics
+from dali_interface import DaliFrame
+
+
+def run_summary(bus: DaliSimulation, path=None) -> tuple[str, int]:
+    statistics = DaliStatistics(bus)
+    if path is None:
+        result = CliRunner().invoke(summary, ["--adr", "1"], obj=statistics)
+    else:
+        cache = DaliBusCache(statistics, str(path))
+        result = CliRunner().invoke(summary, ["--adr", "1"], obj=cache)
+        cache.save()
+    assert result.exit_code == 0
+    return result.output, statistics.summary().count
+
+
+def test_query_key():
+    assert query_key(DaliFrame(length=16, data=0x0399)) == ("G01", 0x99)
+    assert query_key(DaliFrame(length=16, data=0x03C2)) == ("G01", 0xC2)
+    assert query_key(DaliFrame(length=16, data=0x03A0)) is None
+    assert query_key(DaliFrame(length=16, data=0xFF99)) is None
+    assert query_key(DaliFrame(length=24, data=0x05FE34)) == ("D02", 0x34)
+    assert query_key(DaliFrame(length=24, data=0x050034)) is None
+
+
+def test_changes_addresses():
+    assert changes_addresses(DaliFrame(length=16, data=0xFF80)) == "G"
+    assert changes_addresses(DaliFrame(length=16, data=0xA700)) == "G"
+    assert changes_addresses(DaliFrame(length=16, data=0x0300)) is None
+    assert changes_addresses(DaliFrame(length=24, data=0xC10200)) == "D"
+    assert changes_addresses(DaliFrame(length=24, data=0xFFFE14)) == "D"
+
+
+def test_cached_summary(tmp_path):
+    path = tmp_path / "cache.json"
+    bus = DaliSimulation(2)
+    output, uncached = run_summary(bus)
+    cold_output, cold = run_summary(bus, path)
+    assert cold_output == output
+    assert cold == uncached
+    cached_output, cached = run_summary(bus, path)
+    assert cached_output == output
+    assert cached == uncached - 3
+    # a swapped gear has another random address
+    bus.gears[1].random_address = bus.gears[1].random_address ^ 0x010101
+    _, swapped = run_summary(bus, path)
+    assert swapped == uncached
+
+
+def test_random_address_not_cached(tmp_path):
+    path = tmp_path / "cache.json"
+    bus = DaliSimulation(2)
+    run_summary(bus, path)
+    bus.gears[1].random_address = 0x123456
+    output, _ = run_summary(bus, path)
+    assert "0x123456" in output.lower()
+
+
+def test_absent_unit(tmp_path):
+    statistics = DaliStatistics(DaliSimulation(2))
+    cache = DaliBusCache(statistics, str(tmp_path / "cache.json"))
+    assert query_gear_value(cache, "5", GearQueryCommandOpcode.DEVICE_TYPE) is None
+    assert query_gear_value(cache, "5", GearQueryCommandOpcode.VERSION_NUMBER) is None
+    assert statistics.summary().count == 1
+
+
+def test_set_short_address_invalidates(tmp_path):
+    path = tmp_path / "cache.json"
+    bus = DaliSimulation(2)
+    run_summary(bus, path)
+    cache = DaliBusCache(bus, str(path))
+    result = CliRunner().invoke(short, ["--adr", "1", "5"], obj=cache)
+    assert result.exit_code == 0
+    assert not cache.units
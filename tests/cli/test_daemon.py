@@ -0,0 +1,69 @@
+"""Test forwarding frames via the dali daemon."""
+
+import threading
+import time
+from click.testing import CliRunner
+from dali.DALI.system.constants import DaliFrameLength, DaliTimeout
+from dali.DALI.system.daemon import DaliDaemon, DaliDaemonClient
+from dali.dali_cli import cli
+from dali_interface import DaliFrame, DaliInterface, DaliMock, DaliStatus
+
+
+class QueueAdapter(DaliInterface):
+    """Adapter without reply_timeout, it reports its loopback and replies on the receive queue."""
+
+    def __init__(self, present: set[int]) -> None:
+        super().__init__(start_receive=False)
+        self.present = present
+
+    def transmit(self, frame: DaliFrame, block: bool = False, is_query: bool = False) -> None:
+        self.queue.put(DaliFrame(length=frame.length, data=frame.data, status=DaliStatus.LOOPBACK))
+        if is_query and (frame.data >> 9) in self.present:
+            self.queue.put(DaliFrame(length=DaliFrameLength.BACKWARD, data=0xFF, status=DaliStatus.FRAME))
+
+    def query_reply(self, request: DaliFrame) -> DaliFrame:
+        raise AssertionError("waits the default timeout of the adapter")
+
+
+def test_daemon_forwards_frames(tmp_path):
+    socket_path = str(tmp_path / "dali.sock")
+    server = DaliDaemon(socket_path, DaliMock())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    runner = CliRunner()
+    try:
+        result = runner.invoke(cli, ["--daemon", "--socket", socket_path, "dapc", "100", "--adr", "3"])
+        assert result.exit_code == 0
+        assert result.output == "S2 10 664\n"
+        result = runner.invoke(cli, ["--daemon", "--socket", socket_path, "gear", "query", "status", "--adr", "3"])
+        assert result.exit_code == 0
+        assert result.output == "S2 10 790\ntimeout - NO\n"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_daemon_calibrated_timeout_on_queue_adapter(tmp_path):
+    socket_path = str(tmp_path / "dali.sock")
+    server = DaliDaemon(socket_path, QueueAdapter({0}))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with DaliDaemonClient(socket_path) as client:
+            client.reply_timeout = 0.03
+            reply = client.query_reply(DaliFrame(length=DaliFrameLength.GEAR, data=0x0191))
+            assert reply.status == DaliStatus.FRAME
+            assert reply.data == 0xFF
+            start = time.perf_counter()
+            reply = client.query_reply(DaliFrame(length=DaliFrameLength.GEAR, data=0x0391))
+            assert reply.status == DaliStatus.TIMEOUT
+            assert time.perf_counter() - start < DaliTimeout.DEFAULT.value
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_daemon_not_running(tmp_path):
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--daemon", "--socket", str(tmp_path / "dali.sock"), "off"])
+    assert result.exit_code == 2
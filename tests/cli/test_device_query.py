@@ -119,3 +119,22 @@ def test_query_device_instance_command(command, opcode):
         expect = 0xFF0000 + instance_byte + opcode
         assert result.exit_code == 0
         assert result.output == f"S2 18 {expect:X}\ntimeout - NO\n"
+
+
+def test_device_query_address_list():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--simulate", "0:2", "device", "query", "status", "--adr", "0-2"])
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert lines[10:12] == ["D01  status: 0 = 0x00 = 00000000b", "     bit : description"]
+    assert lines[-1] == "D02  timeout - NO"
+    result = runner.invoke(cli, ["--simulate", "0:2", "device", "query", "groups", "--adr", "1"])
+    assert result.output.splitlines()[-1] == "groups 24-31:   0 = 0x00 = 00000000b"
+    result = runner.invoke(cli, ["--simulate", "0:2", "device", "query", "groups", "--adr", "1,2"])
+    assert result.output.splitlines() == [
+        "D01  groups  0- 7:   0 = 0x00 = 00000000b",
+        "     groups  8-15:   0 = 0x00 = 00000000b",
+        "     groups 16-23:   0 = 0x00 = 00000000b",
+        "     groups 24-31:   0 = 0x00 = 00000000b",
+        "D02  timeout - NO",
+    ]
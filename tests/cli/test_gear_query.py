@@ -2,7 +2,10 @@
 
 import pytest
 from click.testing import CliRunner
+from dali.DALI.gear.gear_summary import summary
+from dali.DALI.simulation.simulation_bus import DaliSimulation
 from dali.DALI.system.constants import DaliMax
+from dali.DALI.system.statistics import DaliStatistics
 from dali.dali_cli import cli
 
 
@@ -37,3 +40,47 @@ def test_gear_query_command(command, opcode):
         expect = 0x8100 + (group * 0x200) + opcode
         assert result.exit_code == 0
         assert result.output == f"S2 10 {expect:X}\ntimeout - NO\n"
+
+
+def test_gear_query_address_list():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--simulate", "3", "gear", "query", "actual", "--adr", "1-3"])
+    assert result.exit_code == 0
+    assert result.output == "G01  0xFE = 254 = 11111110b\nG02  0xFE = 254 = 11111110b\nG03  timeout - NO\n"
+    result = runner.invoke(cli, ["--simulate", "3", "gear", "query", "status", "--adr", "0,2"])
+    lines = result.output.splitlines()
+    assert lines[0] == "G00  status: 132 = 0x84 = 10000100b"
+    assert lines[1:3] == ["     bit : description", "       0 : controlGearFailure"]
+    assert lines[10] == "G02  status: 132 = 0x84 = 10000100b"
+    assert len(lines) == 20
+    result = runner.invoke(cli, ["--simulate", "3", "gear", "query", "groups", "--adr", "0,5"])
+    assert result.output.splitlines() == [
+        "G00  groups 0- 7:   1 = 0x01 = 00000001b",
+        "     groups 8-15:   0 = 0x00 = 00000000b",
+        "G05  timeout - NO",
+    ]
+    result = runner.invoke(cli, ["--simulate", "3", "gear", "query", "status", "--adr", "ALL"])
+    assert [line[:5] for line in result.output.splitlines() if not line.startswith(" ")] == [
+        f"G{short:02}  " for short in range(DaliMax.ADR)
+    ]
+    result = runner.invoke(cli, ["--simulate", "3", "gear", "query", "status", "--adr", "9-2"])
+    assert result.exit_code == 2
+    assert "invalid address range 9-2." in result.output
+
+
+def test_gear_summary_address_list():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--simulate", "2", "gear", "summary", "--adr", "0-2"])
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert lines[0].split()[:3] == ["adr", "status", "mode"]
+    assert lines[1].split()[:2] == ["G00", "84"]
+    assert lines[2].split()[:2] == ["G01", "84"]
+    assert lines[3] == "G02  absent"
+
+
+def test_gear_summary_status_once():
+    statistics = DaliStatistics(DaliSimulation(2))
+    result = CliRunner().invoke(summary, ["--adr", "0-2"], obj=statistics)
+    assert result.exit_code == 0
+    assert statistics.opcodes["STATUS"].count == 3
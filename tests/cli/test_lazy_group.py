@@ -0,0 +1,28 @@
+"""Test lazy loading of commands."""
+
+import click
+import subprocess
+import sys
+from dali.dali_cli import cli
+
+
+def test_startup_imports():
+    code = (
+        "import sys, dali.dali_cli;"
+        "print(sorted(m for m in sys.modules if m.startswith(('dali.DALI.gear', 'typeguard'))))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True, text=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_all_commands_resolve():
+    def resolve(group: click.Group, ctx: click.Context) -> int:
+        count = 0
+        for name in group.list_commands(ctx):
+            command = group.get_command(ctx, name)
+            assert isinstance(command, click.Command), name
+            count = count + (resolve(command, ctx) if isinstance(command, click.Group) else 1)
+        return count
+
+    with click.Context(cli) as ctx:
+        assert resolve(cli, ctx) > 100
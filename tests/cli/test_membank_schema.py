@@ -0,0 +1,45 @@
+"""Test decoding memory banks into typed fields."""
+
+from dali.DALI.system.membank_schema import decode_bank, field_span, measured, metered
+
+
+def test_decode_bank_0():
+    content = [0x1B, 0xFF, 205, 0x01, 0x23, 0x45, 0x67, 0x89, 0xAB, 2, 1] + [0, 0, 0, 0, 0, 0, 0x10, 0x01]
+    fields = decode_bank(0, content)
+    assert fields["last_bank"] == 205
+    assert fields["gtin"] == 0x0123456789AB
+    assert fields["firmware_major"] == 2
+    assert fields["identification"] == 0x1001
+    assert fields["hardware_major"] is None
+
+
+def test_decode_energy():
+    content = [0x0F, 0, 0, 1, 3] + [0, 0, 0, 0, 0x01, 0x02] + [0xFF] + [0, 0, 0x01, 0xF4]
+    fields = decode_bank(202, content)
+    assert fields["active_energy_wh"] == 0x0102 * 1000
+    assert fields["active_power_w"] == 50.0
+    content[5:11] = [0xFF] * 6
+    assert decode_bank(202, content)["active_energy_wh"] is None
+
+
+def test_decode_diagnostics():
+    content = [0x1C, 0, 0, 1] + [0] * 25
+    content[11:15] = [0x08, 0xFC, 50, 95]
+    content[27] = 0x20
+    fields = decode_bank(205, content)
+    assert fields["supply_voltage_v"] == 230.0
+    assert fields["power_factor"] == 0.95
+    assert fields["temperature_c"] == -28
+    assert decode_bank(7, [3, 0, 0x55, 0]) == {"last_location": 3, "indicator": 0, "lock": 0x55}
+
+
+def test_precision():
+    convert = measured("x", 0, 1, 0.5)[3]
+    assert convert(5, []) == 2 and isinstance(convert(5, []), int)
+    assert measured("x", 0, 2, 0.001, precision=3)[3](1234, []) == 1.234
+    assert metered("x", 0, 1, 1)[3](12345, [0, 0xFC]) == 1.2345
+
+
+def test_field_span():
+    assert field_span(202, ("active_energy_wh", "active_power_w")) == (4, 15)
+    assert field_span(205, ("temperature_c",)) == (27, 27)
@@ -0,0 +1,90 @@
+"""Test pipelined transmission of forward frames."""
+
+from click.testing import CliRunner
+from dali.DALI.system import pipeline
+from dali.DALI.system.pipeline import DaliPipeline, settling_time
+from dali.dali_cli import cli
+from dali_interface import DaliFrame, DaliInterface
+
+
+class VirtualTime:
+    """Stands in for the time module, sleeping only advances the clock."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now = self.now + delay
+
+
+class RecordingInterface(DaliInterface):
+    def __init__(self):
+        super().__init__(start_receive=False)
+        self.log = []
+
+    def transmit(self, frame, block=False, is_query=False):
+        self.log.append((frame.data, block))
+
+    def query_reply(self, request):
+        self.log.append((request.data, "query"))
+        return DaliFrame(length=8, data=0xFF)
+
+    def close(self):
+        pass
+
+
+def test_pipeline_only_waits_before_queries():
+    dali = RecordingInterface()
+    with DaliPipeline(dali) as bus:
+        bus.transmit(DaliFrame(length=16, data=0xB112), block=True)
+        bus.transmit(DaliFrame(length=16, data=0xB334), block=True)
+        bus.transmit(DaliFrame(length=16, data=0xB556), block=True)
+        bus.query_reply(DaliFrame(length=16, data=0xA900))
+        bus.transmit(DaliFrame(length=16, data=0xA100))
+    assert dali.log == [(0xB112, False), (0xB334, False), (0xB556, True), (0xA900, "query"), (0xA100, True)]
+
+
+def test_pipeline_depth():
+    dali = RecordingInterface()
+    with DaliPipeline(dali, depth=2) as bus:
+        for data in range(5):
+            bus.transmit(DaliFrame(length=16, data=0xA300 + data))
+    assert [block for _, block in dali.log] == [False, True, False, True, True]
+
+
+def test_pipeline_settles_gears_and_devices_independently(monkeypatch):
+    clock = VirtualTime()
+    monkeypatch.setattr(pipeline, "time", clock)
+    dali = RecordingInterface()
+    with DaliPipeline(dali) as bus:
+        bus.transmit(DaliFrame(length=16, data=0xA700, send_twice=True))
+        bus.transmit(DaliFrame(length=24, data=0xC10200, send_twice=True))
+        bus.query_reply(DaliFrame(length=24, data=0xC10300))
+    # the device query waits for the device RANDOMISE only, not for the gear RANDOMISE before it
+    assert clock.sleeps == [settling_time(DaliFrame(length=24, data=0xC10200))]
+    assert [data for data, _ in dali.log] == [0xA700, 0xC10200, 0xC10300]
+
+
+def test_settling_time():
+    assert settling_time(DaliFrame(length=16, data=0xA700)) > 0
+    assert settling_time(DaliFrame(length=16, data=0xFF20)) > 0
+    assert settling_time(DaliFrame(length=16, data=0x0320)) > 0
+    assert settling_time(DaliFrame(length=16, data=0xA320)) == 0
+    assert settling_time(DaliFrame(length=24, data=0xC10200)) > 0
+    assert settling_time(DaliFrame(length=24, data=0xFFFE10)) > 0
+    assert settling_time(DaliFrame(length=24, data=0xC13010)) == 0
+
+
+def test_gear_clear_sequence():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--mock", "gear", "clear"])
+    assert result.exit_code == 0
+    expect = ["S2 10+A500", "S2 10 A3FF", "S2 10+FF80"]
+    expect += [f"S2 10+{0xFF70 + group:X}" for group in range(16)]
+    expect += ["S2 10 A100"]
+    assert result.output == "\n".join(expect) + "\n"
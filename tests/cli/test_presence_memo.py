@@ -0,0 +1,67 @@
+"""Test skipping queries to short addresses known to be absent."""
+
+from click.testing import CliRunner
+from dali.DALI.gear.gear_configure import short
+from dali.DALI.gear.gear_enumerate import used_short_addresses
+from dali.DALI.simulation.simulation_bus import DaliSimulation
+from dali.DALI.system.presence import (
+    PRESENCE_TTL,
+    DaliPresenceMemo,
+    addressed_unit,
+    default_presence_path,
+)
+from dali_interface import DaliFrame
+
+
+def scan(bus: DaliSimulation, path) -> tuple[set[int], float]:
+    memo = DaliPresenceMemo(bus, str(path))
+    start = bus.clock
+    used = used_short_addresses(memo)
+    memo.save()
+    return used, bus.clock - start
+
+
+def test_addressed_unit():
+    assert addressed_unit(DaliFrame(length=16, data=0x0391)) == ("gear", 1, True)
+    assert addressed_unit(DaliFrame(length=16, data=0x03C5)) == ("gear", 1, False)
+    assert addressed_unit(DaliFrame(length=16, data=0xFF91)) is None
+    assert addressed_unit(DaliFrame(length=24, data=0x05FE30)) == ("device", 2, True)
+    assert addressed_unit(DaliFrame(length=24, data=0x05203C)) == ("device", 2, False)
+
+
+def test_skip_absent(tmp_path):
+    path = tmp_path / "presence.json"
+    bus = DaliSimulation(2)
+    used, first = scan(bus, path)
+    assert used == {0, 1}
+    used, second = scan(bus, path)
+    assert used == {0, 1}
+    assert second < first / 10
+    memo = DaliPresenceMemo(bus, str(path))
+    assert memo.bitmaps["gear"]["present"] == 0x03
+    memo.bitmaps["gear"]["since"] -= PRESENCE_TTL + 1
+    start = bus.clock
+    assert used_short_addresses(memo) == {0, 1}
+    assert bus.clock - start > first / 2
+
+
+def test_short_address_forgets(tmp_path):
+    path = tmp_path / "presence.json"
+    bus = DaliSimulation(2)
+    scan(bus, path)
+    memo = DaliPresenceMemo(bus, str(path))
+    result = CliRunner().invoke(short, ["--adr", "1", "5"], obj=memo)
+    assert result.exit_code == 0
+    assert memo.bitmaps["gear"]["absent"] == 0
+    assert used_short_addresses(memo) == {0, 5}
+
+
+def test_short_address_forgets_without_memo(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_STATE_HOME", str(tmp_path))
+    path = default_presence_path("default")
+    bus = DaliSimulation(2)
+    scan(bus, path)
+    result = CliRunner().invoke(short, ["--adr", "1", "30"], obj=bus)
+    assert result.exit_code == 0
+    used, _ = scan(bus, path)
+    assert used == {0, 30}
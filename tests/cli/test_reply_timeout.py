@@ -0,0 +1,95 @@
+"""Test the calibrated reply timeout."""
+
+import json
+import time
+from click.testing import CliRunner
+from dali.DALI.gear.gear_enumerate import used_short_addresses
+from dali.DALI.gear.gear_summary import summary
+from dali.DALI.simulation.simulation_bus import DaliSimulation
+from dali.DALI.system.constants import DaliFrameLength, DaliTimeout
+from dali.DALI.system.reply_timeout import (
+    MINIMUM_TIMEOUT,
+    DaliReplyTimeout,
+    calibrated_timeout,
+)
+from dali_interface import DaliFrame, DaliInterface, DaliStatus
+
+
+def test_calibrated_timeout():
+    assert calibrated_timeout(0.001) == MINIMUM_TIMEOUT
+    assert calibrated_timeout(0.04) == 0.065
+    assert calibrated_timeout(1.0) == DaliTimeout.DEFAULT.value
+
+
+def test_calibrated_scan(tmp_path):
+    path = str(tmp_path / "timeouts.json")
+    bus = DaliSimulation(2)
+    reply_timeout = DaliReplyTimeout(bus, path, "Simulation-2")
+    result = CliRunner().invoke(summary, ["--adr", "1"], obj=reply_timeout)
+    assert result.exit_code == 0
+    reply_timeout.save()
+    assert bus.reply_timeout == DaliTimeout.DEFAULT.value
+    used_short_addresses(bus)
+    default_scan = bus.clock
+    bus = DaliSimulation(2)
+    DaliReplyTimeout(bus, path, "Simulation-2")
+    assert bus.reply_timeout < DaliTimeout.DEFAULT.value
+    assert used_short_addresses(bus) == {0, 1}
+    assert bus.clock < default_scan / 2
+    bus = DaliSimulation(2)
+    DaliReplyTimeout(bus, path, "Serial-/dev/ttyUSB0")
+    assert bus.reply_timeout == DaliTimeout.DEFAULT.value
+
+
+class QueueAdapter(DaliInterface):
+    """Adapter without reply_timeout, it reports its loopback and replies on the receive queue."""
+
+    def __init__(self, present: set[int]) -> None:
+        super().__init__(start_receive=False)
+        self.present = present
+
+    def transmit(self, frame: DaliFrame, block: bool = False, is_query: bool = False) -> None:
+        self.queue.put(DaliFrame(length=frame.length, data=frame.data, status=DaliStatus.LOOPBACK))
+        if is_query and (frame.data >> 9) in self.present:
+            self.queue.put(DaliFrame(length=DaliFrameLength.BACKWARD, data=0xFF, status=DaliStatus.FRAME))
+
+    def query_reply(self, request: DaliFrame) -> DaliFrame:
+        raise AssertionError("waits the default timeout of the adapter")
+
+
+def test_calibrated_timeout_on_queue_adapter(tmp_path):
+    path = tmp_path / "timeouts.json"
+    path.write_text(json.dumps({"Serial-/dev/ttyUSB0": {"latency": 0.01, "timeout": 0.03}}))
+    reply_timeout = DaliReplyTimeout(QueueAdapter({0}), str(path), "Serial-/dev/ttyUSB0")
+    reply = reply_timeout.query_reply(DaliFrame(length=DaliFrameLength.GEAR, data=0x0191))
+    assert reply.length == DaliFrameLength.BACKWARD
+    assert reply.data == 0xFF
+    start = time.perf_counter()
+    reply = reply_timeout.query_reply(DaliFrame(length=DaliFrameLength.GEAR, data=0x0391))
+    assert reply.status == DaliStatus.TIMEOUT
+    assert time.perf_counter() - start < DaliTimeout.DEFAULT.value
+    assert len(reply_timeout.latencies) == 1
+
+
+def test_calibration_keeps_slowest_run(tmp_path):
+    path = tmp_path / "timeouts.json"
+    path.write_text(json.dumps({"Serial-/dev/ttyUSB0": {"latency": 0.04, "timeout": 0.065}}))
+    reply_timeout = DaliReplyTimeout(QueueAdapter({0}), str(path), "Serial-/dev/ttyUSB0")
+    for _ in range(8):
+        reply_timeout.query_reply(DaliFrame(length=DaliFrameLength.GEAR, data=0x0191))
+    reply_timeout.save()
+    assert json.loads(path.read_text())["Serial-/dev/ttyUSB0"] == {"latency": 0.04, "timeout": 0.065}
+
+
+def test_late_reply_raises_timeout(tmp_path):
+    path = tmp_path / "timeouts.json"
+    path.write_text(json.dumps({"Serial-/dev/ttyUSB0": {"latency": 0.01, "timeout": 0.03}}))
+    adapter = QueueAdapter(set())
+    reply_timeout = DaliReplyTimeout(adapter, str(path), "Serial-/dev/ttyUSB0")
+    reply = reply_timeout.query_reply(DaliFrame(length=DaliFrameLength.GEAR, data=0x0191))
+    assert reply.status == DaliStatus.TIMEOUT
+    adapter.queue.put(DaliFrame(length=DaliFrameLength.BACKWARD, data=0xFF, status=DaliStatus.FRAME))
+    reply_timeout.query_reply(DaliFrame(length=DaliFrameLength.GEAR, data=0x0191))
+    assert reply_timeout.late_replies == 1
+    reply_timeout.save()
+    assert json.loads(path.read_text())["Serial-/dev/ttyUSB0"] == {"latency": 0.03, "timeout": 0.05}
@@ -0,0 +1,65 @@
+"""Test the search for random addresses."""
+
+from dali.DALI.simulation.simulation_bus import DaliSimulation
+from dali.DALI.system.constants import DaliFrameLength, DaliMax
+from dali.DALI.system.search import SearchAddressShadow, bounded_search
+from dali_interface import DaliFrame
+
+
+class Units:
+    """Random addresses of units in initialisation state."""
+
+    def __init__(self, addresses: list[int]) -> None:
+        self.addresses = set(addresses)
+        self.search = DaliMax.RANDOM_ADR - 1
+        self.compares = 0
+
+    def set_search_address(self, search: int) -> None:
+        self.search = search
+
+    def compare(self) -> bool:
+        self.compares = self.compares + 1
+        return any(address <= self.search for address in self.addresses)
+
+    def find_all(self) -> list[int]:
+        found = []
+        search = bounded_search(self.set_search_address, self.compare)
+        while search is not None:
+            found.append(search)
+            self.addresses.discard(search)
+            search = bounded_search(self.set_search_address, self.compare, search + 1)
+        return found
+
+
+def test_bounded_search():
+    addresses = [0, 1, 0x123456, 0x800000, DaliMax.RANDOM_ADR - 2, DaliMax.RANDOM_ADR - 1]
+    units = Units(addresses)
+    assert units.find_all() == addresses
+    assert units.search == DaliMax.RANDOM_ADR - 1
+
+
+def test_bounded_search_empty():
+    units = Units([])
+    assert units.find_all() == []
+    assert units.compares == 1
+
+
+def test_bounded_search_narrows():
+    units = Units([DaliMax.RANDOM_ADR - 3])
+    assert bounded_search(units.set_search_address, units.compare, DaliMax.RANDOM_ADR - 8) == DaliMax.RANDOM_ADR - 3
+    assert units.compares == 4
+
+
+def test_search_address_shadow():
+    bus = DaliSimulation(1, 1)
+    shadow = SearchAddressShadow(bus)
+    for data in (0xB112, 0xB334, 0xB556, 0xB112, 0xB334, 0xB557, 0xC10512, 0xC10512):
+        shadow.transmit(DaliFrame(length=DaliFrameLength.GEAR if data < 0x10000 else DaliFrameLength.DEVICE, data=data))
+    assert bus.frames == 5
+    shadow.transmit(DaliFrame(length=DaliFrameLength.GEAR, data=0xA500, send_twice=True))
+    shadow.transmit(DaliFrame(length=DaliFrameLength.GEAR, data=0xB112))
+    shadow.transmit(DaliFrame(length=DaliFrameLength.DEVICE, data=0xC10512))
+    assert bus.frames == 8
+    shadow.transmit(DaliFrame(length=DaliFrameLength.GEAR, data=0x0320, send_twice=True))
+    shadow.transmit(DaliFrame(length=DaliFrameLength.GEAR, data=0xB112))
+    assert bus.frames == 11
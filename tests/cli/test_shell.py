@@ -0,0 +1,47 @@
+"""Test the interactive shell."""
+
+import click
+from click.testing import CliRunner
+from dali.DALI.system import shell
+from dali.DALI.system.shell import complete_words
+from dali.dali_cli import cli
+
+
+def test_shell_keeps_connection():
+    runner = CliRunner()
+    result = runner.invoke(
+        cli, ["--simulate", "2", "shell"], input="gear dtr0 42\ngear query dtr0 --adr 1\nbogus\nexit\ngear dtr0 1\n"
+    )
+    assert result.exit_code == 0
+    assert result.stdout == "0x2A = 42 = 00101010b\n"
+    assert result.stderr == "Error: No such command 'bogus'.\n"
+
+
+def test_shell_survives_interrupt(monkeypatch):
+    execute = shell.execute
+    interrupted = []
+
+    def interrupt_once(ctx, args):
+        if not interrupted:
+            interrupted.append(args)
+            raise KeyboardInterrupt
+        execute(ctx, args)
+
+    monkeypatch.setattr(shell, "execute", interrupt_once)
+    runner = CliRunner()
+    result = runner.invoke(
+        cli, ["--simulate", "2", "shell"], input="gear list\ngear dtr0 42\ngear query dtr0 --adr 1\n"
+    )
+    assert result.exit_code == 0
+    assert interrupted == [["gear", "list"]]
+    assert result.stdout == "\n0x2A = 42 = 00101010b\n"
+
+
+def test_complete_words():
+    with click.Context(cli) as ctx:
+        assert complete_words(ctx, [], "ge") == ["gear"]
+        assert complete_words(ctx, [], "q") == ["quit"]
+        assert complete_words(ctx, ["gear", "query"], "dtr") == ["dtr0", "dtr1", "dtr2"]
+        assert complete_words(ctx, ["gear", "query", "status"], "--a") == ["--adr"]
+        assert complete_words(ctx, ["gear", "query", "status", "--adr"], "g1") == ["G1"] + [f"G1{g}" for g in range(6)]
+        assert complete_words(ctx, ["nonsense"], "") == []
@@ -0,0 +1,423 @@
+"""Test commands against a simulated DALI bus."""
+
+import json
+import os
+from click.testing import CliRunner
+from dali.DALI.device.device_enumerate import device_enumerate
+from dali.DALI.device.device_list import device_list
+from dali.DALI.gear.gear_dump import dump as gear_dump
+from dali.DALI.gear.gear_enumerate import gear_enumerate
+from dali.DALI.gear.gear_inventory import inventory
+from dali.DALI.gear.gear_list import gear_list
+from dali.DALI.gear.gear_opcode import GearSpecialCommandOpcode
+from dali.DALI.simulation.simulation_bus import DaliSimulation
+from dali.DALI.system.bus_enumerate import enumerate_bus
+from dali.DALI.system.checkpoint import state_directory
+from dali.DALI.system.constants import DaliFrameLength, DaliMax
+from dali.DALI.system.presence import DaliPresenceMemo
+from dali.DALI.system.statistics import DaliStatistics
+from dali.dali_cli import cli
+from dali_interface import DaliFrame, DaliStatus
+
+
+def test_gear_list():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--simulate", "4", "gear", "list"])
+    assert result.exit_code == 0
+    assert result.output == "Found control gears.\n" + "".join(f"{short}\rG{short:02}\n" for short in range(4))
+
+
+def test_gear_enumerate():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--simulate", "5", "gear", "enum"])
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert lines[:-1] == [f"assigned G{short:02}." for short in range(5)] + ["No (more) gears."]
+    assert lines[-1].endswith("frames per assigned address.")
+
+
+def test_device_enumerate():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--simulate", "0:3", "device", "enum"])
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert lines[:-1] == [f"assigned D{short:02}." for short in range(3)] + ["No (more) devices."]
+    assert lines[-1].endswith("frames per assigned address.")
+
+
+def test_gear_dump(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_STATE_HOME", str(tmp_path))
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--simulate", "2", "gear", "dump", "0", "--adr", "1"])
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert len(lines) == 0x1C
+    assert lines[0].startswith("0x00 : 0x1B")
+    assert lines[3].startswith("0x03 : 0x01")
+    assert not os.path.exists(state_directory())
+
+
+def test_gear_dump_all_banks(tmp_path):
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--simulate", "2", "gear", "dump", "--all-banks", "--adr", "0-2"])
+    assert result.exit_code == 0
+    dumps = json.loads(result.output)
+    assert list(dumps) == ["G00", "G01"]
+    assert list(dumps["G01"]) == ["0", "1", "202", "205"]
+    assert dumps["G01"]["0"][2] == 205
+    assert len(dumps["G01"]["205"]) == 0x1D
+    output = tmp_path / "banks.bin"
+    args = ["--simulate", "1", "gear", "dump", "--all-banks", "--adr", "0"]
+    args = args + ["--format", "binary", "--output", str(output)]
+    result = runner.invoke(cli, args)
+    assert result.exit_code == 0
+    content = output.read_bytes()
+    assert content.startswith(b"DALIMB1\nG\x00\x00\x1b\x1b")
+    result = runner.invoke(cli, ["--simulate", "1", "gear", "dump", "--all-banks", "--adr", "G1"])
+    assert result.exit_code == 2
+
+
+def test_gear_dump_refresh_volatile():
+    bus = DaliSimulation(2)
+    counts = []
+    outputs = []
+    for refresh in ("all", "volatile", "volatile"):
+        statistics = DaliStatistics(bus)
+        args = ["--all-banks", "--adr", "0-1", "--refresh", refresh]
+        result = CliRunner().invoke(gear_dump, args, obj=statistics)
+        assert result.exit_code == 0
+        counts.append(statistics.summary().count)
+        outputs.append(json.loads(result.output))
+    for unit in ("G00", "G01"):
+        assert list(outputs[1][unit]) == list(outputs[0][unit]) == ["0", "1", "202", "205"]
+        assert outputs[2][unit]["0"] == outputs[0][unit]["0"]
+        assert outputs[2][unit]["1"] == outputs[0][unit]["1"]
+    assert counts[1] < counts[0] // 2
+    result = CliRunner().invoke(gear_dump, ["1", "--adr", "1", "--refresh", "volatile"], obj=bus)
+    assert result.exit_code == 0
+    assert len(result.output.splitlines()) == 0x11
+    counts = []
+    for args in (["202", "--adr", "1"], ["202", "--adr", "1", "--refresh", "volatile"]):
+        statistics = DaliStatistics(bus)
+        result = CliRunner().invoke(gear_dump, args, obj=statistics)
+        assert result.exit_code == 0
+        counts.append(statistics.summary().count)
+    assert counts[1] == counts[0]
+
+
+def test_gear_meter():
+    runner = CliRunner()
+    args = ["--simulate", "2", "gear", "meter", "--count", "2", "--interval", "0", "--bus-load", "100"]
+    result = runner.invoke(cli, args)
+    assert result.exit_code == 0
+    rows = [json.loads(line) for line in result.output.splitlines()]
+    assert [row["address"] for row in rows] == [0, 1, 0, 1]
+    assert rows[0]["active_power_w"] == 20.0
+    assert rows[0]["supply_voltage_v"] == 230.0
+    assert rows[0]["temperature_c"] == 35
+    assert rows[0]["apparent_power_va"] is None
+    assert rows[2]["operating_time_s"] > rows[0]["operating_time_s"]
+    result = runner.invoke(cli, ["--simulate", "2", "gear", "meter", "--count", "1", "--adr", "1", "--format", "csv"])
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert lines[0].startswith("time,address,active_energy_wh,active_power_w")
+    assert lines[1].split(",")[1:4] == ["1", "0", "20.0"]
+
+
+def test_gear_dump_decoded():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--simulate", "2", "gear", "dump", "205", "--adr", "1", "--decoded"])
+    assert result.exit_code == 0
+    assert "supply_voltage_v = 230.0" in result.output.splitlines()
+    args = ["--simulate", "1", "gear", "dump", "--all-banks", "--adr", "0", "--decoded"]
+    result = runner.invoke(cli, args)
+    assert result.exit_code == 0
+    assert json.loads(result.output)["G00"]["202"]["active_power_w"] == 20.0
+    result = runner.invoke(cli, args + ["--format", "binary"])
+    assert result.exit_code == 2
+
+
+def test_gear_configure():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--simulate", "3", "gear", "max", "200", "--adr", "1"])
+    assert result.exit_code == 0
+    bus = DaliSimulation(3)
+    bus.transmit(DaliFrame(length=DaliFrameLength.GEAR, data=0xA3C8))
+    bus.transmit(DaliFrame(length=DaliFrameLength.GEAR, data=0x032A, send_twice=True))
+    bus.transmit(DaliFrame(length=DaliFrameLength.GEAR, data=0x052A))
+    assert [gear.max_level for gear in bus.gears] == [254, 200, 254]
+
+
+def test_virtual_clock():
+    bus = DaliSimulation(2)
+    reply = bus.query_reply(DaliFrame(length=DaliFrameLength.GEAR, data=0x0391))
+    assert reply.length == DaliFrameLength.BACKWARD
+    assert reply.data == 0xFF
+    answered = bus.clock
+    assert 0.03 < answered < 0.06
+    reply = bus.query_reply(DaliFrame(length=DaliFrameLength.GEAR, data=0x0591))
+    assert reply.status == DaliStatus.TIMEOUT
+    assert bus.clock - answered > bus.reply_timeout
+    reply = bus.query_reply(DaliFrame(length=DaliFrameLength.GEAR, data=0xFFC4))
+    assert reply.status == DaliStatus.FRAME
+
+
+def test_gear_enumerate_incremental():
+    bus = DaliSimulation(6)
+    for gear in bus.gears[4:]:
+        gear.short_address = DaliMax.MASK
+    bus.gears[1].short_address = 9
+    runner = CliRunner()
+    result = runner.invoke(gear_enumerate, ["--incremental"], obj=bus)
+    assert result.exit_code == 0
+    assert result.output.startswith("assigned G01.\nassigned G04.\nNo (more) gears.\n")
+    assert sorted(gear.short_address for gear in bus.gears) == [0, 1, 2, 3, 4, 9]
+    assert [gear.groups for gear in bus.gears] == [1 << short for short in range(6)]
+
+
+class ScriptedRandom:
+    """Hand out random addresses from a list."""
+
+    def __init__(self, addresses: list[int]) -> None:
+        self.addresses = addresses
+
+    def randrange(self, _stop: int) -> int:
+        return self.addresses.pop(0)
+
+
+def test_gear_enumerate_collision():
+    bus = DaliSimulation(4)
+    rng = ScriptedRandom([0x100, 0x100, 0x300, 0x400, 0x600, 0x500])
+    for gear in bus.gears:
+        gear.rng = rng
+    runner = CliRunner()
+    result = runner.invoke(gear_enumerate, [], obj=bus)
+    assert result.exit_code == 0
+    assert result.output.splitlines()[:-1] == [
+        "random address collision on G00.",
+        "assigned G01.",
+        "assigned G02.",
+        "No (more) gears.",
+        "assigned G00.",
+        "assigned G03.",
+        "No (more) gears.",
+    ]
+    assert [gear.short_address for gear in bus.gears] == [3, 0, 1, 2]
+
+
+def test_device_enumerate_collision():
+    bus = DaliSimulation(0, 3)
+    rng = ScriptedRandom([0x100, 0x200, 0x100, 0x600, 0x500])
+    for device in bus.devices:
+        device.rng = rng
+    runner = CliRunner()
+    result = runner.invoke(device_enumerate, [], obj=bus)
+    assert result.exit_code == 0
+    assert "random address collision on D00." in result.output
+    assert [device.short_address for device in bus.devices] == [2, 1, 0]
+
+
+class FailingSimulation(DaliSimulation):
+    """Lose the connection after a number of queries."""
+
+    def __init__(self, gears: int, queries: int, devices: int = 0) -> None:
+        super().__init__(gears, devices)
+        self.queries = queries
+
+    def query_reply(self, request: DaliFrame) -> DaliFrame:
+        if self.queries == 0:
+            raise OSError("connection lost")
+        self.queries = self.queries - 1
+        return super().query_reply(request)
+
+
+def test_gear_enumerate_resume(tmp_path):
+    checkpoint = tmp_path / "enum.json"
+    bus = FailingSimulation(6, 110)
+    runner = CliRunner()
+    result = runner.invoke(gear_enumerate, ["--checkpoint", str(checkpoint)], obj=bus)
+    assert isinstance(result.exception, OSError)
+    assert result.output == "assigned G00.\nassigned G01.\nassigned G02.\nassigned G03.\n"
+    random_addresses = [gear.random_address for gear in bus.gears]
+    bus.queries = -1
+    result = runner.invoke(gear_enumerate, ["--checkpoint", str(checkpoint), "--resume"], obj=bus)
+    assert result.exit_code == 0
+    assert result.output.startswith("assigned G04.\nassigned G05.\nNo (more) gears.\n")
+    assert [gear.random_address for gear in bus.gears] == random_addresses
+    assert sorted(gear.short_address for gear in bus.gears) == list(range(6))
+    assert not checkpoint.exists()
+
+
+class InterruptedProgramming(DaliSimulation):
+    """Lose the connection right after a short address was programmed."""
+
+    def __init__(self, gears: int, verifications: int) -> None:
+        super().__init__(gears)
+        self.verifications = verifications
+
+    def query_reply(self, request: DaliFrame) -> DaliFrame:
+        if request.data >> 8 == GearSpecialCommandOpcode.VERIFY_SHORT_ADDRESS:
+            if self.verifications == 0:
+                raise OSError("connection lost")
+            self.verifications = self.verifications - 1
+        return super().query_reply(request)
+
+
+def test_gear_enumerate_resume_after_programming(tmp_path):
+    checkpoint = tmp_path / "enum.json"
+    bus = InterruptedProgramming(4, 2)
+    runner = CliRunner()
+    result = runner.invoke(gear_enumerate, ["--checkpoint", str(checkpoint)], obj=bus)
+    assert isinstance(result.exception, OSError)
+    assert 2 not in json.loads(checkpoint.read_text())["free"]
+    bus.verifications = -1
+    result = runner.invoke(gear_enumerate, ["--checkpoint", str(checkpoint), "--resume"], obj=bus)
+    assert result.exit_code == 0
+    assert len({gear.short_address for gear in bus.gears}) == 4
+
+
+def test_gear_enumerate_resume_without_checkpoint(tmp_path):
+    runner = CliRunner()
+    args = ["--checkpoint", str(tmp_path / "none.json"), "--resume"]
+    result = runner.invoke(gear_enumerate, args, obj=DaliSimulation(1))
+    assert result.exit_code == 1
+    assert "can not resume from" in result.output
+
+
+def test_gear_enumerate_keep_addresses(tmp_path):
+    address_map = tmp_path / "addresses.json"
+    bus = DaliSimulation(5)
+    for gear, short_address in zip(bus.gears, [3, 0, 4, 1, DaliMax.MASK]):
+        gear.short_address = short_address
+    runner = CliRunner()
+    result = runner.invoke(gear_enumerate, ["--keep-addresses", "--address-map", str(address_map)], obj=bus)
+    assert result.exit_code == 0
+    assert [gear.short_address for gear in bus.gears] == [3, 0, 4, 1, 2]
+    saved = json.loads(address_map.read_text())
+    assert saved == {f"{gear.random_address:06X}": gear.short_address for gear in bus.gears}
+    for gear in bus.gears:
+        gear.short_address = DaliMax.MASK
+    result = runner.invoke(gear_enumerate, ["--keep-addresses", "--address-map", str(address_map)], obj=bus)
+    assert result.exit_code == 0
+    assert [gear.short_address for gear in bus.gears] == [3, 0, 4, 1, 2]
+
+
+def test_gear_enumerate_keep_addresses_scan(tmp_path):
+    bus = DaliSimulation(4)
+    runner = CliRunner()
+    result = runner.invoke(gear_enumerate, [], obj=bus)
+    assert result.exit_code == 0
+    full_enumeration = bus.clock
+    bus.clock = 0.0
+    args = ["--keep-addresses", "--address-map", str(tmp_path / "addresses.json")]
+    result = runner.invoke(gear_enumerate, args, obj=bus)
+    assert result.exit_code == 0
+    assert len(json.loads((tmp_path / "addresses.json").read_text())) == 4
+    assert bus.clock < full_enumeration
+
+
+def test_gear_enumerate_keep_addresses_keeps_groups(tmp_path):
+    bus = DaliSimulation(3)
+    for gear, short_address in zip(bus.gears, [5, DaliMax.MASK, 7]):
+        gear.short_address = short_address
+        gear.groups = 0x0101
+    runner = CliRunner()
+    args = ["--keep-addresses", "--address-map", str(tmp_path / "addresses.json")]
+    result = runner.invoke(gear_enumerate, args, obj=bus)
+    assert result.exit_code == 0
+    assert result.output.startswith("assigned G00.\nNo (more) gears.\n")
+    assert [gear.short_address for gear in bus.gears] == [5, 0, 7]
+    assert [gear.groups for gear in bus.gears] == [0x0101] * 3
+
+
+def test_device_enumerate_keep_addresses(tmp_path):
+    bus = DaliSimulation(0, 3)
+    for device, short_address in zip(bus.devices, [DaliMax.MASK, 0, DaliMax.MASK]):
+        device.short_address = short_address
+    runner = CliRunner()
+    args = ["--keep-addresses", "--address-map", str(tmp_path / "addresses.json")]
+    result = runner.invoke(device_enumerate, args, obj=bus)
+    assert result.exit_code == 0
+    assert bus.devices[1].short_address == 0
+    assert sorted(device.short_address for device in bus.devices) == [0, 1, 2]
+
+
+def test_enumerate_bus():
+    bus = DaliSimulation(3, 2)
+    runner = CliRunner()
+    result = runner.invoke(enumerate_bus, [], obj=bus)
+    assert result.exit_code == 0
+    table = result.output.splitlines()[-7:-1]
+    assert table[0].split() == ["unit", "address", "random"]
+    assert [row.split()[:2] for row in table[1:]] == [
+        ["gear", "G00"],
+        ["gear", "G01"],
+        ["gear", "G02"],
+        ["device", "D00"],
+        ["device", "D01"],
+    ]
+    assert sorted(gear.short_address for gear in bus.gears) == [0, 1, 2]
+    assert sorted(device.short_address for device in bus.devices) == [0, 1]
+    assert not any(device.quiescent for device in bus.devices)
+
+
+def test_enumerate_bus_resume():
+    for queries in (40, 80):
+        bus = FailingSimulation(2, queries, 2)
+        runner = CliRunner()
+        result = runner.invoke(enumerate_bus, [], obj=bus)
+        assert isinstance(result.exception, OSError)
+        bus.queries = -1
+        result = runner.invoke(enumerate_bus, ["--resume"], obj=bus)
+        assert result.exit_code == 0
+        assert sorted(gear.short_address for gear in bus.gears) == [0, 1]
+        assert sorted(device.short_address for device in bus.devices) == [0, 1]
+
+
+def test_enumerate_bus_resume_without_checkpoint():
+    runner = CliRunner()
+    result = runner.invoke(enumerate_bus, ["--resume"], obj=DaliSimulation(1, 1))
+    assert result.exit_code == 1
+    assert "can not resume from" in result.output
+
+
+def test_gear_inventory():
+    bus = DaliSimulation(3)
+    bus.gears[1].short_address = 7
+    runner = CliRunner()
+    result = runner.invoke(inventory, [], obj=bus)
+    assert result.exit_code == 0
+    records = json.loads(result.output)
+    assert [record["address"] for record in records] == [0, 2, 7]
+    assert [record["random_address"] for record in records] == [bus.gears[n].random_address for n in (0, 2, 1)]
+    assert [record["groups"] for record in records] == [1, 4, 2]
+    assert records[0]["scene_15"] == 0xFF
+    result = runner.invoke(inventory, ["--format", "jsonl"], obj=bus)
+    assert [json.loads(line) for line in result.output.splitlines()] == records
+    result = runner.invoke(inventory, ["--format", "csv"], obj=bus)
+    lines = result.output.splitlines()
+    assert lines[0].startswith("address,status,")
+    assert [line.split(",")[0] for line in lines[1:]] == ["0", "2", "7"]
+
+
+def test_gear_list_trust_presence(tmp_path):
+    bus = DaliSimulation(4)
+    bus.gears[2].short_address = 40
+    memo = DaliPresenceMemo(bus, str(tmp_path / "presence.json"))
+    runner = CliRunner()
+    result = runner.invoke(gear_list, [], obj=memo)
+    assert result.exit_code == 0
+    scan = bus.clock
+    result = runner.invoke(gear_list, [], obj=memo)
+    assert result.exit_code == 0
+    assert result.output == "Found control gears.\n0\rG00\n1\rG01\n3\rG03\n40\rG40\n"
+    assert bus.clock - scan < scan / 4
+
+
+def test_device_list():
+    bus = DaliSimulation(0, 3)
+    bus.devices[0].short_address = 9
+    runner = CliRunner()
+    result = runner.invoke(device_list, [], obj=bus)
+    assert result.exit_code == 0
+    assert result.output == "Found control devices.\nD01\nD02\nD09\n"
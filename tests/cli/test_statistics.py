@@ -0,0 +1,36 @@
+"""Test frame statistics per opcode."""
+
+import json
+from click.testing import CliRunner
+from dali.DALI.system.constants import DaliFrameLength
+from dali.DALI.system.statistics import frame_name
+from dali.dali_cli import cli
+from dali_interface import DaliFrame
+
+
+def test_frame_name():
+    assert frame_name(DaliFrame(length=DaliFrameLength.GEAR, data=0xFE80)) == "DAPC"
+    assert frame_name(DaliFrame(length=DaliFrameLength.GEAR, data=0xFF90)) == "STATUS"
+    assert frame_name(DaliFrame(length=DaliFrameLength.GEAR, data=0x0113)) == "GOTO_SCENE"
+    assert frame_name(DaliFrame(length=DaliFrameLength.GEAR, data=0xA900)) == "COMPARE"
+    assert frame_name(DaliFrame(length=DaliFrameLength.DEVICE, data=0xC10300)) == "COMPARE"
+    assert frame_name(DaliFrame(length=DaliFrameLength.DEVICE, data=0xFFFE30)) == "QUERY_STATUS"
+
+
+def test_stats_json():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--simulate", "2", "--stats-json", "-", "gear", "list"])
+    assert result.exit_code == 0
+    statistics = json.loads(result.output[result.output.index("{") :])
+    assert statistics["opcodes"]["GEAR_PRESENT"]["count"] == 65
+    assert statistics["total"]["replies"] == 2
+    assert statistics["total"]["errors"] == 1
+    assert statistics["total"]["timeouts"] == 62
+
+
+def test_stats_summary():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--simulate", "1", "--stats", "off"])
+    assert result.exit_code == 0
+    assert "OFF" in result.stderr
+    assert "TOTAL" in result.stderr
@@ -0,0 +1,22 @@
+"""Test runtime type checks and the fast mode without them."""
+
+import os
+import pytest
+import subprocess
+import sys
+from dali.DALI.gear.gear_action import query_gear_value
+from dali.DALI.gear.gear_opcode import GearQueryCommandOpcode
+from dali.DALI.simulation.simulation_bus import DaliSimulation
+from typeguard import TypeCheckError
+
+
+def test_typechecked():
+    with pytest.raises(TypeCheckError):
+        query_gear_value(DaliSimulation(1), 0, GearQueryCommandOpcode.STATUS)
+
+
+def test_fast_mode():
+    code = "import sys; from dali.DALI.gear import gear_summary; print('typeguard' in sys.modules)"
+    env = os.environ | {"DALI_FAST": "1"}
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True, text=True, env=env)
+    assert result.stdout.strip() == "False"